@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON API 負荷テスト
+起動中の serve-api に条文・章・検索・用語のリクエストを並行して送り、
+1秒あたりのリクエスト数と応答時間を表示する
+
+使い方:
+    python build.py serve-api &
+    python bench_api.py [--url http://127.0.0.1:8765] [-c 8] [-d 10]
+    python bench_api.py --etag      # If-None-Match を付けて 304 応答を計測
+"""
+import sys
+import time
+import json
+import argparse
+import threading
+import http.client
+from urllib.parse import urlsplit, quote
+
+SEARCH_WORDS = ['接地抵抗', '絶縁耐力', '高圧', '避雷器', '架空電線']
+
+
+def build_targets(conn):
+    """/api/laws から条文・章のURLを集め、検索・用語のURLと合わせる"""
+    conn.request('GET', '/api/laws')
+    laws = json.loads(conn.getresponse().read())
+    targets = []
+    for law in laws:
+        for chapter in law['chapters']:
+            targets.append(f"/api/{law['law']}/chapters/{chapter['id']}")
+            conn.request('GET', targets[-1])
+            for article in json.loads(conn.getresponse().read())['articles']:
+                targets.append(f"/api/{law['law']}/articles/{quote(article['id'])}")
+    targets += [f'/api/search?q={quote(word)}' for word in SEARCH_WORDS]
+    targets += [f'/api/terms/{quote(word)}' for word in ('OCR', '過電流継電器', 'GR')]
+    return targets
+
+
+def worker(host, port, targets, offset, deadline, use_etag, results):
+    """接続を使い回してリクエストを送り続ける"""
+    conn = http.client.HTTPConnection(host, port)
+    etags = {}
+    latencies = []
+    errors = 0
+    i = offset
+    while time.perf_counter() < deadline:
+        target = targets[i % len(targets)]
+        i += 1
+        headers = {'If-None-Match': etags[target]} if use_etag and target in etags else {}
+        start = time.perf_counter()
+        try:
+            conn.request('GET', target, headers=headers)
+            response = conn.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection(host, port)
+            continue
+        latencies.append(time.perf_counter() - start)
+        if response.status >= 400:
+            errors += 1
+        etags[target] = response.getheader('ETag')
+    conn.close()
+    results.append((latencies, errors))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='serve-api の負荷テスト')
+    parser.add_argument('--url', default='http://127.0.0.1:8765', help='APIのURL')
+    parser.add_argument('-c', '--concurrency', type=int, default=8, help='同時接続数')
+    parser.add_argument('-d', '--duration', type=float, default=10, help='計測時間（秒）')
+    parser.add_argument('--etag', action='store_true', help='2回目以降は If-None-Match を付ける')
+    args = parser.parse_args()
+
+    url = urlsplit(args.url)
+    try:
+        conn = http.client.HTTPConnection(url.hostname, url.port or 80)
+        targets = build_targets(conn)
+        conn.close()
+    except OSError as e:
+        print(f'エラー: {args.url} に接続できません（{e}）')
+        sys.exit(1)
+
+    print(f'{len(targets)} 種類のURLに {args.concurrency} 接続で {args.duration:.0f} 秒間リクエストします')
+    deadline = time.perf_counter() + args.duration
+    results = []
+    threads = [
+        threading.Thread(target=worker, args=(url.hostname, url.port or 80, targets,
+                                              n * len(targets) // args.concurrency,
+                                              deadline, args.etag, results))
+        for n in range(args.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies = sorted(latency for result in results for latency in result[0])
+    errors = sum(result[1] for result in results)
+    if not latencies:
+        print('応答がありませんでした')
+        sys.exit(1)
+
+    def percentile(p):
+        return latencies[min(int(len(latencies) * p), len(latencies) - 1)] * 1000
+
+    print(f'リクエスト数: {len(latencies)}（エラー {errors}）')
+    print(f'スループット: {len(latencies) / args.duration:.0f} req/s')
+    print(f'応答時間: 中央値 {percentile(0.5):.2f} ms / 95% {percentile(0.95):.2f} ms / 99% {percentile(0.99):.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+build.py 起動時間ベンチマーク
+python -X importtime の出力からモジュールごとの読み込み時間を集計し、
+--help と変更なしビルドの所要時間（中央値）を表示する
+
+使い方:
+    python bench_startup.py [-n 5] [--top 15]
+    python bench_startup.py --no-build      # 読み込み時間と --help のみ計測
+"""
+import sys
+import time
+import argparse
+import subprocess
+from pathlib import Path
+
+BUILD_SCRIPT = Path(__file__).parent / 'build.py'
+
+
+def import_times(args):
+    """
+    python -X importtime で build.py を実行し、モジュールごとの読み込み時間を返す
+
+    Returns:
+        [(モジュール名, 自身の時間μs, 累積時間μs, 入れ子の深さ), ...]（読み込み順）
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', str(BUILD_SCRIPT), *args],
+        capture_output=True, text=True, cwd=BUILD_SCRIPT.parent
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return modules
+
+
+def wall_time(args, runs):
+    """build.py を runs 回実行した所要時間の中央値（秒）"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, str(BUILD_SCRIPT), *args],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=BUILD_SCRIPT.parent)
+        times.append(time.perf_counter() - start)
+    return sorted(times)[len(times) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='build.py の起動時間ベンチマーク')
+    parser.add_argument('-n', '--runs', type=int, default=5, help='計測回数')
+    parser.add_argument('--top', type=int, default=15, help='表示するモジュール数')
+    parser.add_argument('--no-build', action='store_true', help='変更なしビルドを計測しない')
+    args = parser.parse_args()
+
+    for label, build_args in [('--help', ['--help']), ('変更なしビルド', [])]:
+        if build_args == [] and args.no_build:
+            continue
+        modules = import_times(build_args)
+        top_level = [m for m in modules if m[3] == 0]
+        total = sum(m[2] for m in top_level)
+        print(f'[{label}] 読み込み {len(modules)} モジュール / 合計 {total / 1000:.1f} ms')
+        for name, _, cumulative, _ in sorted(top_level, key=lambda m: -m[2])[:args.top]:
+            print(f'    {cumulative / 1000:7.1f} ms  {name}')
+
+    # 1回目はキャッシュ等を温めるため計測に含めない
+    print()
+    print(f'python -c pass : {wall_time_python(args.runs) * 1000:6.0f} ms')
+    wall_time(['--help'], 1)
+    print(f'build.py --help: {wall_time(["--help"], args.runs) * 1000:6.0f} ms')
+    if not args.no_build:
+        wall_time([], 1)
+        print(f'変更なしビルド : {wall_time([], args.runs) * 1000:6.0f} ms')
+
+
+def wall_time_python(runs):
+    """インタプリタ自体の起動時間（比較用）"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'pass'])
+        times.append(time.perf_counter() - start)
+    return sorted(times)[len(times) // 2]
+
+
+if __name__ == '__main__':
+    main()
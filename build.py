@@ -6,16 +6,31 @@ Markdown/JSONからHTMLを生成するメインスクリプト
 import os
 import sys
 import json
-import shutil
 import argparse
+import hashlib
+import threading
 from datetime import datetime
 from pathlib import Path
 
 # ビルドツールのインポート
+# 毎回のビルドで使うものだけを読み込み、法令の解析・検索用データベース・API・常駐ビルド・
+# バンドル等は使う手順の中で読み込む（--help や変更のないビルドの起動を速くするため）
 from lib.template_engine import TemplateEngine
 from lib.markdown_parser import MarkdownParser
 from lib.auto_linker import AutoLinker
-from lib.standards_parser import StandardsParser
+from lib.service_worker import generate_service_worker
+from lib.sitemap import (
+    load_build_manifest, update_build_manifest, generate_sitemap, generate_robots
+)
+from lib import page_weight
+from lib.asset_fingerprint import fingerprint_assets
+from lib.glossary import write_glossary
+from lib.image_sync import sync_images, ResponsiveImages, PIL_AVAILABLE
+from lib.fragment_cache import FragmentCache, resolve_cache_dir, DEFAULT_MAX_AGE_DAYS
+from lib.build_graph import BuildGraph
+from lib.build_stamps import BuildStamps
+from lib.site_tree import SiteTree, render_key
+from lib.file_utils import file_hash, tree_signature, load_hash_cache, save_hash_cache
 
 # 設定
 BASE_DIR = Path(__file__).parent
@@ -24,12 +39,41 @@ DATA_DIR = BASE_DIR / "data"
 TEMPLATES_DIR = BASE_DIR / "templates"
 DOCS_DIR = BASE_DIR / "docs"
 IMAGES_DIR = BASE_DIR / "images"
+CACHE_DIR = BASE_DIR / ".cache"
+CORPUS_DB_PATH = BASE_DIR / "corpus.sqlite"
+BUNDLE_DIR = BASE_DIR / "bundle"
+
+# Markdownページの描画方法を変更した場合は番号を上げる（描画キャッシュを無効化）
+PAGE_RENDERER_VERSION = "2"
+
+# 法令ページ・検索用データベースの生成に使うコード（変更されたら手順を省略しない）
+STANDARDS_SOURCES = [
+    BASE_DIR / "generate_kaishaku_html.py",
+    BASE_DIR / "lib" / "standards_parser.py",
+    BASE_DIR / "lib" / "standards_export.py",
+    BASE_DIR / "lib" / "standards_toc.py",
+    BASE_DIR / "lib" / "cross_reference.py",
+    BASE_DIR / "lib" / "numbering.py",
+]
+CORPUS_SOURCES = STANDARDS_SOURCES + [BASE_DIR / "lib" / "corpus_db.py"]
+
+# ビルド手順の実行記録・内容ハッシュの記憶（マシン固有のため共有キャッシュには置かない）
+STAMPS_PATH = CACHE_DIR / "build_stamps.json"
+HASH_CACHE_PATH = CACHE_DIR / "file_hashes.json"
 
 class HoanPediaBuilder:
     """ほあんペディアビルダー"""
     
-    def __init__(self, clean=False):
+    def __init__(self, clean=False, jobs=4, bundle=False, warm=None, cache_dir=None):
         self.clean = clean
+        self.jobs = jobs
+        self.bundle = bundle
+        # 描画結果・計測値のキャッシュ（--cache-dir・環境変数・site.json で共有フォルダを指定できる）
+        self.cache_dir_option = cache_dir
+        self.cache_dir = CACHE_DIR
+        self.page_cache = None
+        # 常駐ビルドでビルド間に保持する部品（WarmState、通常のビルドでは None）
+        self.warm = warm
         self.warnings = []
         self.errors = []
         self.generated_files = 0
@@ -42,22 +86,54 @@ class HoanPediaBuilder:
         self.standards_parser = None
         self.site_config = {}
         self.terms = []
+        self.asset_map = {}
+        self.responsive_images = None
+        self.site_tree = None
+        self.render_salt = None
+        self.standards_laws = []
+        self.build_manifest = {}
+        self.previous_manifest = {}
+        self.graph = None
+        self.stamps = None
+        
+        # 並行実行中の手順のログは手順ごとにためて、終了時にまとめて表示
+        self._local = threading.local()
+        self._lock = threading.Lock()
     
     def log(self, message, level="INFO"):
         """ログ出力"""
         if level == "WARNING":
             self.warnings.append(message)
-            print(f"[警告] {message}")
+            self._print(f"[警告] {message}")
         elif level == "ERROR":
             self.errors.append(message)
-            print(f"[エラー] {message}")
+            self._print(f"[エラー] {message}")
         else:
-            print(f"      → {message}")
+            self._print(f"      → {message}")
+    
+    def _print(self, line):
+        """手順の実行中ならログをためる"""
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            print(line)
+        else:
+            buffer.append(line)
+    
+    def count_generated(self, count=1):
+        """生成ファイル数を加算（並行実行中の手順から呼ばれる）"""
+        with self._lock:
+            self.generated_files += count
     
     def log_step(self, step, total, message):
         """ステップログ"""
         print(f"\n[{step}/{total}] {message}")
     
+    def reuse(self, name, signature, create):
+        """常駐ビルドでは入力の署名が前回と同じ部品を再利用（通常は毎回 create() で作成）"""
+        if self.warm is None:
+            return create()
+        return self.warm.get(name, signature, create)
+    
     def load_json(self, filepath):
         """JSONファイルを読み込む"""
         try:
@@ -82,41 +158,131 @@ class HoanPediaBuilder:
         if self.clean:
             self.clean_docs()
         
-        # Step 1: 設定読み込み
-        self.log_step(1, 7, "設定を読み込み中...")
-        if not self.load_config():
-            return False
-        
-        # Step 2: 用語辞書読み込み
-        self.log_step(2, 7, "用語辞書を読み込み中...")
-        if not self.load_terms():
-            return False
-        
-        # Step 3: テンプレート読み込み
-        self.log_step(3, 7, "テンプレートを読み込み中...")
-        if not self.load_templates():
-            return False
-        
-        # Step 4: Markdownファイル処理
-        self.log_step(4, 7, "Markdownファイルを処理中...")
-        self.process_markdown_files()
-        
-        # Step 5: 法令ページ生成
-        self.log_step(5, 7, "法令ページを生成中...")
-        self.generate_standards_pages()
-        
-        # Step 6: トップページ生成
-        self.log_step(6, 7, "トップページを生成中...")
-        self.generate_top_page()
-        
-        # Step 7: 静的ファイルコピー
-        self.log_step(7, 7, "静的ファイルをコピー中...")
-        self.copy_static_files()
+        # 前回から入力・出力が変わっていない手順は省略する（クリーンビルドでは記録を使わない）
+        self.stamps = BuildStamps(STAMPS_PATH)
+        if self.clean:
+            self.stamps.steps = {}
+        
+        # 原稿・設定・テンプレート・ビルドのコードと出力が、警告なしで終わった前回のビルドと
+        # すべて同じなら手順を実行しない（日付が変わった最初のビルドは lastmod 等のため実行する）
+        site_key = render_key(
+            tree_signature(*self.build_inputs()),
+            self.start_time.date().isoformat(),
+            self.bundle
+        )
+        if self.stamps.is_fresh("site", site_key, self.build_outputs()):
+            print("\n原稿・設定・出力に前回のビルドからの変更はありません（ビルドを省略）")
+            self.print_summary()
+            return True
+        self.stamps.forget("site")
+        load_hash_cache(HASH_CACHE_PATH)
+        
+        # 各手順が読み書きする資源を宣言し、依存関係のない手順は並行実行する
+        self.graph = self.create_build_graph()
+        self.graph.run(
+            workers=self.jobs,
+            on_start=self._on_task_start,
+            on_finish=self._on_task_finish
+        )
+        success = self.graph.succeeded() and len(self.errors) == 0
+        if success and not self.warnings:
+            self.stamps.record("site", site_key, self.build_outputs())
+        self.stamps.save()
+        save_hash_cache(HASH_CACHE_PATH)
         
         # 完了メッセージ
         self.print_summary()
         
-        return len(self.errors) == 0
+        return success
+    
+    def build_inputs(self):
+        """ビルド全体の入力（原稿・データ・テンプレート・画像・ビルドのコード）"""
+        return [
+            CONTENT_DIR, DATA_DIR, TEMPLATES_DIR, IMAGES_DIR,
+            BASE_DIR / "build.py",
+            BASE_DIR / "generate_kaishaku_html.py",
+            *sorted((BASE_DIR / "lib").glob("*.py")),
+        ]
+    
+    def build_outputs(self):
+        """ビルド全体の出力（docs/ のCSS・JS原本もここに含まれる）"""
+        outputs = [DOCS_DIR, CORPUS_DB_PATH]
+        if self.bundle:
+            outputs.append(BUNDLE_DIR)
+        return outputs
+    
+    def create_build_graph(self):
+        """ビルド手順の依存グラフを作成"""
+        graph = BuildGraph()
+        graph.add("config", "設定を読み込み中...",
+                  self.load_config,
+                  outputs=["site_config"])
+        graph.add("terms", "用語辞書を読み込み中...",
+                  self.load_terms,
+                  outputs=["auto_linker"])
+        graph.add("templates", "テンプレートを読み込み中...",
+                  self.load_templates,
+                  inputs=["site_config"], outputs=["template_engine"])
+        graph.add("assets", "静的アセットにハッシュを付与中...",
+                  self.fingerprint_assets,
+                  inputs=["site_config", "auto_linker", "template_engine"], outputs=["asset_map"])
+        graph.add("markdown", "Markdownファイルを処理中...",
+                  self.process_markdown_files,
+                  inputs=["site_config", "auto_linker", "template_engine", "asset_map"],
+                  outputs=["content_pages", "responsive_images"])
+        graph.add("standards", "法令ページを生成中...",
+                  self.generate_standards_pages,
+                  inputs=["site_config", "auto_linker", "template_engine", "asset_map"],
+                  outputs=["standards_pages"])
+        graph.add("corpus", "検索用データベースを更新中...",
+                  self.export_corpus,
+                  inputs=["content_pages", "standards_pages"],
+                  outputs=["corpus_db"])
+        graph.add("top", "トップページを生成中...",
+                  self.generate_top_page,
+                  outputs=["top_page"])
+        graph.add("static", "静的ファイルをコピー中...",
+                  self.copy_static_files,
+                  inputs=["responsive_images"], outputs=["images"])
+        graph.add("service_worker", "オフライン用サービスワーカーを生成中...",
+                  self.generate_service_worker,
+                  inputs=["site_config", "asset_map", "content_pages",
+                          "standards_pages", "top_page", "images"],
+                  outputs=["sw"])
+        graph.add("manifest", "ビルドマニフェストを更新中...",
+                  self.update_manifest,
+                  inputs=["content_pages", "standards_pages", "top_page"],
+                  outputs=["build_manifest"])
+        graph.add("sitemap", "サイトマップを生成中...",
+                  self.generate_sitemap,
+                  inputs=["site_config", "build_manifest"],
+                  outputs=["sitemap"])
+        graph.add("budgets", "ページ重量を確認中...",
+                  self.check_page_weight,
+                  inputs=["site_config", "build_manifest"],
+                  outputs=["weight_report"])
+        if self.bundle:
+            graph.add("bundle", "オフライン用バンドルを作成中...",
+                      self.write_bundle,
+                      inputs=["content_pages", "standards_pages", "top_page", "images",
+                              "sw", "build_manifest", "sitemap"],
+                      outputs=["bundle"])
+        return graph
+    
+    def _on_task_start(self, task):
+        self._local.buffer = []
+    
+    def _on_task_finish(self, task, error):
+        """手順の見出しとためたログを表示"""
+        if error is not None:
+            self.log(f"{task.label.rstrip('.')}: 処理エラー（{error}）", "ERROR")
+        lines = self._local.buffer
+        self._local.buffer = None
+        
+        step = list(self.graph.tasks).index(task.name) + 1
+        self.log_step(step, len(self.graph.tasks), task.label)
+        for line in lines:
+            print(line)
     
     def clean_docs(self):
         """docs/フォルダをクリーン"""
@@ -144,6 +310,12 @@ class HoanPediaBuilder:
         else:
             self.log("site.json を読み込みました")
         
+        self.cache_dir = resolve_cache_dir(
+            self.cache_dir_option, self.site_config.get("cache_dir"), CACHE_DIR, BASE_DIR
+        )
+        if self.cache_dir != CACHE_DIR:
+            self.log(f"ビルドキャッシュ: {self.cache_dir}")
+        
         return True
     
     def load_terms(self):
@@ -156,7 +328,9 @@ class HoanPediaBuilder:
         
         if data and "terms" in data:
             self.terms = data["terms"]
-            self.auto_linker = AutoLinker(self.terms)
+            self.auto_linker = self.reuse(
+                "auto_linker", tree_signature(terms_path), lambda: AutoLinker(self.terms)
+            )
             self.log(f"{len(self.terms)} 件の用語を登録しました")
         else:
             self.terms = []
@@ -167,8 +341,17 @@ class HoanPediaBuilder:
     
     def load_templates(self):
         """テンプレートを読み込む"""
-        self.template_engine = TemplateEngine(TEMPLATES_DIR, self.site_config)
-        template_count = self.template_engine.load_all()
+        def create():
+            engine = TemplateEngine(TEMPLATES_DIR, self.site_config)
+            engine.load_all()
+            return engine
+        
+        self.template_engine = self.reuse(
+            "template_engine",
+            (tree_signature(TEMPLATES_DIR), json.dumps(self.site_config, sort_keys=True)),
+            create
+        )
+        template_count = len(self.template_engine.templates)
         
         if template_count > 0:
             self.log(f"{template_count} 件のテンプレートを読み込みました")
@@ -177,27 +360,116 @@ class HoanPediaBuilder:
         
         return True
     
+    def fingerprint_assets(self):
+        """CSS等にハッシュ付きファイル名のコピーを作成し、参照先を切り替える"""
+        # ツールチップ用の用語集JSON（内容が変わればハッシュ付きファイル名も変わる）
+        term_count = write_glossary(DOCS_DIR, self.auto_linker)
+        self.log(f"用語集JSON ... {term_count} 語")
+        
+        self.asset_map = fingerprint_assets(DOCS_DIR, self.site_config.get("fingerprint_assets"))
+        self.template_engine.set_assets(self.asset_map)
+        
+        # ページで使うCSSルールを <head> に埋め込む（"critical_css": false で無効）
+        stylesheet = DOCS_DIR / "css" / "style.css"
+        if self.site_config.get("critical_css", True) and stylesheet.exists():
+            with open(stylesheet, "r", encoding="utf-8") as f:
+                self.template_engine.set_stylesheet(f.read())
+        
+        for original, hashed in self.asset_map.items():
+            self.log(f"{original} → {hashed}")
+    
     def process_markdown_files(self):
         """Markdownファイルを処理"""
-        self.markdown_parser = MarkdownParser()
-        
-        # content/ 内の全 .md ファイルを処理
-        md_files = list(CONTENT_DIR.rglob("*.md"))
-        
-        if not md_files:
+        self.markdown_parser = self.reuse("markdown_parser", None, MarkdownParser)
+        self.responsive_images = ResponsiveImages(
+            IMAGES_DIR,
+            DOCS_DIR,
+            self.site_config.get("images")
+        )
+        
+        # 全ページのフロントマターを先に読み込み、ページ構成を作成
+        # （パンくず・子ページ一覧・前後ページのリンクに使用）
+        self.site_tree = SiteTree(CONTENT_DIR, CACHE_DIR / "site_tree.json")
+        page_count = self.site_tree.build(self.markdown_parser.read_frontmatter)
+        
+        if not page_count:
             self.log("Markdownファイルが見つかりません")
             return
         
-        for md_file in md_files:
+        # 全ページ共通の描画条件（テンプレート・用語辞書・画像設定・変換ツール）
+        self.render_salt = render_key(
+            PAGE_RENDERER_VERSION,
+            self.template_engine.version(),
+            self.auto_linker.version(),
+            self.site_config.get("images"),
+            self.markdown_parser.version(),
+            PIL_AVAILABLE
+        )
+        # 描画キーは入力内容だけで決まるため、他の環境で描画したページも使える
+        self.page_cache = FragmentCache(self.cache_dir, "pages")
+        
+        # 削除されたMarkdownの出力を削除（描画した出力を消さないよう、描画より先に行う）
+        for url in self.site_tree.removed:
+            stale = DOCS_DIR / url
+            if stale.exists():
+                stale.unlink()
+                self.log(f"{url} ... 元ファイルがないため削除")
+        
+        rendered = 0
+        for relative in self.site_tree.pages:
+            md_file = CONTENT_DIR / relative
             try:
-                self.process_single_markdown(md_file)
+                if self.process_single_markdown(md_file):
+                    rendered += 1
             except Exception as e:
                 self.log(f"{md_file.name}: 処理エラー（{e}）", "WARNING")
         
-        self.log(f"{len(md_files)} ファイルを処理しました")
+        self.site_tree.save()
+        self.page_cache.prune(self.cache_max_age())
+        self.log(f"{page_count} ファイルを処理しました"
+                 f"（再生成 {rendered} / 変更なし {page_count - rendered}、"
+                 f"うちキャッシュから {self.page_cache.hits}）")
     
     def process_single_markdown(self, md_file):
-        """単一のMarkdownファイルを処理"""
+        """
+        単一のMarkdownファイルを処理
+        
+        Returns:
+            再生成した場合 True（内容・ナビゲーション・描画条件が前回と同じなら False）
+        """
+        relative = md_file.relative_to(CONTENT_DIR).as_posix()
+        output_path = self.get_output_path(md_file)
+        navigation = self.site_tree.navigation(relative)
+        
+        # 本文・ナビゲーションが前回と同じなら出力済みのHTMLをそのまま使う
+        key = render_key(self.render_salt, relative, file_hash(md_file, 16), navigation)
+        if self.site_tree.is_fresh(relative, key, output_path):
+            self.page_cache.mark_used(key)
+            self.responsive_images.used_variants.update(self.site_tree.pages[relative]["variants"])
+            return False
+        
+        # 同じ入力から描画済み（他の環境・以前のビルド）ならその結果を使う
+        cached = self.page_cache.get(key)
+        if cached and self.responsive_images.has_variants(cached["variants"]):
+            final_html, variants = cached["html"], cached["variants"]
+        else:
+            final_html = self.render_markdown(md_file, output_path, navigation)
+            variants = sorted(self.responsive_images.page_variants)
+            self.page_cache.put(key, {"html": final_html, "variants": variants})
+        self.responsive_images.used_variants.update(variants)
+        
+        # 出力
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(final_html)
+        
+        self.site_tree.mark_rendered(relative, key, output_path, variants)
+        self.count_generated()
+        self.log(f"{md_file.name} ... 完了")
+        return True
+    
+    def render_markdown(self, md_file, output_path, navigation):
+        """MarkdownをページのHTMLに変換（テンプレート適用まで）"""
         # フロントマター解析とHTML変換
         frontmatter, html_content = self.markdown_parser.parse_file(md_file)
         
@@ -205,9 +477,11 @@ class HoanPediaBuilder:
         html_content = self.convert_md_links(html_content)
         
         # 自動リンク適用
-        output_path = self.get_output_path(md_file)
         html_content = self.auto_linker.apply(html_content, str(output_path))
         
+        # 画像に縮小版・WebP版の srcset を付与
+        html_content = self.responsive_images.apply(html_content, output_path)
+        
         # 出力パスの深さを計算（CSSパス調整用）
         relative_path = output_path.relative_to(DOCS_DIR)
         depth = len(relative_path.parts) - 1  # ファイル名を除く
@@ -218,19 +492,15 @@ class HoanPediaBuilder:
             "page_title": frontmatter.get("title", md_file.stem),
             "page_description": frontmatter.get("description", ""),
             "content": html_content,
-            "breadcrumb": self.generate_breadcrumb(md_file, frontmatter),
+            "breadcrumb": self.generate_breadcrumb(navigation, depth),
+            "children": navigation["children"],
+            "prev_page": navigation["prev"],
+            "next_page": navigation["next"],
+            "page_nav": bool(navigation["prev"] or navigation["next"]),
             "depth": depth
         }
         
-        final_html = self.template_engine.render(template_name, context)
-        
-        # 出力
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(final_html)
-        
-        self.generated_files += 1
-        self.log(f"{md_file.name} ... 完了")
+        return self.template_engine.render(template_name, context)
     
     def get_output_path(self, md_file):
         """Markdownファイルの出力先パスを取得"""
@@ -250,32 +520,236 @@ class HoanPediaBuilder:
         html_content = re.sub(r'\]\(([^)]+)\.md\)', r'](\1.html)', html_content)
         return html_content
     
-    def generate_breadcrumb(self, md_file, frontmatter):
-        """パンくずナビゲーションを生成"""
-        # 簡易実装：後で拡張可能
-        return ""
+    def generate_breadcrumb(self, navigation, depth):
+        """パンくずナビゲーションを生成（サイトツリーの祖先ページから作成）"""
+        return self.template_engine.render(
+            "partials/breadcrumb",
+            {"breadcrumb": navigation["breadcrumb"], "depth": depth}
+        )
     
-    def generate_standards_pages(self):
-        """法令ページを生成"""
+    def load_standards(self):
+        """
+        法令テキストを解析（standards_laws に法令ごとの条文リストを設定）
+        
+        Returns:
+            省令テキストのファイルリスト（法令フォルダがなければ None）
+        """
+        from lib.standards_parser import StandardsParser
+        from generate_kaishaku_html import parse_kaishaku_text, read_kaishaku_text, number_to_id, split_blocks
+        
         self.standards_parser = StandardsParser()
         standards_dir = CONTENT_DIR / "standards" / "dengi"
+        kaishaku_dir = CONTENT_DIR / "standards" / "kaishaku"
         
-        if not standards_dir.exists():
+        if not standards_dir.exists() and not kaishaku_dir.exists():
             self.log("法令テキストフォルダが見つかりません")
+            return None
+        
+        txt_files = list(standards_dir.glob("*.txt"))
+        dengi_articles, kaishaku_articles = self.reuse(
+            "standards",
+            tree_signature(standards_dir, kaishaku_dir),
+            lambda: (
+                self.standards_parser.parse(txt_files) if txt_files else [],
+                parse_kaishaku_text(read_kaishaku_text(kaishaku_dir, verbose=False))
+                if kaishaku_dir.exists() else []
+            )
+        )
+        
+        # 検索用データベース・APIに渡す条文
+        self.standards_laws = [
+            {"law": "shorei", "url": "standards/index.html",
+             "articles": dengi_articles, "to_id": self.standards_parser.article_id},
+            {"law": "kaishaku", "url": "standards/kaishaku/index.html",
+             "articles": kaishaku_articles, "to_id": number_to_id, "to_blocks": split_blocks},
+        ]
+        return txt_files
+    
+    def generate_standards_pages(self):
+        """法令ページを生成"""
+        # 法令テキスト・生成コード・テンプレート・用語辞書が前回と同じで、出力も変わっていなければ省略
+        stamp_key = render_key(
+            tree_signature(CONTENT_DIR / "standards", *STANDARDS_SOURCES),
+            self.template_engine.version(),
+            self.auto_linker.version()
+        )
+        outputs = [DOCS_DIR / "standards"]
+        if self.stamps.is_fresh("standards", stamp_key, outputs):
+            self.log("法令テキスト・テンプレートに変更なし（前回の出力を使用）")
             return
+        self.stamps.forget("standards")
+        
+        from lib.cross_reference import CrossReferenceResolver, article_ids
+        from generate_kaishaku_html import generate_kaishaku, number_to_id
+        
+        # 全法令を先に解析し、条文引用のリンク先（アンカー表）を作成
+        txt_files = self.load_standards()
+        if txt_files is None:
+            return
+        dengi_articles = self.standards_laws[0]["articles"]
+        kaishaku_articles = self.standards_laws[1]["articles"]
+        kaishaku_dir = CONTENT_DIR / "standards" / "kaishaku"
+        
+        cross_ref = CrossReferenceResolver()
+        cross_ref.register(
+            "shorei",
+            "standards/index.html",
+            article_ids(dengi_articles, self.standards_parser.article_id)
+        )
+        cross_ref.register(
+            "kaishaku",
+            "standards/kaishaku/index.html",
+            article_ids(kaishaku_articles, number_to_id)
+        )
         
         # 電気設備技術基準の生成
-        txt_files = list(standards_dir.glob("*.txt"))
-        if txt_files:
+        if dengi_articles:
             article_count = self.standards_parser.generate(
                 txt_files,
                 DOCS_DIR / "standards" / "index.html",
                 self.template_engine,
                 self.auto_linker,
-                self.site_config
+                self.site_config,
+                articles=dengi_articles,
+                cross_ref=cross_ref
             )
             self.log(f"電気設備技術基準 ... {article_count}条を生成しました")
-            self.generated_files += 1
+            self.count_generated()
+        
+        # 電気設備技術基準の解釈の生成
+        if kaishaku_articles:
+            # 条文本文は内容・アンカー表が同じなら前回の描画結果を再利用
+            # （本文は用語の自動リンクを使わないため、用語辞書の変更では作り直さない）
+            cache = FragmentCache(self.cache_dir, "kaishaku", salt=cross_ref.version())
+            article_count = generate_kaishaku(
+                kaishaku_dir,
+                DOCS_DIR / "standards" / "kaishaku",
+                lazy=self.site_config.get("standards_lazy", False),
+                verbose=False,
+                asset_map=self.asset_map,
+                cross_ref=cross_ref,
+                articles=kaishaku_articles,
+                cache=cache,
+                template_engine=self.template_engine,
+                # 大きな表は専用ページに分ける（"standards_split_tables": false で本文に埋め込む）
+                split_tables=self.site_config.get("standards_split_tables", True)
+            )
+            cache.prune(self.cache_max_age())
+            if article_count:
+                self.log(f"電気設備技術基準の解釈 ... {article_count}条を生成しました"
+                         f"（再利用 {cache.hits} / 再描画 {cache.misses}）")
+                self.count_generated()
+        
+        self.stamps.record("standards", stamp_key, outputs)
+    
+    def export_corpus(self):
+        """条文・表・Markdownページを検索用のSQLiteデータベースに書き出す"""
+        # 法令テキスト・Markdownが前回と同じで、データベースも変わっていなければ省略
+        stamp_key = render_key(tree_signature(CONTENT_DIR, *CORPUS_SOURCES))
+        if self.stamps.is_fresh("corpus", stamp_key, [CORPUS_DB_PATH]):
+            self.log(f"{CORPUS_DB_PATH.name} ... 変更なし")
+            return
+        self.stamps.forget("corpus")
+        
+        from lib.corpus_db import CorpusDatabase
+        
+        # 法令ページの生成を省略した場合はここで法令テキストを解析
+        if not self.standards_laws:
+            self.load_standards()
+        corpus = CorpusDatabase(CORPUS_DB_PATH)
+        unit_count = corpus.update(self.standards_laws, self.page_sources())
+        self.log(f"{CORPUS_DB_PATH.name} ... {unit_count} 件"
+                 f"（更新 {corpus.updated} / 削除 {corpus.removed}）")
+        self.stamps.record("corpus", stamp_key, [CORPUS_DB_PATH])
+    
+    def page_sources(self):
+        """サイトツリーの全ページの情報とMarkdown本文（フロントマターを除く）"""
+        pages = []
+        if not self.site_tree:
+            return pages
+        for relative, page in self.site_tree.pages.items():
+            with open(CONTENT_DIR / relative, "r", encoding="utf-8") as f:
+                body = self.markdown_parser.split_frontmatter(f.read())[1]
+            pages.append({
+                "path": relative,
+                "url": page["url"],
+                "title": page["title"],
+                "description": page["description"],
+                "section": page["section"],
+                "body": body,
+            })
+        return pages
+    
+    def serve_api(self, host, port, cache_size):
+        """解析済みの条文・ページ・用語をJSON APIとして提供"""
+        from lib.api_server import CorpusIndex, CorpusAPI, create_server
+        
+        self.start_time = datetime.now()
+        self.load_config()
+        self.load_terms()
+        self.load_standards()
+        self.markdown_parser = MarkdownParser()
+        self.site_tree = SiteTree(CONTENT_DIR, CACHE_DIR / "site_tree.json")
+        self.site_tree.build(self.markdown_parser.read_frontmatter)
+        
+        index = CorpusIndex(
+            self.standards_laws,
+            self.page_sources(),
+            self.terms,
+            self.auto_linker.term_ids
+        )
+        server = create_server(CorpusAPI(index, cache_size), host, port)
+        elapsed = (datetime.now() - self.start_time).total_seconds()
+        self.log(f"条文 {len(index.articles)} / ページ {len(index.pages)} / 用語 {len(self.terms)} 件を"
+                 f"読み込みました（{elapsed:.2f} 秒）")
+        self.log(f"http://{host}:{server.server_address[1]}/api/laws で待機中（Ctrl+C で終了）")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+    
+    @staticmethod
+    def run_daemon(host, port, cache_dir=None):
+        """
+        常駐ビルド（build_client.py からの要求でビルドする）
+        
+        用語辞書・テンプレート・Markdownパーサー・解析済みの法令をビルド間で保持し、
+        入力ファイルが変わった部品だけを作り直す
+        """
+        from lib.build_daemon import WarmState, serve_builds
+        
+        warm = WarmState()
+        
+        def build(options):
+            builder = HoanPediaBuilder(
+                jobs=options.get("jobs", 4),
+                bundle=options.get("bundle", False),
+                warm=warm,
+                cache_dir=cache_dir
+            )
+            success = builder.build()
+            print(f"常駐部品: 再利用 {warm.hits} / 作成 {warm.misses}（累計）")
+            return success
+        
+        def ready(server):
+            print(f"常駐ビルド: {host}:{server.server_address[1]} で待機中"
+                  f"（python build_client.py でビルド、Ctrl+C で終了）")
+        
+        serve_builds(build, host, port, on_ready=ready)
+    
+    def cache_max_age(self):
+        """使われていないキャッシュを残す日数（site.json の "cache_max_age_days"）"""
+        return self.site_config.get("cache_max_age_days", DEFAULT_MAX_AGE_DAYS)
+    
+    def write_bundle(self):
+        """docs/ をタブレット同期用のアーカイブと内容ハッシュのマニフェストにまとめる"""
+        from lib.bundle import write_bundle
+        
+        manifest = write_bundle(DOCS_DIR, BUNDLE_DIR, self.site_config.get("bundle_exclude", []))
+        self.log(f"{manifest['archive']} ... {len(manifest['files'])} ファイル"
+                 f"（{manifest['size'] / 1024:.1f}KB）")
     
     def generate_top_page(self):
         """トップページを生成"""
@@ -289,20 +763,79 @@ class HoanPediaBuilder:
     
     def copy_static_files(self):
         """静的ファイルをコピー"""
-        # 画像ファイルをコピー
+        # 画像ファイルを差分同期（変更・追加分のみコピー、削除分は除去）
         if IMAGES_DIR.exists():
-            dest_images = DOCS_DIR / "images"
-            if dest_images.exists():
-                shutil.rmtree(dest_images)
-            shutil.copytree(IMAGES_DIR, dest_images)
-            image_count = len(list(dest_images.rglob("*.*")))
-            self.log(f"画像: {image_count} ファイル")
+            copied, removed, unchanged = sync_images(IMAGES_DIR, DOCS_DIR / "images")
+            self.log(f"画像: コピー {copied} / 削除 {removed} / 変更なし {unchanged} ファイル")
+            
+            if self.responsive_images and self.responsive_images.enabled:
+                stale = self.responsive_images.cleanup()
+                variant_count = len(self.responsive_images.used_variants)
+                self.log(f"縮小版画像: {variant_count} ファイル（古い縮小版 {stale} ファイルを削除）")
         else:
             self.log("画像フォルダが見つかりません（スキップ）")
         
         # CSSは既存のものを維持
         self.log("CSS: 既存ファイルを維持")
     
+    def generate_service_worker(self):
+        """サービスワーカーとプリキャッシュマニフェストを生成"""
+        patterns = self.site_config.get("precache")
+        file_count = generate_service_worker(DOCS_DIR, patterns)
+        self.log(f"sw.js ... {file_count} ファイルをプリキャッシュ対象に登録")
+    
+    def update_manifest(self):
+        """出力HTMLの内容ハッシュ・最終更新日・重量をビルドマニフェストに記録"""
+        self.previous_manifest = load_build_manifest(DOCS_DIR)
+        
+        # 重量は同じ内容・同じ計測ツールなら他の環境の計測結果も使う
+        weight_cache = FragmentCache(self.cache_dir, "weights", salt=page_weight.measure_version())
+        
+        def measure(path):
+            with open(path, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+            return weight_cache.get_or_compute(weight_cache.key(digest), lambda: page_weight.measure_page(path))
+        
+        # lastmod はビルド日時ではなく、内容ハッシュが変わった日
+        self.build_manifest, changed = update_build_manifest(
+            DOCS_DIR,
+            previous=self.previous_manifest,
+            measure=measure,
+            needs_measure=page_weight.needs_measure
+        )
+        weight_cache.prune(self.cache_max_age())
+        self.log(f"build-manifest.json ... {len(self.build_manifest)} ページ（内容の変更 {changed} ページ）")
+    
+    def generate_sitemap(self):
+        """sitemap.xml・robots.txt を生成"""
+        pages = self.build_manifest
+        base_url = self.site_config.get("base_url")
+        sitemap_url = None
+        if base_url:
+            generate_sitemap(DOCS_DIR, pages, base_url)
+            sitemap_url = f"{base_url.rstrip('/')}/sitemap.xml"
+            self.log(f"sitemap.xml ... {len(pages)} ページを登録")
+        else:
+            self.log("site.json に base_url がないため sitemap.xml は生成しません")
+        
+        generate_robots(DOCS_DIR, self.site_config.get("robots"), sitemap_url)
+    
+    def check_page_weight(self):
+        """ページ重量を site.json の予算・前回ビルドと比較"""
+        budgets = self.site_config.get("budgets", {})
+        for line in page_weight.summarize(self.build_manifest):
+            self.log(line)
+        
+        over, grown = page_weight.check_budgets(self.build_manifest, self.previous_manifest, budgets)
+        # "fail": true なら予算超過をエラーとしてビルドを失敗させる
+        level = "ERROR" if budgets.get("fail") else "WARNING"
+        for message in over:
+            self.log(message, level)
+        for message in grown:
+            self.log(f"前回ビルドから増加: {message}", "WARNING")
+        if not page_weight.BROTLI_AVAILABLE:
+            self.log("brotli が未インストールのため brotli サイズは計測しません")
+    
     def print_summary(self):
         """ビルド結果サマリーを表示"""
         elapsed = (datetime.now() - self.start_time).total_seconds()
@@ -322,16 +855,46 @@ class HoanPediaBuilder:
         print(f"出力先: {DOCS_DIR}")
         print(f"生成ファイル数: {self.generated_files}")
         print(f"ビルド時間: {elapsed:.1f} 秒")
+        
+        if self.graph:
+            path, total = self.graph.critical_path()
+            chain = " → ".join(f"{task.name}({task.duration:.2f})" for task in path)
+            print(f"クリティカルパス: {chain} = {total:.2f} 秒")
+            skipped = [name for name, task in self.graph.tasks.items() if task.status == "skipped"]
+            if skipped:
+                print(f"未実行の手順: {', '.join(skipped)}")
         print("=" * 60)
 
 
 def main():
     """エントリーポイント"""
     parser = argparse.ArgumentParser(description="ほあんペディア ビルドシステム")
+    parser.add_argument("command", nargs="?", choices=["build", "serve-api", "daemon"], default="build",
+                        help="build: サイトを生成（既定） / serve-api: 条文・用語のJSON APIを起動"
+                             " / daemon: 常駐ビルドを起動")
     parser.add_argument("--clean", action="store_true", help="クリーンビルドを実行")
+    parser.add_argument("-j", "--jobs", type=int, default=4,
+                        help="同時に実行する手順の数（1 で逐次実行）")
+    parser.add_argument("--bundle", action="store_true",
+                        help="ビルド後に bundle/ へオフライン用アーカイブを出力")
+    parser.add_argument("--cache-dir",
+                        help="描画結果・計測値のキャッシュフォルダ（共有フォルダ可。既定: .cache）")
+    parser.add_argument("--host", default="127.0.0.1", help="serve-api・daemon の待ち受けアドレス")
+    parser.add_argument("--port", type=int,
+                        help="serve-api（既定 8765）・daemon（既定 8766）のポート番号")
+    parser.add_argument("--cache-size", type=int,
+                        help="serve-api の応答キャッシュ件数（既定 512）")
     args = parser.parse_args()
     
-    builder = HoanPediaBuilder(clean=args.clean)
+    builder = HoanPediaBuilder(clean=args.clean, jobs=args.jobs, bundle=args.bundle, cache_dir=args.cache_dir)
+    if args.command == "serve-api":
+        from lib.api_server import DEFAULT_CACHE_SIZE
+        builder.serve_api(args.host, args.port or 8765, args.cache_size or DEFAULT_CACHE_SIZE)
+        return
+    if args.command == "daemon":
+        from lib.build_daemon import DEFAULT_DAEMON_PORT
+        HoanPediaBuilder.run_daemon(args.host, args.port or DEFAULT_DAEMON_PORT, args.cache_dir)
+        return
     success = builder.build()
     
     sys.exit(0 if success else 1)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+常駐ビルドのクライアント
+python build.py daemon で起動したデーモンにビルドを要求し、ログを表示する
+（ビルド用のモジュールは読み込まないため、起動してすぐに要求を送れる）
+
+使い方:
+    python build.py daemon &
+    python build_client.py [--bundle] [-j 4]
+    python build_client.py --stop      # デーモンを終了
+"""
+import sys
+import json
+import time
+import socket
+import argparse
+
+DEFAULT_DAEMON_PORT = 8766
+
+
+def main():
+    parser = argparse.ArgumentParser(description='常駐ビルドにビルドを要求')
+    parser.add_argument('--host', default='127.0.0.1', help='デーモンのアドレス')
+    parser.add_argument('--port', type=int, default=DEFAULT_DAEMON_PORT, help='デーモンのポート番号')
+    parser.add_argument('-j', '--jobs', type=int, default=4, help='同時に実行する手順の数')
+    parser.add_argument('--bundle', action='store_true', help='ビルド後にオフライン用アーカイブを出力')
+    parser.add_argument('--stop', action='store_true', help='デーモンを終了')
+    args = parser.parse_args()
+
+    if args.stop:
+        request = {'command': 'stop'}
+    else:
+        request = {'command': 'build', 'options': {'jobs': args.jobs, 'bundle': args.bundle}}
+
+    start = time.perf_counter()
+    try:
+        conn = socket.create_connection((args.host, args.port))
+    except OSError as e:
+        print(f'エラー: 常駐ビルドに接続できません（{e}）')
+        print('python build.py daemon で起動してください')
+        sys.exit(2)
+
+    result = {'success': False, 'error': '応答が途中で切れました'}
+    with conn, conn.makefile('rwb') as stream:
+        stream.write((json.dumps(request) + '\n').encode('utf-8'))
+        stream.flush()
+        for line in stream:
+            message = json.loads(line.decode('utf-8'))
+            if 'output' in message:
+                print(message['output'])
+            else:
+                result = message
+                break
+
+    if result.get('error'):
+        print(f"エラー: {result['error']}")
+    if not args.stop:
+        print(f'応答時間: {(time.perf_counter() - start) * 1000:.0f} ms')
+    sys.exit(0 if result.get('success') else 1)
+
+
+if __name__ == '__main__':
+    main()
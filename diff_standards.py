@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+法令テキスト差分ツール
+新旧2つの版の解釈・省令テキストを解析し、条文単位の差分をHTMLで出力する
+
+使い方:
+    python diff_standards.py 旧ファイルまたはフォルダ 新ファイルまたはフォルダ [-o diff.html]
+    python diff_standards.py --law dengi 旧フォルダ 新フォルダ
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+from lib.numbering import read_text
+from lib.standards_parser import StandardsParser
+from lib.standards_diff import StandardsDiff
+from generate_kaishaku_html import parse_kaishaku_text, read_kaishaku_text, number_to_id
+
+LAW_NAMES = {
+    'kaishaku': '電気設備技術基準の解釈',
+    'dengi': '電気設備技術基準',
+}
+
+
+def load_kaishaku(path):
+    """解釈テキスト（ファイルまたはフォルダ）を解析"""
+    path = Path(path)
+    if path.is_dir():
+        text = read_kaishaku_text(path, verbose=False)
+    else:
+        text = read_text(path)
+    return parse_kaishaku_text(text)
+
+
+def load_dengi(path, parser):
+    """省令テキスト（ファイルまたはフォルダ）を解析"""
+    path = Path(path)
+    txt_files = list(path.glob('*.txt')) if path.is_dir() else [path]
+    return parser.parse(txt_files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='法令テキストの版間差分をHTMLで出力')
+    parser.add_argument('old', help='旧版のテキストファイルまたはフォルダ')
+    parser.add_argument('new', help='新版のテキストファイルまたはフォルダ')
+    parser.add_argument('--law', choices=sorted(LAW_NAMES), default='kaishaku',
+                        help='法令の種類（既定: kaishaku）')
+    parser.add_argument('-o', '--output', default='diff.html', help='出力HTMLパス')
+    parser.add_argument('--common-only', action='store_true',
+                        help='両方の版に存在する条文のみ比較（分割ファイル同士の比較用）')
+    args = parser.parse_args()
+
+    for path in (args.old, args.new):
+        if not Path(path).exists():
+            print(f'エラー: {path} が見つかりません')
+            sys.exit(1)
+
+    start = time.perf_counter()
+
+    if args.law == 'dengi':
+        standards_parser = StandardsParser()
+        old_articles = load_dengi(args.old, standards_parser)
+        new_articles = load_dengi(args.new, standards_parser)
+        to_id = standards_parser.article_id
+    else:
+        old_articles = load_kaishaku(args.old)
+        new_articles = load_kaishaku(args.new)
+        to_id = number_to_id
+
+    diff = StandardsDiff(old_articles, new_articles, to_id).compute()
+    if args.common_only:
+        diff.added = []
+        diff.removed = []
+
+    html = diff.render_html(
+        f'{LAW_NAMES[args.law]} 差分',
+        str(args.old),
+        str(args.new)
+    )
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(html)
+
+    elapsed = time.perf_counter() - start
+    print(f'変更 {len(diff.changed)} 条 / 追加 {len(diff.added)} 条 / '
+          f'削除 {len(diff.removed)} 条 / 変更なし {diff.unchanged} 条')
+    print(f'出力完了: {output_path} ({elapsed:.2f} 秒)')
+
+
+if __name__ == '__main__':
+    main()
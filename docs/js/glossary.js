@@ -0,0 +1,113 @@
+// 用語ツールチップ
+// 自動リンク（a.auto-link[data-term]）にマウスを重ねると用語集の説明を表示する
+// 用語集JSONはセッション中に1回だけ取得する（URLに内容ハッシュを含むので長期キャッシュ可能）
+(function () {
+    const script = document.currentScript;
+    const glossaryUrl = script && script.dataset.glossary;
+    if (!glossaryUrl) {
+        return;
+    }
+
+    let glossary = null;
+    let tooltip = null;
+
+    // sessionStorage は Safari のプライベートモードや無効化された環境では読み書きで例外になる
+    function readStored(key) {
+        try {
+            const stored = sessionStorage.getItem(key);
+            return stored ? JSON.parse(stored) : null;
+        } catch (e) {
+            return null;
+        }
+    }
+
+    function store(key, data) {
+        try {
+            sessionStorage.setItem(key, JSON.stringify(data));
+        } catch (e) {
+            // 保存できなくても表示は続ける
+        }
+    }
+
+    function loadGlossary() {
+        if (!glossary) {
+            const storageKey = 'glossary:' + glossaryUrl;
+            const stored = readStored(storageKey);
+            glossary = stored
+                ? Promise.resolve(stored)
+                : fetch(glossaryUrl)
+                    .then(function (res) { return res.json(); })
+                    .then(function (data) {
+                        store(storageKey, data);
+                        return data;
+                    })
+                    .catch(function () {
+                        glossary = null;
+                        return {};
+                    });
+        }
+        return glossary;
+    }
+
+    function show(link) {
+        loadGlossary().then(function (data) {
+            const entry = data[link.dataset.term];
+            if (!entry || !entry.summary || !link.matches(':hover, :focus')) {
+                return;
+            }
+            if (!tooltip) {
+                tooltip = document.createElement('div');
+                tooltip.className = 'term-tooltip';
+                tooltip.setAttribute('role', 'tooltip');
+                document.body.appendChild(tooltip);
+            }
+            const heading = document.createElement('strong');
+            heading.textContent = entry.word;
+            const parts = [heading];
+            if (entry.reading) {
+                const reading = document.createElement('span');
+                reading.className = 'term-tooltip-reading';
+                reading.textContent = entry.reading;
+                parts.push(reading);
+            }
+            const summary = document.createElement('p');
+            summary.textContent = entry.summary;
+            parts.push(summary);
+            tooltip.replaceChildren(...parts);
+
+            const rect = link.getBoundingClientRect();
+            tooltip.style.left = Math.max(8, rect.left + window.scrollX) + 'px';
+            tooltip.style.top = (rect.bottom + window.scrollY + 6) + 'px';
+            tooltip.hidden = false;
+        });
+    }
+
+    function hide() {
+        if (tooltip) {
+            tooltip.hidden = true;
+        }
+    }
+
+    // ページ内の全リンクを1つのハンドラで処理
+    function target(event) {
+        return event.target.closest && event.target.closest('a.auto-link[data-term]');
+    }
+    document.addEventListener('mouseover', function (e) {
+        const link = target(e);
+        if (link) {
+            show(link);
+        }
+    });
+    document.addEventListener('focusin', function (e) {
+        const link = target(e);
+        if (link) {
+            show(link);
+        }
+    });
+    document.addEventListener('mouseout', function (e) {
+        if (target(e)) {
+            hide();
+        }
+    });
+    document.addEventListener('focusout', hide);
+})();
@@ -8,8 +8,60 @@
 
 import re
 import os
+import json
+import argparse
 from pathlib import Path
 
+from lib.standards_export import export_articles
+from lib.standards_parser import StandardsParser
+from lib.standards_toc import build_toc
+from lib.cross_reference import CrossReferenceResolver, article_ids
+from lib.fragment_cache import FragmentCache, resolve_cache_dir
+from lib.file_utils import write_if_changed
+from lib.numbering import article_id, read_text
+from lib.template_engine import TemplateEngine
+from lib.auto_linker import AutoLinker
+
+# 条文本文の描画方法（format_content 等）を変更した場合は番号を上げる
+# （条文断片キャッシュのキーに含まれる）
+GENERATOR_VERSION = '2'
+
+# 行数・文字数がこれ以上の表は専用ページに分け、本文にはリンクだけを置く
+SPLIT_TABLE_MIN_ROWS = 6
+SPLIT_TABLE_MIN_CHARS = 400
+
+# 専用ページの表を分ける行数（<tbody> ごとに少しずつ描画する）
+TABLE_CHUNK_ROWS = 40
+
+# テンプレートフォルダ
+TEMPLATES_DIR = Path(__file__).parent / 'templates'
+
+# ファイルを正しい順序で読み込む（第1条から始まる順）
+FILE_ORDER = [
+    'chapters_1_2.txt',        # 第1条〜第48条（第1章、第2章）
+    '第3章61条まで 電線路.txt', # 第49条〜第61条（第3章前半）
+    '106条まで.txt',           # 第62条〜第106条
+    '153条まで.txt',           # 第107条〜第153条
+    '183条まで.txt',           # 第154条〜第183条
+    '198条まで.txt',           # 第184条〜第198条
+    '217条まで.txt',           # 第199条〜第217条
+    '226条まで.txt',           # 第218条〜第226条
+    '最後.txt',                # 第227条〜第234条、別表、附則
+]
+
+def read_kaishaku_text(input_dir, verbose=True):
+    """解釈テキストを条文番号順に結合して読み込む"""
+    all_text = ''
+    for filename in FILE_ORDER:
+        txt_file = Path(input_dir) / filename
+        if txt_file.exists():
+            if verbose:
+                print(f'読み込み中: {txt_file.name}')
+            all_text += read_text(txt_file) + '\n'
+        elif verbose:
+            print(f'警告: {filename} が見つかりません')
+    return all_text
+
 def parse_kaishaku_text(text):
     """解釈テキストを解析して構造化データを返す"""
     articles = []
@@ -114,7 +166,7 @@ def parse_kaishaku_text(text):
             continue
         
         # 条番号の検出（アラビア数字: 第1条、第37条の2 など）
-        article_num_match = re.match(r'^(第\d+条(?:の\d+)?)\s*(.*)$', line)
+        article_num_match = re.match(r'^(第\d+条(?:の\d+)*)\s*(.*)$', line)
         if article_num_match:
             if current_article and current_content:
                 articles.append({
@@ -150,17 +202,31 @@ def parse_kaishaku_text(text):
     
     return articles
 
-def format_content(content_lines):
-    """コンテンツ行をHTML形式に整形"""
+def format_content(content_lines, cross_ref=None, table_prefix=None):
+    """
+    コンテンツ行をHTML形式に整形
+    
+    cross_ref: 条文引用をリンクに変換する CrossReferenceResolver（省略時はリンクなし）
+    table_prefix: 大きな表を専用ページ（tables/{table_prefix}-{番号}.html）へのリンクに置き換える場合の接頭辞
+    """
     html_parts = []
     in_table = False
     table_rows = []
+    table_count = 0
+    
+    def add_table(rows):
+        nonlocal table_count
+        table_count += 1
+        if table_prefix and is_large_table(rows):
+            html_parts.append(format_table_stub(f'{table_prefix}-{table_count}', rows))
+        else:
+            html_parts.append(format_table(rows, cross_ref))
     
     for line in content_lines:
         line = line.strip()
         if not line:
             if in_table and table_rows:
-                html_parts.append(format_table(table_rows))
+                add_table(table_rows)
                 table_rows = []
                 in_table = False
             html_parts.append('<br>')
@@ -174,217 +240,435 @@ def format_content(content_lines):
         
         # 表の終了
         if in_table and table_rows and '\t' not in line:
-            html_parts.append(format_table(table_rows))
+            add_table(table_rows)
             table_rows = []
             in_table = False
         
         # 号の検出（一、二、三...）
         if re.match(r'^[一二三四五六七八九十]+\s', line):
-            html_parts.append(f'<p class="item-major">{escape_html(line)}</p>')
+            html_parts.append(f'<p class="item-major">{render_text(line, cross_ref)}</p>')
         # 細分号の検出（イ、ロ、ハ...）
         elif re.match(r'^[イロハニホヘトチリヌ]\s', line):
-            html_parts.append(f'<p class="item-sub">{escape_html(line)}</p>')
+            html_parts.append(f'<p class="item-sub">{render_text(line, cross_ref)}</p>')
         # さらに細かい号（(イ)、(ロ)...）
         elif re.match(r'^\([イロハニホヘトチリヌ]\)', line):
-            html_parts.append(f'<p class="item-detail">{escape_html(line)}</p>')
+            html_parts.append(f'<p class="item-detail">{render_text(line, cross_ref)}</p>')
         # (1)、(2) などの号
         elif re.match(r'^\(\d+\)', line):
-            html_parts.append(f'<p class="item-detail">{escape_html(line)}</p>')
+            html_parts.append(f'<p class="item-detail">{render_text(line, cross_ref)}</p>')
         # 備考
         elif line.startswith('(備考)') or line.startswith('※'):
-            html_parts.append(f'<p class="note">{escape_html(line)}</p>')
+            html_parts.append(f'<p class="note">{render_text(line, cross_ref)}</p>')
         else:
-            html_parts.append(f'<p>{escape_html(line)}</p>')
+            html_parts.append(f'<p>{render_text(line, cross_ref)}</p>')
     
     # 残りの表を処理
     if table_rows:
-        html_parts.append(format_table(table_rows))
+        add_table(table_rows)
     
     return '\n'.join(html_parts)
 
-def format_table(rows):
+def format_table(rows, cross_ref=None):
     """表データをHTMLテーブルに変換"""
     if not rows:
         return ''
     
     html = ['<div class="table-container"><table class="spec-table">']
-    for i, row in enumerate(rows):
-        cells = row.split('\t')
+    for i, cells in enumerate(parse_table(rows)):
         tag = 'th' if i == 0 else 'td'
         html.append('<tr>')
         for cell in cells:
-            html.append(f'<{tag}>{escape_html(cell.strip())}</{tag}>')
+            html.append(f'<{tag}>{render_text(cell, cross_ref)}</{tag}>')
         html.append('</tr>')
     html.append('</table></div>')
     return '\n'.join(html)
 
+def is_large_table(rows):
+    """専用ページに分ける表か（行数または文字数が多い）"""
+    return len(rows) >= SPLIT_TABLE_MIN_ROWS or sum(len(row) for row in rows) >= SPLIT_TABLE_MIN_CHARS
+
+def format_table_stub(table_id, rows):
+    """本文に置く専用ページへのリンク（クリックすると本文内に展開）"""
+    return (f'<div class="table-stub"><a class="table-link" href="tables/{table_id}.html">'
+            f'表を表示（{len(rows)}行）</a></div>')
+
+def format_chunked_table(rows, cross_ref=None):
+    """専用ページ用の表（見出し行は <thead>、以降は TABLE_CHUNK_ROWS 行ごとの <tbody>）"""
+    cells = parse_table(rows)
+    html = ['<div class="table-container"><table class="spec-table">', '<thead><tr>']
+    html.extend(f'<th>{render_text(cell, cross_ref)}</th>' for cell in cells[0])
+    html.append('</tr></thead>')
+    for start in range(1, len(cells), TABLE_CHUNK_ROWS):
+        html.append('<tbody>')
+        for row in cells[start:start + TABLE_CHUNK_ROWS]:
+            html.append('<tr>' + ''.join(f'<td>{render_text(cell, cross_ref)}</td>' for cell in row) + '</tr>')
+        html.append('</tbody>')
+    html.append('</table></div>')
+    return '\n'.join(html)
+
+def parse_table(rows):
+    """タブ区切りの行をセルのリストに分解（先頭行が見出し）"""
+    return [[cell.strip() for cell in row.split('\t')] for row in rows]
+
+def split_blocks(content_lines):
+    """コンテンツ行を段落と表に分ける（format_content と同じ規則）"""
+    paragraphs = []
+    tables = []
+    table_rows = []
+    
+    for line in content_lines:
+        line = line.strip()
+        if '\t' in line:
+            table_rows.append(line)
+            continue
+        
+        if table_rows:
+            tables.append(_table_block(table_rows, len(paragraphs)))
+            table_rows = []
+        
+        if line:
+            paragraphs.append(line)
+    
+    if table_rows:
+        tables.append(_table_block(table_rows, len(paragraphs)))
+    
+    return paragraphs, tables
+
+def _table_block(table_rows, position):
+    """表をJSON用の辞書に変換（position: 直前までの段落数）"""
+    cells = parse_table(table_rows)
+    return {'position': position, 'header': cells[0], 'rows': cells[1:]}
+
+def number_to_id(number):
+    """章・節・条番号をIDに変換（第37条の2 → 37_2、lib.numbering と共通）"""
+    return article_id(number)
+
+def table_prefixes(articles):
+    """
+    条文ごとの表の専用ページ名の接頭辞（キー: articles 内の位置）
+
+    同じ条番号が再び現れた場合は2件目以降を "63.2", "63.3" …とする
+    （lib.standards_export の "63#2" と同じ数え方。URLでは # がフラグメントになるため . にする）
+    """
+    prefixes = {}
+    occurrences = {}   # 条ID → 出現回数
+    for index, item in enumerate(articles):
+        if item['type'] != 'article':
+            continue
+        anchor = number_to_id(item['number'])
+        occurrences[anchor] = occurrences.get(anchor, 0) + 1
+        count = occurrences[anchor]
+        prefixes[index] = anchor if count == 1 else f'{anchor}.{count}'
+    return prefixes
+
 def escape_html(text):
     """HTMLエスケープ"""
     return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
 
-def generate_html(articles):
-    """HTML全体を生成（電技省令と同じ2カラムレイアウト）"""
+def render_text(text, cross_ref=None):
+    """テキストをエスケープし、条文引用をリンクに変換"""
+    escaped = escape_html(text)
+    if cross_ref:
+        escaped = cross_ref.apply(escaped, 'kaishaku')
+    return escaped
+
+def render_article_body(item, cross_ref=None, cache=None, table_prefix=None):
+    """
+    条文本文のHTMLを生成（cache があれば条文内容のハッシュで再利用）
+
+    table_prefix: 大きな表を専用ページへのリンクにする場合の接頭辞（table_prefixes の値）
+    """
+    if cache is None:
+        return format_content(item['content'], cross_ref, table_prefix)
+    key = cache.key(GENERATOR_VERSION, item['number'], item.get('title'), item['content'], table_prefix)
+    return cache.get_or_render(key, lambda: format_content(item['content'], cross_ref, table_prefix))
+
+def chapter_key(item):
+    """条文が属する章のキー（断片ファイル名に使用）"""
+    return number_to_id(item.get('chapter') or '第0章')
+
+def generate_fragments(articles, cross_ref=None, cache=None, split_tables=False):
+    """遅延読み込み用の章ごとの本文断片を生成（キー: 章番号）"""
+    fragments = {}
+    prefixes = table_prefixes(articles) if split_tables else {}
+    for index, item in enumerate(articles):
+        if item['type'] != 'article':
+            continue
+        body = render_article_body(item, cross_ref, cache, prefixes.get(index))
+        fragments.setdefault(chapter_key(item), []).append(
+            f'<div data-index="{index}">\n{body}\n</div>'
+        )
+    return {chapter: '\n'.join(parts) for chapter, parts in fragments.items()}
+
+def generate_html(articles, template_engine, lazy=False, cross_ref=None, cache=None, split_tables=False):
+    """
+    HTML全体を生成（電技省令と同じ standards テンプレートを使用）
     
-    # 目次の生成
-    toc_items = []
-    for item in articles:
-        if item['type'] == 'chapter':
-            num = item['number'].replace('第', '').replace('章', '')
-            toc_items.append(f'<li class="sidebar-chapter">{item["number"]} {item["title"]}</li>')
-        elif item['type'] == 'section':
-            num = item['number'].replace('第', '').replace('節', '')
-            chapter_num = (item.get('chapter') or '').replace('第', '').replace('章', '')
-            toc_items.append(f'<li><a href="#section{chapter_num}_{num}">{item["number"]} {item["title"]}</a></li>')
-        elif item['type'] == 'article':
-            article_num = item['number'].replace('第', '').replace('条', '').replace('の', '_')
-            title_text = item.get('title', '')
-            if title_text:
-                toc_items.append(f'<li><a href="#article{article_num}">{item["number"]}（{title_text}）</a></li>')
-            else:
-                toc_items.append(f'<li><a href="#article{article_num}">{item["number"]}</a></li>')
+    lazy=True の場合は条文本文を含めず、スタブと遅延読み込みスクリプトを出力する
+    split_tables=True の場合は大きな表を専用ページへのリンクに置き換える
+    """
     
-    # 本文の生成
-    content_items = []
-    for item in articles:
+    # 目次と本文の項目
+    toc = []
+    items = []
+    prefixes = table_prefixes(articles) if split_tables and not lazy else {}
+    for index, item in enumerate(articles):
         if item['type'] == 'chapter':
-            num = item['number'].replace('第', '').replace('章', '')
-            content_items.append(f'''
-                <article class="article" id="chapter{num}">
-                    <h2 class="chapter-title">{item['number']} {item['title']}</h2>
-                </article>
-            ''')
+            num = number_to_id(item['number'])
+            toc.append({'label': f'{item["number"]} {item["title"]}'})
+            items.append({
+                'type': 'chapter',
+                'id': f'chapter{num}',
+                'number': item['number'],
+                'title': item['title'],
+            })
         elif item['type'] == 'section':
-            num = item['number'].replace('第', '').replace('節', '')
-            chapter_num = (item.get('chapter') or '').replace('第', '').replace('章', '')
-            content_items.append(f'''
-                <article class="article" id="section{chapter_num}_{num}">
-                    <h3 class="section-title">{item['number']} {item['title']}</h3>
-                </article>
-            ''')
+            num = number_to_id(item['number'])
+            chapter_num = number_to_id(item['chapter']) if item.get('chapter') else ''
+            toc.append({
+                'href': f'#section{chapter_num}_{num}',
+                'label': f'{item["number"]} {item["title"]}',
+            })
+            items.append({
+                'type': 'section',
+                'id': f'section{chapter_num}_{num}',
+                'number': item['number'],
+                'title': item['title'],
+            })
         elif item['type'] == 'article':
-            article_num = item['number'].replace('第', '').replace('条', '').replace('の', '_')
+            article_num = number_to_id(item['number'])
             title_text = f'（{item["title"]}）' if item.get('title') else ''
-            content_html = format_content(item['content'])
-            content_items.append(f'''
-                <article class="article" id="article{article_num}">
-                    <h3 class="article-title">
-                        <a href="../coming-soon.html">{item['number']}{title_text}</a>
-                    </h3>
-                    <div class="article-content">
-                        {content_html}
-                    </div>
-                </article>
-            ''')
-    
-    # 完全なHTML（電技省令と同じ構造）
-    html = f'''<!DOCTYPE html>
-<html lang="ja">
-
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <meta name="robots" content="noindex, nofollow">
-    <title>電気設備技術基準の解釈 - ほあんペディア</title>
-    <meta name="description" content="電気設備に関する技術基準を定める省令に定める技術的要件を満たすと認められる技術的内容">
-    <link rel="stylesheet" href="../../css/style.css">
-</head>
-
-<body>
-    <!-- 共通ヘッダー -->
-    <header class="site-header">
-        <a href="../index.html">
-            <span class="home-icon">🏠</span>
-            <span>ほあんペディア</span>
-        </a>
-    </header>
-
-    <!-- メインコンテンツ -->
-    <main class="main-content">
-        <h1 class="page-title">電気設備技術基準の解釈</h1>
-
-        <div class="two-column-layout">
-            <!-- 左カラム：目次 -->
-            <aside class="sidebar">
-                <h2 class="sidebar-title">目次</h2>
-                <ul class="sidebar-list">
-                    {''.join(toc_items)}
-                </ul>
-            </aside>
-
-            <!-- 右カラム：条文本文 -->
-            <div class="content-area">
-                {''.join(content_items)}
-            </div>
-        </div>
-    </main>
-
-    <!-- フッター -->
-    <footer class="site-footer">
-        <p>&copy; 2026 ほあんペディア - 保安・電気技術の百科事典</p>
-    </footer>
-</body>
-</html>
-'''
-    return html
+            toc.append({
+                'href': f'#article{article_num}',
+                'label': f'{item["number"]}{title_text}',
+            })
+            items.append({
+                'type': 'article',
+                'id': f'article{article_num}',
+                'heading': f'{item["number"]}{title_text}',
+                'lazy': lazy,
+                'chapter': chapter_key(item),
+                'index': index,
+                'body': '' if lazy else render_article_body(item, cross_ref, cache, prefixes.get(index)),
+            })
+    
+    articles_html = template_engine.render('partials/standards_articles', {'articles': items, 'depth': 2})
+    toc, toc_data = build_toc(toc)
+    
+    return template_engine.render('standards', {
+        'page_title': '電気設備技術基準の解釈',
+        'page_description': '電気設備に関する技術基準を定める省令に定める技術的要件を満たすと認められる技術的内容',
+        'toc': toc,
+        'toc_data': toc_data,
+        'articles_html': articles_html,
+        'lazy': lazy,
+        'split_tables': split_tables,
+        'show_footer': True,
+        'depth': 2,
+    })
 
-def main():
-    # 入力ファイルのパス
-    input_dir = Path('content/standards/kaishaku')
-    output_dir = Path('docs/standards/kaishaku')
+def write_fragments(articles, fragments_dir, cross_ref=None, cache=None, split_tables=False):
+    """章ごとの本文断片を書き出し、不要になった断片を削除"""
+    fragments_dir.mkdir(parents=True, exist_ok=True)
+    fragments = generate_fragments(articles, cross_ref, cache, split_tables)
     
-    # 出力ディレクトリを作成
-    output_dir.mkdir(parents=True, exist_ok=True)
+    written = set()
+    for chapter, html in fragments.items():
+        # 内容が同じ断片は書き直さない（更新日時を保ち、後続の手順の省略判定を崩さない）
+        fragment_file = fragments_dir / f'chapter{chapter}.html'
+        write_if_changed(fragment_file, html)
+        written.add(fragment_file.name)
     
-    # 入力ファイルを読み込み（条文番号順）
-    all_text = ''
-    # ファイルを正しい順序で読み込む（第1条から始まる順）
-    file_order = [
-        'chapters_1_2.txt',        # 第1条〜第48条（第1章、第2章）
-        '第3章61条まで 電線路.txt', # 第49条〜第61条（第3章前半）
-        '106条まで.txt',           # 第62条〜第106条
-        '153条まで.txt',           # 第107条〜第153条
-        '183条まで.txt',           # 第154条〜第183条
-        '198条まで.txt',           # 第184条〜第198条
-        '217条まで.txt',           # 第199条〜第217条
-        '226条まで.txt',           # 第218条〜第226条
-        '最後.txt',                # 第227条〜第234条、別表、附則
-    ]
-    
-    for filename in file_order:
-        txt_file = input_dir / filename
-        if txt_file.exists():
-            print(f'読み込み中: {txt_file.name}')
-            with open(txt_file, 'r', encoding='utf-8') as f:
-                all_text += f.read() + '\n'
-        else:
-            print(f'警告: {filename} が見つかりません')
+    for old_file in fragments_dir.glob('chapter*.html'):
+        if old_file.name not in written:
+            old_file.unlink()
+    
+    return len(written)
+
+def iter_tables(content_lines):
+    """コンテンツ行の表（行のリスト）を順に返す（format_content と同じ区切り・番号）"""
+    table_rows = []
+    for line in content_lines:
+        line = line.strip()
+        if '\t' in line:
+            table_rows.append(line)
+            continue
+        if table_rows:
+            yield table_rows
+            table_rows = []
+    if table_rows:
+        yield table_rows
+
+def rebase_links(html):
+    """本文基準（kaishaku/index.html）のリンクを専用ページ（kaishaku/tables/）基準に直す"""
+    def rebase(match):
+        href = match.group(1)
+        if href.startswith('#'):
+            return f'href="../index.html{href}"'
+        if re.match(r'^(?:[a-z]+:|/)', href):
+            return match.group(0)
+        return f'href="../{href}"'
+    return re.sub(r'href="([^"]*)"', rebase, html)
+
+def write_table_pages(articles, tables_dir, template_engine, cross_ref=None):
+    """大きな表を専用ページに書き出し、不要になったページを削除"""
+    tables_dir.mkdir(parents=True, exist_ok=True)
     
-    if not all_text:
-        print('エラー: テキストファイルが見つかりません')
-        return
+    written = set()
+    prefixes = table_prefixes(articles)
+    for index, item in enumerate(articles):
+        if item['type'] != 'article':
+            continue
+        article_id = number_to_id(item['number'])
+        title_text = f'（{item["title"]}）' if item.get('title') else ''
+        for n, rows in enumerate(iter_tables(item['content']), 1):
+            if not is_large_table(rows):
+                continue
+            table_file = tables_dir / f'{prefixes[index]}-{n}.html'
+            html = template_engine.render('standards_table', {
+                'page_title': f'電気設備技術基準の解釈 {item["number"]} 表{n}',
+                'page_description': f'電気設備技術基準の解釈 {item["number"]}{title_text}の表',
+                'article_id': article_id,
+                'article_heading': f'{item["number"]}{title_text}',
+                'table_html': rebase_links(format_chunked_table(rows, cross_ref)),
+                'depth': 3,
+            })
+            write_if_changed(table_file, html)
+            written.add(table_file.name)
+    
+    for old_file in tables_dir.glob('*.html'):
+        if old_file.name not in written:
+            old_file.unlink()
+    
+    return len(written)
+
+def generate_kaishaku(input_dir, output_dir, lazy=False, verbose=True, asset_map=None,
+                      cross_ref=None, articles=None, cache=None, template_engine=None,
+                      split_tables=True):
+    """
+    解釈ページ（HTML・JSON）を生成
+    
+    Args:
+        input_dir: 解釈テキストのフォルダ
+        output_dir: 出力先フォルダ
+        lazy: 条文本文を章ごとの断片ファイルに分けるか
+        verbose: 進捗を表示するか
+        asset_map: フィンガープリント付きアセットの対応表（docs/ からの相対パス）
+        cross_ref: 条文引用をリンクに変換する CrossReferenceResolver
+        articles: 解析済みの条文リスト（省略時はテキストを読み込んで解析）
+        cache: 条文本文の FragmentCache（省略時は毎回描画）
+        template_engine: テンプレートエンジン（省略時は templates/ を読み込む）
+        split_tables: 大きな表を専用ページ（tables/）に分け、本文からはリンクにするか
     
-    # テキストを解析
-    print('テキストを解析中...')
-    articles = parse_kaishaku_text(all_text)
+    Returns:
+        生成した条文数（テキストがない場合は 0）
+    """
+    log = print if verbose else (lambda *args: None)
+    input_dir = Path(input_dir)
+    output_dir = Path(output_dir)
+    
+    # 出力ディレクトリを作成
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    if articles is None:
+        # 入力ファイルを読み込み（条文番号順）
+        all_text = read_kaishaku_text(input_dir, verbose=verbose)
+        
+        if not all_text:
+            log('エラー: テキストファイルが見つかりません')
+            return 0
+        
+        # テキストを解析
+        log('テキストを解析中...')
+        articles = parse_kaishaku_text(all_text)
     
     # 統計情報
     chapters = sum(1 for a in articles if a['type'] == 'chapter')
     sections = sum(1 for a in articles if a['type'] == 'section')
     article_count = sum(1 for a in articles if a['type'] == 'article')
-    print(f'解析完了: {chapters}章, {sections}節, {article_count}条文')
+    log(f'解析完了: {chapters}章, {sections}節, {article_count}条文')
     
     # HTMLを生成
-    print('HTMLを生成中...')
-    html = generate_html(articles)
+    log('HTMLを生成中...')
+    if template_engine is None:
+        template_engine = TemplateEngine(TEMPLATES_DIR)
+        template_engine.load_all()
+        template_engine.set_assets(asset_map)
+        # 出力先（docs/standards/kaishaku）から見た共通スタイルのうち、使うルールを埋め込む
+        stylesheet = output_dir.parent.parent / 'css' / 'style.css'
+        if stylesheet.exists():
+            template_engine.set_stylesheet(stylesheet.read_text(encoding='utf-8'))
+    html = generate_html(articles, template_engine, lazy=lazy, cross_ref=cross_ref, cache=cache,
+                         split_tables=split_tables)
+    
+    if lazy:
+        fragment_count = write_fragments(articles, output_dir / 'fragments', cross_ref, cache, split_tables)
+        log(f'遅延読み込みモード: {fragment_count} 章の本文断片を出力')
+    
+    if split_tables:
+        table_count = write_table_pages(articles, output_dir / 'tables', template_engine, cross_ref)
+        log(f'表の専用ページ: {table_count} 件を出力')
     
     # 出力
     output_file = output_dir / 'index.html'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html)
+    write_if_changed(output_file, html)
     
     # ファイルサイズ
     size_kb = output_file.stat().st_size / 1024
-    print(f'出力完了: {output_file} ({size_kb:.1f} KB)')
+    log(f'出力完了: {output_file} ({size_kb:.1f} KB)')
+    
+    # 外部ツール向けJSONを出力
+    json_count = export_articles(
+        articles,
+        output_dir / 'json',
+        '電気設備技術基準の解釈',
+        number_to_id,
+        split_blocks
+    )
+    log(f'JSON出力完了: {output_dir / "json"} ({json_count}条文)')
+    
+    return article_count
+
+def main():
+    parser = argparse.ArgumentParser(description='電気設備技術基準の解釈 HTML生成')
+    parser.add_argument('--lazy', action='store_true',
+                        help='条文本文を章ごとの断片ファイルに分け、表示時に読み込む')
+    args = parser.parse_args()
+    
+    # 入力ファイルのパス
+    input_dir = Path('content/standards/kaishaku')
+    output_dir = Path('docs/standards/kaishaku')
+    dengi_dir = Path('content/standards/dengi')
+    
+    articles = parse_kaishaku_text(read_kaishaku_text(input_dir))
+    
+    # 条文引用のリンク先（解釈・省令）を登録
+    standards_parser = StandardsParser()
+    cross_ref = CrossReferenceResolver()
+    cross_ref.register('kaishaku', 'standards/kaishaku/index.html', article_ids(articles, number_to_id))
+    dengi_files = list(dengi_dir.glob('*.txt'))
+    if dengi_files:
+        cross_ref.register(
+            'shorei',
+            'standards/index.html',
+            article_ids(standards_parser.parse(dengi_files), standards_parser.article_id)
+        )
+    
+    # build.py と同じキー（用語辞書・アンカー表）でキャッシュを共有
+    terms_file = Path('data/terms.json')
+    terms = []
+    if terms_file.exists():
+        with open(terms_file, 'r', encoding='utf-8') as f:
+            terms = json.load(f).get('terms', [])
+    cache = FragmentCache(
+        resolve_cache_dir(),
+        'kaishaku',
+        salt=f'{AutoLinker(terms).version()}:{cross_ref.version()}'
+    )
+    generate_kaishaku(input_dir, output_dir, lazy=args.lazy, cross_ref=cross_ref,
+                      articles=articles, cache=cache)
+    cache.prune()
+    print(f'条文キャッシュ: 再利用 {cache.hits} / 再描画 {cache.misses}')
 
 if __name__ == '__main__':
     main()
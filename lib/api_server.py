@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""
+読み取り専用JSON API
+解析済みの条文・Markdownページ・用語辞書をメモリ上の索引にまとめ、
+HTTPで条文・章・検索・用語を返す
+
+エンドポイント:
+    GET /api/laws                         法令と章の一覧
+    GET /api/{law}/articles/{id}          条文（id: "120" / "37_2" / "第120条"）
+                                          同じ条番号の2件目以降（附則等）は "1#2" → 1%232
+    GET /api/{law}/chapters/{id}          章（節と条の一覧）
+    GET /api/pages/{path}                 Markdownページ（path: "relay/ocr.md"）
+    GET /api/search?q=接地抵抗&limit=20   条文・表・ページの部分一致検索
+    GET /api/terms/{word}                 用語（用語・略称・用語IDで検索）
+
+応答には内容ハッシュの ETag を付け、If-None-Match が一致すれば 304 を返す
+"""
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs, unquote
+
+from lib.standards_export import split_by_chapter
+
+# 応答キャッシュの既定件数
+DEFAULT_CACHE_SIZE = 512
+
+# 検索結果の既定・最大件数
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 200
+
+
+class CorpusIndex:
+    """条文・ページ・用語のメモリ上の索引"""
+
+    def __init__(self, laws, pages, terms, term_ids=None):
+        """
+        Args:
+            laws: [{"law", "url", "articles", "to_id", "to_blocks"}, ...]（build.py の standards_laws）
+            pages: [{"path", "url", "title", "description", "section", "body"}, ...]
+            terms: terms.json の用語リスト
+            term_ids: 用語 → 用語ID（AutoLinker.term_ids）
+        """
+        self.laws = {}
+        self.articles = {}     # (法令, 条ID) → 条文
+        self.chapters = {}     # (法令, 章ID) → 章
+        self.to_id = {}
+        self._documents = []   # 検索対象 (種類, 検索用テキスト, 結果)
+
+        for law in laws:
+            name = law["law"]
+            self.to_id[name] = law["to_id"]
+            chapter_list = []
+            for shard in split_by_chapter(law["articles"], law["to_id"], law.get("to_blocks")):
+                chapter = shard["chapter"]
+                summary = {**chapter, "url": f"{law['url']}#chapter{chapter['id']}"}
+                chapter_list.append(summary)
+                self.chapters[(name, chapter["id"])] = {
+                    **summary,
+                    "law": name,
+                    "sections": shard["sections"],
+                    "articles": [
+                        {"id": a["id"], "number": a["number"], "title": a["title"]}
+                        for a in shard["articles"]
+                    ],
+                }
+                for article in shard["articles"]:
+                    record = {
+                        **article,
+                        "law": name,
+                        "chapter_id": chapter["id"],
+                        "url": f"{law['url']}#article{article['anchor']}",
+                    }
+                    self.articles[(name, article["id"])] = record
+                    heading = {"law": name, "id": article["id"], "number": article["number"],
+                               "title": article["title"], "url": record["url"]}
+                    text = "\n".join([article["title"] or "", *article["paragraphs"]])
+                    self._documents.append(("article", text, heading))
+                    for table in article["tables"]:
+                        text = "\n".join("\t".join(row) for row in [table["header"], *table["rows"]])
+                        self._documents.append(("table", text, heading))
+            self.laws[name] = {"law": name, "url": law["url"], "chapters": chapter_list}
+
+        self.pages = {}
+        for page in pages:
+            self.pages[page["path"]] = page
+            heading = {"path": page["path"], "title": page["title"], "url": page["url"]}
+            text = "\n".join([page["title"], page["description"], page["body"]])
+            self._documents.append(("page", text, heading))
+
+        # 用語・略称・用語IDのいずれでも引けるようにする
+        self.terms = {}
+        term_ids = term_ids or {}
+        for term in terms:
+            word = term.get("word")
+            if not word:
+                continue
+            entry = {key: value for key, value in term.items() if value is not None}
+            if word in term_ids:
+                entry["id"] = term_ids[word]
+                self.terms.setdefault(term_ids[word], entry)
+            self.terms[word] = entry
+        for term in terms:
+            abbreviation = term.get("abbreviation")
+            if abbreviation and term.get("word"):
+                self.terms.setdefault(abbreviation, self.terms[term["word"]])
+
+    def article(self, law, article_id):
+        """
+        条文（"第120条" のような番号も受け付ける）
+
+        同じ条番号が複数ある場合、番号・ID "1" は最初の条を返す（2件目以降は "1#2" …で指定）
+        """
+        if law not in self.to_id:
+            return None
+        found = self.articles.get((law, article_id))
+        if found is None and article_id.startswith("第"):
+            try:
+                found = self.articles.get((law, self.to_id[law](article_id)))
+            except ValueError:
+                # "第x条" のように番号として解釈できない指定
+                return None
+        return found
+
+    def search(self, text, limit=DEFAULT_SEARCH_LIMIT):
+        """部分一致検索（前後の文脈を snippet に含める）"""
+        results = []
+        for kind, document, heading in self._documents:
+            position = document.find(text)
+            if position < 0:
+                continue
+            start = max(position - 16, 0)
+            results.append({
+                "kind": kind,
+                **heading,
+                "snippet": document[start:position + len(text) + 16],
+            })
+            if len(results) >= limit:
+                break
+        return results
+
+
+class ResponseCache:
+    """応答のLRUキャッシュ（スレッドセーフ）"""
+
+    def __init__(self, size=DEFAULT_CACHE_SIZE):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_create(self, key, create):
+        """キャッシュがあれば返し、なければ create() の結果を保存して返す"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        # 応答の作成はロックの外で行う（同じキーを同時に作成しても結果は同じ）
+        entry = create()
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return entry
+
+
+class CorpusAPI:
+    """URLから応答（ステータス・本文・ETag）を作成"""
+
+    def __init__(self, index, cache_size=DEFAULT_CACHE_SIZE):
+        self.index = index
+        self.cache = ResponseCache(cache_size)
+
+    def respond(self, target):
+        """
+        Args:
+            target: リクエストのパスとクエリ（"/api/search?q=..."）
+
+        Returns:
+            (ステータスコード, 本文のバイト列, ETag)
+        """
+        return self.cache.get_or_create(target, lambda: self._create(target))
+
+    def _create(self, target):
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.strip("/").split("/") if part]
+        query = parse_qs(url.query)
+
+        status, data = self._route(parts, query)
+        body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+        return status, body, etag
+
+    def _route(self, parts, query):
+        index = self.index
+        if not parts or parts[0] != "api":
+            return _not_found()
+        parts = parts[1:]
+
+        if parts == ["laws"]:
+            return 200, list(index.laws.values())
+
+        if parts == ["search"]:
+            text = (query.get("q") or [""])[0].strip()
+            if not text:
+                return 400, {"error": "q を指定してください"}
+            try:
+                limit = int((query.get("limit") or [DEFAULT_SEARCH_LIMIT])[0])
+            except ValueError:
+                return 400, {"error": "limit は整数で指定してください"}
+            limit = min(max(limit, 1), MAX_SEARCH_LIMIT)
+            return 200, {"query": text, "results": index.search(text, limit)}
+
+        if len(parts) == 2 and parts[0] == "terms":
+            term = index.terms.get(parts[1])
+            return (200, term) if term else _not_found()
+
+        if len(parts) >= 2 and parts[0] == "pages":
+            page = index.pages.get("/".join(parts[1:]))
+            return (200, page) if page else _not_found()
+
+        if len(parts) == 3 and parts[1] == "articles":
+            article = index.article(parts[0], parts[2])
+            return (200, article) if article else _not_found()
+
+        if len(parts) == 3 and parts[1] == "chapters":
+            chapter = index.chapters.get((parts[0], parts[2]))
+            return (200, chapter) if chapter else _not_found()
+
+        return _not_found()
+
+
+def create_server(api, host="127.0.0.1", port=8765):
+    """API用のHTTPサーバーを作成（serve_forever() で起動）"""
+
+    class Handler(BaseHTTPRequestHandler):
+        # 接続を使い回せるよう HTTP/1.1 で応答（負荷テストでの接続コストを除く）
+        protocol_version = "HTTP/1.1"
+        # ヘッダーと本文を別々に送るため、Nagle アルゴリズムによる待ちを避ける
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            status, body, etag = api.respond(self.path)
+            if status == 200 and etag in _etags(self.headers.get("If-None-Match")):
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # 1リクエストごとのログは出さない
+            pass
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def _etags(header):
+    """If-None-Match ヘッダーの ETag 一覧"""
+    if not header:
+        return set()
+    return {tag.strip() for tag in header.split(",")}
+
+
+def _not_found():
+    return 404, {"error": "見つかりません"}
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+静的アセットのフィンガープリント
+style.css → style.<hash>.css のように内容ハッシュ付きのコピーを作成
+（ファイル名が内容ごとに変わるので、長期キャッシュしても古い版が残らない）
+"""
+import re
+import shutil
+from pathlib import Path
+
+from lib.file_utils import file_hash
+
+# フィンガープリント対象（docs/ からの相対パス）
+DEFAULT_ASSETS = ["css/style.css", "js/glossary.js", "js/glossary.json"]
+
+HASH_LENGTH = 10
+
+
+def fingerprint_assets(docs_dir, assets=None):
+    """
+    アセットのハッシュ付きコピーを作成し、古いコピーを削除
+
+    Args:
+        docs_dir: 出力先（docs/）フォルダ
+        assets: 対象アセットのリスト（省略時は既定値）
+
+    Returns:
+        {元のパス: ハッシュ付きパス} の対応表（docs/ からの相対パス）
+    """
+    docs_dir = Path(docs_dir)
+    asset_map = {}
+
+    for asset in assets or DEFAULT_ASSETS:
+        source = docs_dir / asset
+        if not source.exists():
+            continue
+
+        digest = file_hash(source, HASH_LENGTH)
+        target = source.with_name(f"{source.stem}.{digest}{source.suffix}")
+
+        if not target.exists():
+            shutil.copyfile(source, target)
+
+        # 以前のビルドで作成したコピーを削除
+        stale_pattern = re.compile(
+            rf"^{re.escape(source.stem)}\.[0-9a-f]{{{HASH_LENGTH}}}{re.escape(source.suffix)}$"
+        )
+        for old in source.parent.iterdir():
+            if old != target and stale_pattern.match(old.name):
+                old.unlink()
+
+        asset_map[asset] = target.relative_to(docs_dir).as_posix()
+
+    return asset_map
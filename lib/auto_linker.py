@@ -4,6 +4,8 @@
 用語辞書に基づいて本文中のキーワードを自動リンク化
 """
 import re
+import json
+import hashlib
 from html.parser import HTMLParser
 
 
@@ -35,6 +37,28 @@ class AutoLinker:
         """
         # 長い単語順にソート（長い方を優先マッチ）
         self.terms = sorted(terms, key=lambda t: len(t.get("word", "")), reverse=True)
+        
+        # 用語ID（ツールチップ用の用語集JSONのキー。リンクの data-term 属性に出力）
+        self.term_ids = self._assign_term_ids(self.terms)
+    
+    def glossary(self):
+        """用語集（{用語ID: {"word", "reading", "abbreviation", "summary"}}）"""
+        glossary = {}
+        for term in self.terms:
+            word = term.get("word", "")
+            if not word:
+                continue
+            entry = {"word": word}
+            for key in ("reading", "abbreviation", "summary"):
+                if term.get(key):
+                    entry[key] = term[key]
+            glossary[self.term_ids[word]] = entry
+        return glossary
+    
+    def version(self):
+        """用語辞書のハッシュ（描画結果のキャッシュキーに使用）"""
+        data = json.dumps(self.terms, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
     
     def apply(self, html_content, current_page=""):
         """
@@ -78,7 +102,8 @@ class AutoLinker:
             html_content = self._replace_first_outside_tags(
                 html_content,
                 word,
-                relative_link
+                relative_link,
+                self.term_ids[word]
             )
             
             linked_words.add(word)
@@ -127,7 +152,22 @@ class AutoLinker:
         
         return link_normalized == current_normalized
     
-    def _replace_first_outside_tags(self, html, word, link):
+    @staticmethod
+    def _assign_term_ids(terms):
+        """
+        用語ごとに短いIDを割り当てる
+        
+        単語のハッシュから作るので、用語を追加しても既存の用語のIDは変わらない
+        （衝突した場合のみ全体の桁数を増やす）
+        """
+        words = sorted({term.get("word", "") for term in terms if term.get("word")})
+        digests = {word: hashlib.sha256(word.encode("utf-8")).hexdigest() for word in words}
+        length = 5
+        while len({digest[:length] for digest in digests.values()}) < len(words):
+            length += 1
+        return {word: digest[:length] for word, digest in digests.items()}
+    
+    def _replace_first_outside_tags(self, html, word, link, term_id=None):
         """
         HTMLタグ外で最初に出現する単語のみを置換
         
@@ -153,7 +193,8 @@ class AutoLinker:
                 if word in text:
                     # <a>タグ内でないか確認
                     if not self._is_inside_anchor(html, match.start()):
-                        replacement = f'<a href="{link}" class="auto-link">{word}</a>'
+                        term_attr = f' data-term="{term_id}"' if term_id else ""
+                        replacement = f'<a href="{link}" class="auto-link"{term_attr}>{word}</a>'
                         text = text.replace(word, replacement, 1)
                         replaced = True
                 result.append(text)
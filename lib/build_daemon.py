@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+常駐ビルド
+ビルドのたびに作り直していた部品（用語辞書の照合表・テンプレート・Markdownパーサー・
+解析済みの法令）をプロセス内に保持し、ローカルのソケット経由でビルドを受け付ける
+
+プロトコル（1接続1リクエスト、UTF-8 の JSON を1行ずつ）:
+    クライアント → {"command": "build", "options": {"jobs": 4, "bundle": false}}
+                   {"command": "stop"}
+    デーモン     → {"output": "ビルドログの1行"} …
+                   {"success": true, "elapsed": 0.08}
+"""
+import io
+import json
+import time
+import threading
+import socketserver
+from contextlib import redirect_stdout
+
+DEFAULT_DAEMON_PORT = 8766
+
+
+class WarmState:
+    """ビルド間で保持する部品（入力の署名が変わった部品だけ作り直す）"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, name, signature, create):
+        """
+        前回と署名が同じなら保持している部品を返し、違えば create() で作り直す
+
+        Args:
+            name: 部品の名前
+            signature: 入力の署名（lib.file_utils.tree_signature 等。比較できる値）
+            create: 部品を作成する関数
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] == signature:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        value = create()
+        with self._lock:
+            self._entries[name] = (signature, value)
+        return value
+
+
+class _LineWriter(io.TextIOBase):
+    """書き込まれたテキストを1行ずつ {"output": 行} としてクライアントに送る"""
+
+    def __init__(self, send):
+        self._send = send
+        self._buffer = ""
+
+    def write(self, text):
+        self._buffer += text
+        *lines, self._buffer = self._buffer.split("\n")
+        for line in lines:
+            self._send({"output": line})
+        return len(text)
+
+    def flush(self):
+        if self._buffer:
+            self._send({"output": self._buffer})
+            self._buffer = ""
+
+
+def serve_builds(build, host="127.0.0.1", port=DEFAULT_DAEMON_PORT, on_ready=None):
+    """
+    ビルド要求を待ち受ける（stop 要求または Ctrl+C で終了）
+
+    Args:
+        build: options を受け取ってビルドし、成功なら True を返す関数
+        on_ready: 待ち受け開始時に呼ぶ関数（引数はサーバー）
+    """
+
+    class Handler(socketserver.StreamRequestHandler):
+        def send(self, message):
+            data = json.dumps(message, ensure_ascii=False) + "\n"
+            self.wfile.write(data.encode("utf-8"))
+
+        def handle(self):
+            try:
+                request = json.loads(self.rfile.readline().decode("utf-8"))
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                request = None
+            if not isinstance(request, dict):
+                # JSONとして正しくてもオブジェクト以外（[] や "build"）は受け付けない
+                self.send({"success": False, "error": "要求を解釈できません"})
+                return
+
+            command = request.get("command")
+            if command == "stop":
+                self.send({"success": True})
+                threading.Thread(target=self.server.shutdown).start()
+                return
+            if command != "build":
+                self.send({"success": False, "error": f"不明なコマンドです: {command}"})
+                return
+
+            options = request.get("options") or {}
+            if not isinstance(options, dict):
+                self.send({"success": False, "error": "要求を解釈できません"})
+                return
+
+            start = time.perf_counter()
+            writer = _LineWriter(self.send)
+            try:
+                # ビルドは1件ずつ処理する（サーバーは単一スレッド）ため、標準出力の差し替えは競合しない
+                with redirect_stdout(writer):
+                    success = bool(build(options))
+                writer.flush()
+            except Exception as e:
+                writer.flush()
+                self.send({"success": False, "error": f"{type(e).__name__}: {e}"})
+                return
+            self.send({"success": success, "elapsed": round(time.perf_counter() - start, 3)})
+
+    class Server(socketserver.TCPServer):
+        allow_reuse_address = True
+
+    with Server((host, port), Handler) as server:
+        if on_ready:
+            on_ready(server)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
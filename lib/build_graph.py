@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+ビルド手順の依存グラフ
+各手順が読み書きする資源（入力・出力）を宣言し、
+依存関係のない手順をスレッドプールで並行実行する
+"""
+import time
+import threading
+
+
+class BuildTask:
+    """ビルド手順1件"""
+
+    def __init__(self, name, label, func, inputs=(), outputs=()):
+        """
+        Args:
+            name: 手順名（例: "markdown"）
+            label: ログ表示用の説明
+            func: 実行する関数（False を返すと失敗扱い）
+            inputs: この手順が読む資源名
+            outputs: この手順が作る資源名
+        """
+        self.name = name
+        self.label = label
+        self.func = func
+        self.inputs = set(inputs)
+        self.outputs = set(outputs)
+        self.deps = set()
+        self.status = "pending"   # pending / done / failed / skipped
+        self.started = None
+        self.finished = None
+
+    @property
+    def duration(self):
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+
+class BuildGraph:
+    """ビルド手順の依存グラフと並行スケジューラ"""
+
+    def __init__(self):
+        self.tasks = {}
+
+    def add(self, name, label, func, inputs=(), outputs=()):
+        """手順を追加（追加順がログの番号になる）"""
+        if name in self.tasks:
+            raise ValueError(f"手順名が重複しています: {name}")
+        task = BuildTask(name, label, func, inputs, outputs)
+        self.tasks[name] = task
+        return task
+
+    def resolve(self):
+        """
+        入力・出力の宣言から依存関係を設定
+
+        Returns:
+            トポロジカル順の手順リスト
+        """
+        producers = {}
+        for task in self.tasks.values():
+            for resource in task.outputs:
+                if resource in producers:
+                    raise ValueError(
+                        f"資源 {resource} を複数の手順が出力しています: "
+                        f"{producers[resource].name}, {task.name}"
+                    )
+                producers[resource] = task
+
+        for task in self.tasks.values():
+            task.deps = {
+                producers[resource].name
+                for resource in task.inputs
+                if resource in producers and producers[resource] is not task
+            }
+
+        # 追加順を保ったトポロジカルソート（循環があればエラー）
+        order = []
+        visiting = set()
+        visited = set()
+
+        def visit(task):
+            if task.name in visited:
+                return
+            if task.name in visiting:
+                raise ValueError(f"手順の依存関係が循環しています: {task.name}")
+            visiting.add(task.name)
+            for dep in sorted(task.deps, key=list(self.tasks).index):
+                visit(self.tasks[dep])
+            visiting.discard(task.name)
+            visited.add(task.name)
+            order.append(task)
+
+        for task in self.tasks.values():
+            visit(task)
+        return order
+
+    def run(self, workers=4, on_start=None, on_finish=None):
+        """
+        依存関係を守りつつ手順を実行
+
+        Args:
+            workers: 同時実行数（1 なら追加順に逐次実行）
+            on_start: 手順開始時に呼ぶ関数 on_start(task)
+            on_finish: 手順終了時に呼ぶ関数 on_finish(task, error)
+
+        Returns:
+            全手順が成功したか
+        """
+        order = self.resolve()
+        lock = threading.Lock()
+
+        def execute(task):
+            if on_start:
+                on_start(task)
+            task.started = time.perf_counter()
+            error = None
+            try:
+                ok = task.func()
+            except Exception as e:
+                ok = False
+                error = e
+            task.finished = time.perf_counter()
+            task.status = "failed" if ok is False else "done"
+            if on_finish:
+                with lock:
+                    on_finish(task, error)
+            return task
+
+        def ready(task):
+            return all(self.tasks[dep].status == "done" for dep in task.deps)
+
+        def blocked(task):
+            return any(self.tasks[dep].status in ("failed", "skipped") for dep in task.deps)
+
+        if workers <= 1:
+            for task in order:
+                if blocked(task):
+                    task.status = "skipped"
+                else:
+                    execute(task)
+            return self.succeeded()
+
+        # concurrent.futures は読み込みに時間がかかるため、並行実行するときだけ読み込む
+        from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+        pending = list(order)
+        running = {}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while pending or running:
+                for task in list(pending):
+                    if blocked(task):
+                        task.status = "skipped"
+                        pending.remove(task)
+                    elif ready(task):
+                        pending.remove(task)
+                        running[pool.submit(execute, task)] = task
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del running[future]
+
+        return self.succeeded()
+
+    def succeeded(self):
+        return all(task.status == "done" for task in self.tasks.values())
+
+    def critical_path(self):
+        """
+        実行時間の合計が最長となる依存の連鎖（クリティカルパス）を求める
+
+        Returns:
+            (手順リスト, 合計秒数)
+        """
+        order = self.resolve()
+        longest = {}
+        previous = {}
+        for task in order:
+            best = None
+            for dep in task.deps:
+                if best is None or longest[dep] > longest[best]:
+                    best = dep
+            longest[task.name] = task.duration + (longest[best] if best else 0.0)
+            previous[task.name] = best
+
+        if not longest:
+            return [], 0.0
+
+        end = max(longest, key=longest.get)
+        path = []
+        name = end
+        while name:
+            path.append(self.tasks[name])
+            name = previous[name]
+        path.reverse()
+        return path, longest[end]
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+手順の実行記録
+ビルド手順ごとに、入力のキーと出力ファイルの状態（更新日時・サイズ）を記録し、
+どちらも前回と同じなら手順全体を省略できるようにする
+"""
+import json
+import hashlib
+
+from lib.file_utils import write_if_changed, tree_signature
+
+# 記録の形式を変更した場合は番号を上げる
+STAMPS_VERSION = 1
+
+
+class BuildStamps:
+    """手順ごとの入力キーと出力の状態"""
+
+    def __init__(self, path):
+        """
+        Args:
+            path: 記録ファイルのパス（マシン固有の更新日時を含むため共有キャッシュには置かない）
+        """
+        self.path = path
+        self.steps = self._load()
+
+    def is_fresh(self, step, key, outputs):
+        """前回と同じ入力キーで実行し、その後 outputs（ファイル・フォルダ）が変わっていないか"""
+        entry = self.steps.get(step)
+        return bool(entry) and entry["key"] == key and entry["outputs"] == _digest(outputs)
+
+    def record(self, step, key, outputs):
+        """手順の実行後に入力キーと出力の状態を記録"""
+        self.steps[step] = {"key": key, "outputs": _digest(outputs)}
+
+    def forget(self, step):
+        """記録を消す（次回は必ず実行する）"""
+        self.steps.pop(step, None)
+
+    def save(self):
+        write_if_changed(
+            self.path,
+            json.dumps({"version": STAMPS_VERSION, "steps": self.steps}, indent=1, sort_keys=True)
+        )
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if data.get("version") != STAMPS_VERSION:
+            return {}
+        return data.get("steps", {})
+
+
+def _digest(paths):
+    """出力ファイルの状態のハッシュ"""
+    data = json.dumps(tree_signature(*paths))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""
+オフライン用バンドル
+docs/ 全体を1つのZIPアーカイブにまとめ、各ファイルの内容ハッシュと
+アーカイブ内の位置を記録したマニフェスト（bundle.json）を出力する
+
+同期側は前回のマニフェストと比べて変更のあったファイルだけを
+HTTP の Range リクエスト（ローカルファイルなら seek）で取り出す
+"""
+import json
+import zlib
+import hashlib
+import zipfile
+import urllib.request
+from datetime import datetime, timezone
+from pathlib import Path, PurePosixPath
+
+from lib.file_utils import write_if_changed
+
+ARCHIVE_NAME = "hoanpedia-bundle.zip"
+MANIFEST_NAME = "bundle.json"
+
+# 同期先に保存する前回のマニフェスト
+LOCAL_MANIFEST_NAME = ".bundle.json"
+
+# マニフェストの形式を変更した場合は番号を上げる
+BUNDLE_VERSION = 1
+
+# 内容が同じならアーカイブも同じバイト列になるよう、全ファイルの日時を固定
+_FIXED_DATE = (1980, 1, 1, 0, 0, 0)
+
+# 圧縮しても小さくならない形式は無圧縮で格納
+_STORED_SUFFIXES = {".png", ".jpg", ".jpeg", ".webp", ".gif", ".zip", ".gz", ".br", ".woff2"}
+
+# 変更分がアーカイブのこの割合を超える場合は、個別に取り出さず全体を取得
+FULL_DOWNLOAD_RATIO = 0.5
+
+
+def write_bundle(docs_dir, output_dir, exclude=()):
+    """
+    docs/ をアーカイブとマニフェストに書き出す
+
+    Args:
+        exclude: 含めないファイルの glob パターン（docs/ からの相対パス）
+
+    Returns:
+        マニフェスト（{"version", "archive", "created", "size", "files": {パス: {...}}}）
+    """
+    docs_dir = Path(docs_dir)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    archive_path = output_dir / ARCHIVE_NAME
+    tmp_path = archive_path.with_suffix(".tmp")
+
+    files = {}
+    with zipfile.ZipFile(tmp_path, "w") as archive:
+        for path in sorted(docs_dir.rglob("*")):
+            if not path.is_file():
+                continue
+            relative = path.relative_to(docs_dir).as_posix()
+            if any(PurePosixPath(relative).match(pattern) for pattern in exclude):
+                continue
+
+            data = path.read_bytes()
+            info = zipfile.ZipInfo(relative, date_time=_FIXED_DATE)
+            info.external_attr = 0o644 << 16
+            if path.suffix.lower() in _STORED_SUFFIXES:
+                info.compress_type = zipfile.ZIP_STORED
+            else:
+                info.compress_type = zipfile.ZIP_DEFLATED
+            archive.writestr(info, data, compresslevel=9)
+            files[relative] = {"sha256": hashlib.sha256(data).hexdigest(), "size": len(data)}
+
+        # 各ファイルの圧縮データの位置（ローカルヘッダーの後ろ）を記録
+        for info in archive.infolist():
+            files[info.filename].update({
+                "offset": info.header_offset + 30 + len(info.filename.encode("utf-8")) + len(info.extra),
+                "compressed_size": info.compress_size,
+                "method": "deflate" if info.compress_type == zipfile.ZIP_DEFLATED else "stored",
+            })
+
+    tmp_path.replace(archive_path)
+
+    manifest = {
+        "version": BUNDLE_VERSION,
+        "archive": ARCHIVE_NAME,
+        "created": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "size": archive_path.stat().st_size,
+        "files": files,
+    }
+    old = _read_json(output_dir / MANIFEST_NAME)
+    if old and old.get("files") == files:
+        # 内容が変わっていなければ作成日時も前回のまま
+        manifest["created"] = old.get("created", manifest["created"])
+    write_if_changed(
+        output_dir / MANIFEST_NAME,
+        json.dumps(manifest, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    )
+    return manifest
+
+
+def plan_sync(local_files, remote_files):
+    """
+    同期の計画
+
+    Args:
+        local_files: 前回同期したマニフェストの "files"
+        remote_files: 最新のマニフェストの "files"
+
+    Returns:
+        (取得するパスのリスト, 削除するパスのリスト)
+    """
+    fetch = [
+        path for path, entry in sorted(remote_files.items())
+        if (local_files.get(path) or {}).get("sha256") != entry["sha256"]
+    ]
+    remove = sorted(path for path in local_files if path not in remote_files)
+    return fetch, remove
+
+
+def sync_bundle(source, target_dir, full=False):
+    """
+    バンドルから変更分だけを取り出して target_dir を更新
+
+    Args:
+        source: bundle.json のURLまたはローカルパス
+        target_dir: 同期先のフォルダ（前回のマニフェストを .bundle.json として保存）
+        full: True なら前回のマニフェストを無視して全ファイルを取得
+
+    Returns:
+        {"fetched": 取得数, "removed": 削除数, "unchanged": 変更なしの数,
+         "transferred": マニフェストを含む転送バイト数}
+    """
+    target_dir = Path(target_dir)
+    remote, manifest_size = _load_remote_manifest(source)
+    if remote.get("version") != BUNDLE_VERSION:
+        raise ValueError(f"バンドルの形式（version {remote.get('version')}）に対応していません")
+
+    local = {} if full else (_read_json(target_dir / LOCAL_MANIFEST_NAME) or {})
+    local_files = local.get("files", {})
+    fetch, remove = plan_sync(local_files, remote["files"])
+    archive_source = _sibling(source, remote["archive"])
+
+    transferred = manifest_size
+    archive = None
+    changed_bytes = sum(remote["files"][path]["compressed_size"] for path in fetch)
+    if fetch and changed_bytes > remote["size"] * FULL_DOWNLOAD_RATIO:
+        # 大半が変わっている場合はアーカイブ全体を1回で取得
+        archive = _read_range(archive_source)
+        transferred += len(archive)
+
+    for path in fetch:
+        entry = remote["files"][path]
+        start, end = entry["offset"], entry["offset"] + entry["compressed_size"]
+        if start == end:
+            raw = b""
+        elif archive is None:
+            raw = _read_range(archive_source, start, end - start)
+            transferred += len(raw)
+            if len(raw) == remote["size"] != end - start:
+                # Range 非対応のサーバーは全体を返すため、以降はそれを使う
+                archive = raw
+        if archive is not None and start != end:
+            raw = archive[start:end]
+        _write_entry(target_dir, path, entry, raw)
+
+    for path in remove:
+        stale = target_dir / path
+        if stale.exists():
+            stale.unlink()
+
+    # 全ファイルの反映後に記録（途中で失敗した場合は次回も同じファイルを取得する）
+    target_dir.mkdir(parents=True, exist_ok=True)
+    with open(target_dir / LOCAL_MANIFEST_NAME, "w", encoding="utf-8") as f:
+        json.dump(remote, f, ensure_ascii=False)
+
+    return {
+        "fetched": len(fetch),
+        "removed": len(remove),
+        "unchanged": len(remote["files"]) - len(fetch),
+        "transferred": transferred,
+    }
+
+
+def _write_entry(target_dir, path, entry, raw):
+    """圧縮データを展開し、ハッシュを確認して書き込む"""
+    data = zlib.decompress(raw, -15) if entry["method"] == "deflate" else raw
+    if hashlib.sha256(data).hexdigest() != entry["sha256"]:
+        raise ValueError(f"{path}: ハッシュが一致しません（バンドルが更新中の可能性があります）")
+    output = target_dir / path
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_name(output.name + ".tmp")
+    tmp_path.write_bytes(data)
+    tmp_path.replace(output)
+
+
+def _load_remote_manifest(source):
+    """最新のマニフェストとそのバイト数"""
+    data = _read_range(source)
+    return json.loads(data.decode("utf-8")), len(data)
+
+
+def _read_range(source, offset=None, length=None):
+    """アーカイブの一部（省略時は全体）を取得"""
+    if _is_url(source):
+        request = urllib.request.Request(source)
+        if offset is not None:
+            request.add_header("Range", f"bytes={offset}-{offset + length - 1}")
+        with urllib.request.urlopen(request) as response:
+            return response.read()
+    with open(source, "rb") as f:
+        if offset is None:
+            return f.read()
+        f.seek(offset)
+        return f.read(length)
+
+
+def _sibling(source, name):
+    """マニフェストと同じ場所にあるファイルのURL・パス"""
+    if _is_url(source):
+        return source.rsplit("/", 1)[0] + "/" + name
+    return str(Path(source).parent / name)
+
+
+def _is_url(source):
+    return str(source).startswith(("http://", "https://"))
+
+
+def _read_json(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
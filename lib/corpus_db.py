@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""
+コーパスデータベース（SQLite）
+解析済みの条文・節・表とMarkdownページを1つのSQLiteファイルに書き出し、
+全文検索（FTS5・trigram）で手元から検索できるようにする
+
+法令は章単位、ページはファイル単位で内容ハッシュを記録し、
+変更のあった単位だけ行を入れ替える
+
+検索例（sqlite3 コマンド）:
+    SELECT law, number, title FROM articles
+     WHERE id IN (SELECT rowid FROM articles_fts WHERE articles_fts MATCH '接地抵抗');
+    SELECT number, title FROM articles WHERE law = 'kaishaku' AND chapter_id = '2';
+"""
+import json
+import hashlib
+import sqlite3
+from pathlib import Path
+
+from lib.standards_export import split_by_chapter
+
+# スキーマを変更した場合は番号を上げる（古いファイルは作り直す）
+SCHEMA_VERSION = 2
+
+# trigram は3文字未満の語を検索できないため、短い語は LIKE で検索する
+MIN_MATCH_LENGTH = 3
+
+_SCHEMA = """
+CREATE TABLE documents (
+    doc TEXT PRIMARY KEY,
+    hash TEXT NOT NULL
+);
+
+CREATE TABLE chapters (
+    law TEXT NOT NULL,
+    chapter_id TEXT NOT NULL,
+    number TEXT,
+    title TEXT,
+    doc TEXT NOT NULL
+);
+
+CREATE TABLE sections (
+    law TEXT NOT NULL,
+    section_id TEXT NOT NULL,
+    chapter_id TEXT NOT NULL,
+    number TEXT,
+    title TEXT,
+    doc TEXT NOT NULL
+);
+
+CREATE TABLE articles (
+    id INTEGER PRIMARY KEY,
+    law TEXT NOT NULL,
+    article_id TEXT NOT NULL,
+    number TEXT NOT NULL,
+    title TEXT,
+    chapter_id TEXT NOT NULL,
+    chapter TEXT,
+    section TEXT,
+    body TEXT NOT NULL,
+    url TEXT NOT NULL,
+    doc TEXT NOT NULL
+);
+
+CREATE TABLE article_tables (
+    id INTEGER PRIMARY KEY,
+    law TEXT NOT NULL,
+    article_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    header TEXT NOT NULL,
+    rows TEXT NOT NULL,
+    body TEXT NOT NULL,
+    doc TEXT NOT NULL
+);
+
+CREATE TABLE pages (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    url TEXT NOT NULL,
+    title TEXT,
+    description TEXT,
+    section TEXT,
+    body TEXT NOT NULL,
+    doc TEXT NOT NULL
+);
+
+CREATE INDEX chapters_doc ON chapters (doc);
+CREATE INDEX sections_doc ON sections (doc);
+CREATE UNIQUE INDEX articles_number ON articles (law, article_id);
+CREATE INDEX articles_chapter ON articles (law, chapter_id);
+CREATE INDEX articles_doc ON articles (doc);
+CREATE INDEX article_tables_article ON article_tables (law, article_id);
+CREATE INDEX article_tables_doc ON article_tables (doc);
+CREATE INDEX pages_doc ON pages (doc);
+"""
+
+# 全文検索テーブル（外部コンテンツ方式。元テーブルの変更はトリガーで反映）
+_FTS_TABLES = {
+    "articles": ("title", "body"),
+    "article_tables": ("body",),
+    "pages": ("title", "description", "body"),
+}
+
+
+class CorpusDatabase:
+    """条文・ページのSQLiteデータベース"""
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self.updated = 0      # 行を入れ替えた単位（章・ページ）の数
+        self.removed = 0      # 削除した単位の数
+
+    def update(self, laws, pages):
+        """
+        データベースを更新
+
+        Args:
+            laws: [{"law": "kaishaku", "url": "standards/kaishaku/index.html",
+                    "articles": パース結果, "to_id": 番号→ID変換関数, "to_blocks": 段落・表分割関数}, ...]
+            pages: [{"path": "relay/ocr.md", "url": "relay/ocr.html", "title": ..., "description": ...,
+                     "section": ..., "body": Markdown本文}, ...]
+
+        Returns:
+            単位の総数
+        """
+        units = {}
+        for law in laws:
+            for shard in split_by_chapter(law["articles"], law["to_id"], law.get("to_blocks")):
+                doc = f"{law['law']}/{shard['chapter']['id']}"
+                units[doc] = (_hash([law["url"], shard]), "law", law, shard)
+        for page in pages:
+            units[f"page/{page['path']}"] = (_hash(page), "page", page, None)
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            with conn:
+                stored = dict(conn.execute("SELECT doc, hash FROM documents"))
+                changed = [doc for doc, unit in units.items() if stored.get(doc) != unit[0]]
+
+                # 条が別の章へ移ると、後の章の古い行が (law, article_id) の一意制約に
+                # かかるため、先に削除・変更のある単位をすべて消してから書き込む
+                for doc in stored.keys() - units.keys():
+                    self._delete(conn, doc)
+                    self.removed += 1
+                for doc in changed:
+                    if doc in stored:
+                        self._delete(conn, doc)
+
+                for doc in changed:
+                    digest, kind, source, shard = units[doc]
+                    if kind == "law":
+                        self._insert_chapter(conn, doc, source, shard)
+                    else:
+                        self._insert_page(conn, doc, source)
+                    conn.execute("INSERT OR REPLACE INTO documents VALUES (?, ?)", (doc, digest))
+                    self.updated += 1
+        finally:
+            conn.close()
+
+        return len(units)
+
+    def _connect(self):
+        """接続（スキーマの版が違えば作り直す）"""
+        conn = sqlite3.connect(self.db_path)
+        if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            conn.close()
+            self.db_path.unlink(missing_ok=True)
+            conn = sqlite3.connect(self.db_path)
+            with conn:
+                conn.executescript(_SCHEMA + _fts_schema())
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        return conn
+
+    def _delete(self, conn, doc):
+        for table in ("chapters", "sections", "articles", "article_tables", "pages"):
+            conn.execute(f"DELETE FROM {table} WHERE doc = ?", (doc,))
+        conn.execute("DELETE FROM documents WHERE doc = ?", (doc,))
+
+    def _insert_chapter(self, conn, doc, law, shard):
+        name = law["law"]
+        chapter = shard["chapter"]
+        conn.execute(
+            "INSERT INTO chapters VALUES (?, ?, ?, ?, ?)",
+            (name, chapter["id"], chapter["number"], chapter["title"], doc)
+        )
+        conn.executemany(
+            "INSERT INTO sections VALUES (?, ?, ?, ?, ?, ?)",
+            [(name, s["id"], chapter["id"], s["number"], s["title"], doc) for s in shard["sections"]]
+        )
+        for article in shard["articles"]:
+            conn.execute(
+                "INSERT INTO articles (law, article_id, number, title, chapter_id, chapter, section,"
+                " body, url, doc) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (name, article["id"], article["number"], article["title"], chapter["id"],
+                 article["chapter"], article["section"], "\n".join(article["paragraphs"]),
+                 f"{law['url']}#article{article['anchor']}", doc)
+            )
+            conn.executemany(
+                "INSERT INTO article_tables (law, article_id, position, header, rows, body, doc)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (name, article["id"], table["position"],
+                     json.dumps(table["header"], ensure_ascii=False),
+                     json.dumps(table["rows"], ensure_ascii=False),
+                     "\n".join("\t".join(row) for row in [table["header"], *table["rows"]]),
+                     doc)
+                    for table in article["tables"]
+                ]
+            )
+
+    def _insert_page(self, conn, doc, page):
+        conn.execute(
+            "INSERT INTO pages (path, url, title, description, section, body, doc)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (page["path"], page["url"], page["title"], page["description"],
+             page["section"], page["body"], doc)
+        )
+
+
+def search(db_path, text, limit=20, kinds=None):
+    """
+    条文・表・ページを全文検索
+
+    Args:
+        kinds: 検索対象の種類（"article" / "table" / "page" のリスト。省略時はすべて）
+
+    Returns:
+        [{"kind": "article" / "table" / "page", "title": ..., "url": ..., "snippet": ...}, ...]
+    """
+    conn = sqlite3.connect(f"file:{Path(db_path).as_posix()}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        if len(text) >= MIN_MATCH_LENGTH:
+            # 語句として検索（FTS5の演算子として解釈させない）
+            phrase = '"' + text.replace('"', '""') + '"'
+            queries = [
+                ("article", "SELECT a.number || COALESCE(' ' || a.title, '') AS title, a.url,"
+                            " snippet(articles_fts, 1, '[', ']', '…', 16) AS snippet"
+                            " FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid"
+                            " WHERE articles_fts MATCH ? ORDER BY rank LIMIT ?"),
+                ("table", "SELECT a.number || COALESCE(' ' || a.title, '') AS title, a.url,"
+                          " snippet(article_tables_fts, 0, '[', ']', '…', 16) AS snippet"
+                          " FROM article_tables_fts JOIN article_tables t ON t.id = article_tables_fts.rowid"
+                          " JOIN articles a ON a.law = t.law AND a.article_id = t.article_id"
+                          " WHERE article_tables_fts MATCH ? ORDER BY rank LIMIT ?"),
+                ("page", "SELECT p.title, p.url, snippet(pages_fts, 2, '[', ']', '…', 16) AS snippet"
+                         " FROM pages_fts JOIN pages p ON p.id = pages_fts.rowid"
+                         " WHERE pages_fts MATCH ? ORDER BY rank LIMIT ?"),
+            ]
+            params = (phrase, limit)
+        else:
+            pattern = "%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            around = "substr({0}, max(instr({0}, ?3) - 16, 1), 40)"
+            queries = [
+                ("article", "SELECT number || COALESCE(' ' || title, '') AS title, url,"
+                            f" {around.format('body')} AS snippet"
+                            " FROM articles WHERE title LIKE ?1 ESCAPE '\\' OR body LIKE ?1 ESCAPE '\\'"
+                            " LIMIT ?2"),
+                ("table", "SELECT a.number || COALESCE(' ' || a.title, '') AS title, a.url,"
+                          f" {around.format('t.body')} AS snippet"
+                          " FROM article_tables t JOIN articles a ON a.law = t.law AND a.article_id = t.article_id"
+                          " WHERE t.body LIKE ?1 ESCAPE '\\' LIMIT ?2"),
+                ("page", f"SELECT title, url, {around.format('body')} AS snippet FROM pages"
+                         " WHERE title LIKE ?1 ESCAPE '\\' OR body LIKE ?1 ESCAPE '\\' LIMIT ?2"),
+            ]
+            params = (pattern, limit, text)
+
+        results = []
+        for kind, sql in queries:
+            if kinds and kind not in kinds:
+                continue
+            for row in conn.execute(sql, params):
+                results.append({"kind": kind, **dict(row)})
+        return results[:limit]
+    finally:
+        conn.close()
+
+
+def _fts_schema():
+    """全文検索テーブルと同期用トリガーのSQL"""
+    statements = []
+    for table, columns in _FTS_TABLES.items():
+        column_list = ", ".join(columns)
+        new_values = ", ".join(f"new.{c}" for c in columns)
+        old_values = ", ".join(f"old.{c}" for c in columns)
+        statements.append(
+            f"CREATE VIRTUAL TABLE {table}_fts USING fts5({column_list},"
+            f" content='{table}', content_rowid='id', tokenize='trigram');\n"
+            f"CREATE TRIGGER {table}_ai AFTER INSERT ON {table} BEGIN\n"
+            f"    INSERT INTO {table}_fts (rowid, {column_list}) VALUES (new.id, {new_values});\n"
+            f"END;\n"
+            f"CREATE TRIGGER {table}_ad AFTER DELETE ON {table} BEGIN\n"
+            f"    INSERT INTO {table}_fts ({table}_fts, rowid, {column_list})"
+            f" VALUES ('delete', old.id, {old_values});\n"
+            f"END;\n"
+        )
+    return "\n".join(statements)
+
+
+def _hash(data):
+    """単位の内容ハッシュ（変更検出用）"""
+    text = json.dumps(data, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+クリティカルCSS
+スタイルシートの各ルールのセレクタと、生成したHTMLに含まれる要素名・クラス・IDを突き合わせ、
+ページで使われるルールだけを <head> に埋め込む（全体は非同期で読み込む）
+"""
+import re
+
+_COMMENT_PATTERN = re.compile(r'/\*.*?\*/', re.DOTALL)
+
+# セレクタから除く部分（属性セレクタ・擬似クラス・擬似要素）
+_IGNORED_PATTERN = re.compile(r'\[[^\]]*\]|::?[\w-]+(?:\([^)]*\))?')
+_TOKEN_PATTERN = re.compile(r'([.#]?)(-?[A-Za-z_][\w-]*)')
+
+# HTMLの要素名・クラス・ID
+_TAG_PATTERN = re.compile(r'<([A-Za-z][\w-]*)')
+_CLASS_PATTERN = re.compile(r'\sclass="([^"]*)"')
+_ID_PATTERN = re.compile(r'\sid="([^"]*)"')
+
+# 内部に入れ子のルールを持つアットルール（中のルールを個別に判定）
+_GROUPING_RULES = ("@media", "@supports")
+
+
+class CriticalCSS:
+    """ページで使われるルールの抽出"""
+
+    def __init__(self, css_text):
+        self.rules = _parse_rules(_COMMENT_PATTERN.sub("", css_text))
+        self.tokens = set()
+        for rule in self.rules:
+            for requirement in rule["selectors"] or ():
+                self.tokens |= requirement
+        self._cache = {}
+
+    def extract(self, html):
+        """HTMLで使われるルールだけのCSS（同じ要素構成のページは前回の結果を再利用）"""
+        used = frozenset(page_tokens(html) & self.tokens)
+        css = self._cache.get(used)
+        if css is None:
+            css = self._build(used)
+            self._cache[used] = css
+        return css
+
+    def _build(self, used):
+        parts = []
+        current_group = None
+        for rule in self.rules:
+            # フォント定義等のセレクタのないルールは常に含める
+            if rule["selectors"] is not None and not any(req <= used for req in rule["selectors"]):
+                continue
+            if rule["group"] != current_group:
+                if current_group:
+                    parts.append("}")
+                if rule["group"]:
+                    parts.append(rule["group"] + "{")
+                current_group = rule["group"]
+            parts.append(rule["text"])
+        if current_group:
+            parts.append("}")
+        return "".join(parts)
+
+
+def page_tokens(html):
+    """HTMLに含まれる要素名・クラス（.名前）・ID（#名前）"""
+    tokens = {tag.lower() for tag in _TAG_PATTERN.findall(html)}
+    for classes in set(_CLASS_PATTERN.findall(html)):
+        tokens.update("." + name for name in classes.split())
+    tokens.update("#" + name for name in _ID_PATTERN.findall(html))
+    return tokens
+
+
+def selector_requirements(selector):
+    """セレクタが一致するためにページに必要な要素名・クラス・ID（状態に依存する部分は除く）"""
+    selector = _IGNORED_PATTERN.sub("", selector)
+    return frozenset(
+        prefix + (name if prefix else name.lower())
+        for prefix, name in _TOKEN_PATTERN.findall(selector)
+    )
+
+
+def _parse_rules(css, group=None):
+    """
+    ルールの一覧に分解
+
+    Returns:
+        [{"group": 囲んでいる @media 等, "selectors": [必要なトークン, ...] または None, "text": 圧縮したルール}, ...]
+    """
+    rules = []
+    position = 0
+    while True:
+        start = css.find("{", position)
+        if start < 0:
+            break
+        prelude = " ".join(css[position:start].split())
+        end = _matching_brace(css, start)
+        body = css[start + 1:end]
+        position = end + 1
+
+        if prelude.startswith(_GROUPING_RULES):
+            rules.extend(_parse_rules(body, prelude))
+        elif prelude.startswith("@"):
+            rules.append({"group": group, "selectors": None, "text": prelude + "{" + _compact(body) + "}"})
+        else:
+            rules.append({
+                "group": group,
+                "selectors": [selector_requirements(s) for s in prelude.split(",")],
+                "text": prelude + "{" + _compact(body) + "}",
+            })
+    return rules
+
+
+def _matching_brace(css, start):
+    """start の { に対応する } の位置"""
+    depth = 0
+    for index in range(start, len(css)):
+        if css[index] == "{":
+            depth += 1
+        elif css[index] == "}":
+            depth -= 1
+            if depth == 0:
+                return index
+    return len(css)
+
+
+def _compact(body):
+    """宣言ブロックの空白を詰める"""
+    declarations = [" ".join(d.split()) for d in body.split(";")]
+    return ";".join(d for d in declarations if d)
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+条文の相互参照リンク
+法令本文中の「第17条第2項」「省令第5条」等の引用を該当条文へのリンクに変換
+"""
+import re
+import json
+import hashlib
+import posixpath
+
+from lib.numbering import NUMBER, article_id
+
+# 条番号（算用数字・漢数字）
+_NUM = NUMBER
+
+# 引用1件（第X条の2第Y項第Z号）
+_CITATION = (
+    rf'(?P<prefix>省令|解釈)?'
+    rf'第(?P<num>{_NUM})条(?:の(?P<branch>{_NUM}))?'
+    rf'(?:第(?:{_NUM})項)?(?:第(?:{_NUM})号)?'
+)
+
+# 列挙された引用のつながり（「省令第6条、第32条第1項」の「第32条」も省令を指す）
+_SEPARATOR = r'(?:、|・|及び|又は|並びに|若しくは|―|から)'
+
+CITATION_PATTERN = re.compile(_CITATION)
+RUN_PATTERN = re.compile(
+    rf'(?:{_CITATION})(?:{_SEPARATOR}(?:{_CITATION.replace("?P<", "?P<_")}))*'
+)
+
+# 接頭辞なしの引用の直前がこれらの文字なら他の法令（電気事業法第39条、政令第5条 等）
+_OTHER_LAW_SUFFIXES = ('法', '則', '令', '規程', '告示')
+
+# 接頭辞 → 法令コーパス名
+PREFIX_CORPUS = {
+    '省令': 'shorei',
+    '解釈': 'kaishaku',
+}
+
+
+def article_ids(articles, to_id):
+    """パース結果から条文IDの集合を作成"""
+    return {to_id(item['number']) for item in articles if item['type'] == 'article'}
+
+
+class CrossReferenceResolver:
+    """法令コーパス横断の条文アンカー表と引用リンク変換"""
+
+    def __init__(self, kanji_to_id=None):
+        """
+        Args:
+            kanji_to_id: 漢数字の条番号をIDに変換する関数（例: 第十五条の二 → "15_2"、
+                省略時は lib.numbering.article_id）
+        """
+        self.kanji_to_id = kanji_to_id or article_id
+        self.corpora = {}
+
+    def register(self, corpus, page, article_ids):
+        """
+        コーパスの条文アンカーを登録
+
+        Args:
+            corpus: コーパス名（"shorei" / "kaishaku"）
+            page: 出力ページ（docs/ からの相対パス）
+            article_ids: 条文IDの集合（article{ID} がアンカー名）
+        """
+        self.corpora[corpus] = {
+            'page': page,
+            'ids': set(article_ids),
+        }
+
+    def version(self):
+        """アンカー表のハッシュ（リンク結果のキャッシュキーに使用）"""
+        data = json.dumps(
+            {name: [c['page'], sorted(c['ids'])] for name, c in self.corpora.items()},
+            ensure_ascii=False,
+            sort_keys=True
+        )
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()[:16]
+
+    def apply(self, text, corpus):
+        """
+        エスケープ済みテキスト中の引用をリンクに変換
+
+        Args:
+            text: HTMLエスケープ済みの本文（タグを含まないこと）
+            corpus: この本文が属するコーパス名（接頭辞なしの引用の参照先）
+        """
+        if not self.corpora or '条' not in text:
+            return text
+
+        def replace_run(run):
+            # 接頭辞なしで始まる引用は、他の法令の条文でないか確認
+            first = CITATION_PATTERN.match(run.group(0))
+            if not first.group('prefix') and self._is_other_law(text, run.start()):
+                return run.group(0)
+
+            current = corpus
+            parts = []
+            last = 0
+            run_text = run.group(0)
+            for citation in CITATION_PATTERN.finditer(run_text):
+                if citation.group('prefix'):
+                    current = PREFIX_CORPUS[citation.group('prefix')]
+                href = self._resolve(citation, current, corpus)
+                parts.append(run_text[last:citation.start()])
+                if href:
+                    parts.append(f'<a href="{href}" class="cross-ref">{citation.group(0)}</a>')
+                else:
+                    parts.append(citation.group(0))
+                last = citation.end()
+            parts.append(run_text[last:])
+            return ''.join(parts)
+
+        return RUN_PATTERN.sub(replace_run, text)
+
+    def _resolve(self, citation, target_corpus, source_corpus):
+        """引用を href に変換（該当条文がなければ None）"""
+        target = self.corpora.get(target_corpus)
+        if not target:
+            return None
+
+        article_id = self._to_id(citation.group('num'), citation.group('branch'))
+        if article_id is None or article_id not in target['ids']:
+            return None
+
+        if target_corpus == source_corpus:
+            return f'#article{article_id}'
+
+        source_page = self.corpora.get(source_corpus, {}).get('page', '')
+        relative = posixpath.relpath(target['page'], posixpath.dirname(source_page) or '.')
+        return f'{relative}#article{article_id}'
+
+    def _to_id(self, num, branch):
+        """条番号（と枝番）をIDに変換"""
+        if num.isdigit() and (branch is None or branch.isdigit()):
+            return f'{num}_{branch}' if branch else num
+        number = f'第{num}条' + (f'の{branch}' if branch else '')
+        try:
+            return self.kanji_to_id(number)
+        except ValueError:
+            # 算用数字と漢数字が混在する等、番号として解釈できない引用
+            return None
+
+    @staticmethod
+    def _is_other_law(text, position):
+        """引用の直前が他の法令名・法令番号か判定"""
+        before = text[:position]
+        if before.endswith(_OTHER_LAW_SUFFIXES):
+            return True
+        # 「（平成十六年経済産業省令第六十七号）第十七条」のような法令番号の直後
+        if before.endswith('）'):
+            open_pos = before.rfind('（')
+            return open_pos != -1 and '号' in before[open_pos:]
+        return False
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+ファイル操作ユーティリティ
+ビルド出力の書き込みと内容ハッシュ計算を担当
+
+内容ハッシュはファイルの更新日時・サイズとともに記憶し、変わっていないファイルは読み直さない
+（load_hash_cache / save_hash_cache でビルド間に引き継ぐ）
+"""
+import os
+import json
+import hashlib
+from pathlib import Path
+
+# ハッシュキャッシュの形式を変更した場合は番号を上げる
+HASH_CACHE_VERSION = 1
+
+# 絶対パス → (更新日時, サイズ, SHA-256)
+_hash_memo = {}
+
+
+def write_if_changed(path, data):
+    """
+    内容が変わった場合のみ書き込む（更新日時を保つため）
+
+    Returns:
+        書き込んだ場合 True
+    """
+    path = Path(path)
+    if path.exists():
+        with open(path, "r", encoding="utf-8") as f:
+            if f.read() == data:
+                return False
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(data)
+    return True
+
+
+def file_hash(path, length=10):
+    """ファイル内容のSHA-256ハッシュ（先頭 length 文字。更新日時・サイズが前回と同じなら記憶した値）"""
+    # パスの正規化はファイルシステムを参照しない abspath で行う（ハッシュを引くたびに呼ぶため）
+    key = os.path.abspath(path)
+    stat = os.stat(key)
+    cached = _hash_memo.get(key)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2][:length]
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    _hash_memo[key] = (stat.st_mtime_ns, stat.st_size, digest.hexdigest())
+    return digest.hexdigest()[:length]
+
+
+def load_hash_cache(path):
+    """前回のビルドで記憶した内容ハッシュを読み込む"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return
+    if data.get("version") != HASH_CACHE_VERSION:
+        return
+    for key, entry in data.get("files", {}).items():
+        _hash_memo.setdefault(key, tuple(entry))
+
+
+def save_hash_cache(path):
+    """記憶している内容ハッシュを保存（存在しなくなったファイルは除く）"""
+    files = {key: list(entry) for key, entry in sorted(_hash_memo.items()) if os.path.exists(key)}
+    write_if_changed(path, json.dumps({"version": HASH_CACHE_VERSION, "files": files}, separators=(",", ":")))
+
+
+def tree_signature(*paths):
+    """ファイル・フォルダ内の全ファイルのパス・更新日時・サイズ（内容を読まずに変更を検出）"""
+    signature = []
+    for path in paths:
+        path = os.fspath(path)
+        if os.path.isfile(path):
+            files = [path]
+        elif os.path.isdir(path):
+            # 変更なしビルドの判定で毎回フォルダ全体をたどるため、Path.rglob より速い os.walk を使う
+            files = sorted(os.path.join(root, name) for root, _, names in os.walk(path) for name in names)
+        else:
+            signature.append((path, None))
+            continue
+        for file in files:
+            try:
+                stat = os.stat(file)
+            except FileNotFoundError:
+                # リンク切れのシンボリックリンク
+                continue
+            signature.append((file, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
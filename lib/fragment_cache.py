@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+ビルドキャッシュ
+描画結果（HTML断片・ページ）や計測値を、入力内容とツールのバージョンのハッシュを
+キーとして保存し、入力が同じなら再計算を省略する
+
+キーは入力だけで決まり、マシン固有の値（パス・更新日時）を含まないため、
+キャッシュフォルダをネットワーク上で共有したり、CI で復元したりして複数の環境で使い回せる
+（保存先は --cache-dir、環境変数 HOANPEDIA_CACHE_DIR、site.json の "cache_dir" の順に優先）
+"""
+import os
+import json
+import time
+import hashlib
+from pathlib import Path
+
+# キャッシュフォルダを指定する環境変数
+CACHE_DIR_ENV = "HOANPEDIA_CACHE_DIR"
+
+# この日数より前から使われていないエントリを prune() で削除
+DEFAULT_MAX_AGE_DAYS = 30
+
+
+def resolve_cache_dir(option=None, configured=None, default=".cache", base_dir="."):
+    """
+    キャッシュフォルダを決定（コマンドライン → 環境変数 → site.json → 既定値）
+
+    相対パスは base_dir からのパスとして扱う
+    """
+    path = Path(option or os.environ.get(CACHE_DIR_ENV) or configured or default).expanduser()
+    return path if path.is_absolute() else Path(base_dir) / path
+
+
+class FragmentCache:
+    """内容ハッシュをキーにしたビルドキャッシュ"""
+
+    def __init__(self, cache_dir, namespace, salt=""):
+        """
+        Args:
+            cache_dir: キャッシュの保存先フォルダ（共有フォルダでもよい）
+            namespace: 用途ごとのサブフォルダ名（例: "kaishaku"）
+            salt: 全キーに混ぜる値（生成器のバージョン、用語辞書のハッシュ等）
+        """
+        self.root = Path(cache_dir) / "fragments" / namespace
+        self.salt = salt
+        self.hits = 0
+        self.misses = 0
+        self.used_keys = set()
+
+    def key(self, *parts):
+        """入力値からキャッシュキーを作成"""
+        data = json.dumps([self.salt, *parts], ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def get_or_render(self, key, render):
+        """キャッシュがあれば返し、なければ render() の結果（文字列）を保存して返す"""
+        return self._get_or_create(key, render, ".html", lambda text: text, lambda value: value)
+
+    def get_or_compute(self, key, compute):
+        """キャッシュがあれば返し、なければ compute() の結果（JSONにできる値）を保存して返す"""
+        return self._get_or_create(
+            key, compute, ".json", json.loads,
+            lambda value: json.dumps(value, ensure_ascii=False, sort_keys=True)
+        )
+
+    def get(self, key):
+        """get_or_compute で保存した値があれば返し、なければ None"""
+        self.used_keys.add(key)
+        text = self._read(self._path(key, ".json"))
+        if text is None:
+            return None
+        self.hits += 1
+        return json.loads(text)
+
+    def put(self, key, value):
+        """値（JSONにできる値）を保存"""
+        self.used_keys.add(key)
+        self.misses += 1
+        self._write(self._path(key, ".json"), json.dumps(value, ensure_ascii=False, sort_keys=True))
+
+    def mark_used(self, key):
+        """キャッシュを読まずに済んだエントリを今回使用したものとして記録（prune で残す）"""
+        self.used_keys.add(key)
+
+    def prune(self, max_age_days=DEFAULT_MAX_AGE_DAYS):
+        """
+        今回使われず、max_age_days 日以上使われていないエントリを削除
+
+        共有フォルダでは他の環境が使うエントリも並んでいるため、今回使わなかっただけでは削除しない
+        （max_age_days=0 なら今回使われなかったエントリをすべて削除）
+        """
+        if not self.root.exists():
+            return 0
+        cutoff = time.time() - max_age_days * 86400
+        removed = 0
+        for path in self.root.glob("*/*.*"):
+            if path.name.split(".")[0] in self.used_keys:
+                continue
+            try:
+                if path.stat().st_mtime <= cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                # 他の環境が同時に削除・置換した
+                continue
+        return removed
+
+    def _get_or_create(self, key, create, suffix, load, dump):
+        self.used_keys.add(key)
+        path = self._path(key, suffix)
+
+        text = self._read(path)
+        if text is not None:
+            self.hits += 1
+            return load(text)
+
+        self.misses += 1
+        value = create()
+        self._write(path, dump(value))
+        return value
+
+    def _read(self, path):
+        """エントリを読み、最終使用日時として更新日時を更新（なければ None）"""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+        except OSError:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            # 読み取り専用の共有キャッシュ
+            pass
+        return text
+
+    def _write(self, path, text):
+        """一時ファイル経由で保存（同じキーを他の環境が同時に書いても壊れない）"""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.urandom(8).hex()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            tmp_path.replace(path)
+        except OSError:
+            # 書き込めないキャッシュ（読み取り専用の共有フォルダ等）は読むだけにする
+            pass
+
+    def _path(self, key, suffix=".html"):
+        return self.root / key[:2] / f"{key}{suffix}"
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""
+用語集JSON生成
+自動リンクのツールチップ用に、用語ID → 読み・説明の対応表を出力
+（各リンクには data-term 属性の用語IDのみを埋め込む）
+"""
+import json
+from pathlib import Path
+
+from lib.file_utils import write_if_changed
+
+# docs/ からの相対パス（フィンガープリント対象）
+GLOSSARY_PATH = "js/glossary.json"
+GLOSSARY_SCRIPT_PATH = "js/glossary.js"
+
+
+def write_glossary(docs_dir, auto_linker):
+    """
+    用語集JSONを出力
+
+    Returns:
+        出力した用語数
+    """
+    glossary = auto_linker.glossary()
+    data = json.dumps(glossary, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    write_if_changed(Path(docs_dir) / GLOSSARY_PATH, data)
+    return len(glossary)
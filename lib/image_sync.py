@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""
+画像の同期とレスポンシブ画像生成
+images/ → docs/images/ の差分コピーと、縮小版・WebP版の生成を担当
+"""
+import re
+import shutil
+import importlib.util
+from pathlib import Path, PurePosixPath
+
+from lib.file_utils import file_hash
+
+# Pillow は縮小版を作成するときに読み込む（画像のないビルドでは読み込まない）
+PIL_AVAILABLE = importlib.util.find_spec("PIL") is not None
+
+# 縮小版・WebP版の出力先（docs/images/ 内）
+VARIANTS_DIRNAME = "_variants"
+
+# 縮小版を作成する拡張子
+RESIZABLE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp"}
+
+
+def sync_images(src_dir, dest_dir):
+    """
+    画像フォルダを差分同期する
+
+    サイズと更新日時が同じファイルはコピーせず、
+    元フォルダから削除されたファイルは出力先からも削除する
+
+    Returns:
+        (コピー数, 削除数, 変更なし数)
+    """
+    src_dir = Path(src_dir)
+    dest_dir = Path(dest_dir)
+    dest_dir.mkdir(parents=True, exist_ok=True)
+
+    copied = unchanged = removed = 0
+    expected = set()
+
+    for src in src_dir.rglob("*"):
+        if not src.is_file():
+            continue
+        relative = src.relative_to(src_dir)
+        expected.add(relative)
+        dest = dest_dir / relative
+
+        if dest.exists():
+            src_stat = src.stat()
+            dest_stat = dest.stat()
+            if (src_stat.st_size == dest_stat.st_size
+                    and int(src_stat.st_mtime) == int(dest_stat.st_mtime)):
+                unchanged += 1
+                continue
+
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(src, dest)
+        copied += 1
+
+    # 元フォルダにないファイルを削除（縮小版フォルダは対象外）
+    for dest in sorted(dest_dir.rglob("*"), reverse=True):
+        relative = dest.relative_to(dest_dir)
+        if relative.parts[0] == VARIANTS_DIRNAME:
+            continue
+        if dest.is_file() and relative not in expected:
+            dest.unlink()
+            removed += 1
+        elif dest.is_dir() and not any(dest.iterdir()):
+            dest.rmdir()
+
+    return copied, removed, unchanged
+
+
+class ResponsiveImages:
+    """Markdown中の画像に縮小版・WebP版と srcset を付与する"""
+
+    IMG_PATTERN = re.compile(r'<img\s([^>]*?)src="([^"]+)"([^>]*?)\s*/?>')
+
+    def __init__(self, images_dir, docs_dir, config=None):
+        """
+        Args:
+            images_dir: 元画像フォルダ（images/）
+            docs_dir: 出力先（docs/）フォルダ
+            config: site.json の "images" 設定
+                    {"responsive": true, "widths": [480, 960], "webp": true,
+                     "quality": 80, "sizes": "(max-width: 800px) 100vw, 800px"}
+        """
+        config = config or {}
+        self.images_dir = Path(images_dir)
+        self.docs_dir = Path(docs_dir)
+        self.variants_dir = self.docs_dir / "images" / VARIANTS_DIRNAME
+        self.enabled = bool(config.get("responsive", False))
+        self.widths = sorted(config.get("widths", [480, 960]))
+        self.webp = bool(config.get("webp", True))
+        self.quality = config.get("quality", 80)
+        self.sizes = config.get("sizes", "(max-width: 800px) 100vw, 800px")
+
+        # 今回のビルドで参照された縮小版（古い縮小版の削除に使用）
+        self.used_variants = set()
+        # 直前の apply() で参照された縮小版
+        self.page_variants = set()
+        # 元画像パス → 縮小版リスト（同一ビルド内のキャッシュ）
+        self._variants = {}
+
+    def apply(self, html, page_path):
+        """
+        HTML内の <img> を縮小版付きの <picture> に置き換える
+
+        Args:
+            html: ページ本文のHTML
+            page_path: 出力ページのパス（相対パス解決用）
+        """
+        self.page_variants = set()
+        if not self.enabled:
+            return html
+
+        page_dir = PurePosixPath(Path(page_path).relative_to(self.docs_dir).as_posix()).parent
+
+        def replace_img(match):
+            src = match.group(2)
+            attrs = f'{match.group(1)} {match.group(3)}'.strip()
+            if 'loading=' not in attrs:
+                attrs = f'{attrs} loading="lazy" decoding="async"'.strip()
+
+            source = self._resolve_source(src, page_dir)
+            variants = self._get_variants(source) if source else []
+            self.page_variants.update(name for _, name, _ in variants)
+            if not variants:
+                return f'<img src="{src}" {attrs}>'
+
+            prefix = src[:src.rfind("images/")]
+            fallback = [(w, f"{prefix}images/{VARIANTS_DIRNAME}/{name}")
+                        for w, name, fmt in variants if fmt != "webp"]
+            webp = [(w, f"{prefix}images/{VARIANTS_DIRNAME}/{name}")
+                    for w, name, fmt in variants if fmt == "webp"]
+            if not fallback:
+                # 元画像がWebPの場合は <source> を使わない
+                fallback, webp = webp, []
+
+            parts = ['<picture>']
+            if webp:
+                parts.append(
+                    f'<source type="image/webp" srcset="{_srcset(webp)}" sizes="{self.sizes}">'
+                )
+            parts.append(
+                f'<img src="{src}" srcset="{_srcset(fallback)}" sizes="{self.sizes}" {attrs}>'
+            )
+            parts.append('</picture>')
+            return ''.join(parts)
+
+        return self.IMG_PATTERN.sub(replace_img, html)
+
+    def has_variants(self, names):
+        """縮小版がすべて出力済みか（キャッシュした描画結果を使えるかの確認）"""
+        return all((self.variants_dir / name).exists() for name in names)
+
+    def cleanup(self):
+        """今回のビルドで参照されなかった縮小版を削除"""
+        if not self.variants_dir.exists():
+            return 0
+        removed = 0
+        for path in self.variants_dir.iterdir():
+            if path.name not in self.used_variants:
+                path.unlink()
+                removed += 1
+        return removed
+
+    def _resolve_source(self, src, page_dir):
+        """img の src を元画像のパスに変換（images/ 以外や外部URLは None）"""
+        if "://" in src or src.startswith(("/", "data:")):
+            return None
+        parts = []
+        for part in (page_dir / src).parts:
+            if part == "..":
+                if parts:
+                    parts.pop()
+            elif part != ".":
+                parts.append(part)
+        if len(parts) < 2 or parts[0] != "images":
+            return None
+        source = self.images_dir.joinpath(*parts[1:])
+        if source.suffix.lower() not in RESIZABLE_SUFFIXES or not source.exists():
+            return None
+        return source
+
+    def _get_variants(self, source):
+        """
+        縮小版を作成（元画像のハッシュをファイル名に含め、作成済みなら再利用）
+
+        Returns:
+            [(幅, ファイル名, 形式), ...]（元画像より大きい幅は作成しない）
+        """
+        if not PIL_AVAILABLE:
+            return []
+        if source in self._variants:
+            return self._variants[source]
+
+        from PIL import Image
+
+        digest = file_hash(source, 8)
+        self.variants_dir.mkdir(parents=True, exist_ok=True)
+        suffix = source.suffix.lower()
+        fmt = "jpeg" if suffix in (".jpg", ".jpeg") else suffix[1:]
+
+        variants = []
+        with Image.open(source) as image:
+            original_width, original_height = image.size
+            widths = [w for w in self.widths if w < original_width] + [original_width]
+
+            for width in widths:
+                targets = [(suffix, fmt)]
+                if self.webp and fmt != "webp":
+                    targets.append((".webp", "webp"))
+
+                for target_suffix, target_fmt in targets:
+                    name = f"{source.stem}-{digest}-{width}{target_suffix}"
+                    variants.append((width, name, target_fmt))
+                    self.used_variants.add(name)
+
+                    output = self.variants_dir / name
+                    if output.exists():
+                        continue
+                    height = round(original_height * width / original_width)
+                    resized = image if width == original_width else image.resize((width, height), Image.LANCZOS)
+                    if target_fmt == "jpeg" and resized.mode not in ("RGB", "L"):
+                        resized = resized.convert("RGB")
+                    resized.save(output, target_fmt.upper(), quality=self.quality)
+
+        self._variants[source] = variants
+        return variants
+
+
+def _srcset(candidates):
+    """[(幅, パス), ...] を srcset 属性値に変換"""
+    return ", ".join(f"{path} {width}w" for width, path in candidates)
@@ -4,21 +4,28 @@ Markdown パーサー
 フロントマター解析とMarkdown→HTML変換を担当
 """
 import re
+import importlib.util
 from pathlib import Path
 
-try:
-    import markdown
-    MARKDOWN_AVAILABLE = True
-except ImportError:
-    MARKDOWN_AVAILABLE = False
+from lib.file_utils import file_hash
+
+# markdown パッケージは読み込みに時間がかかるため、最初に変換するときに読み込む
+_MARKDOWN_SPEC = importlib.util.find_spec("markdown")
+MARKDOWN_AVAILABLE = _MARKDOWN_SPEC is not None
 
 
 class MarkdownParser:
     """Markdownファイルのパーサー"""
     
     def __init__(self):
-        if MARKDOWN_AVAILABLE:
-            self.md = markdown.Markdown(
+        self._md = None
+    
+    @property
+    def md(self):
+        """markdown.Markdown（未導入なら None）"""
+        if self._md is None and MARKDOWN_AVAILABLE:
+            import markdown
+            self._md = markdown.Markdown(
                 extensions=[
                     'tables',
                     'fenced_code',
@@ -26,8 +33,18 @@ class MarkdownParser:
                     'toc',
                 ]
             )
-        else:
-            self.md = None
+        return self._md
+    
+    def version(self):
+        """変換方法のバージョン（描画結果のキャッシュキーに使用）"""
+        if not MARKDOWN_AVAILABLE:
+            return "simple"
+        # パッケージを読み込まずに、バージョンを記したファイルの内容で判定
+        meta = Path(_MARKDOWN_SPEC.origin).parent / "__meta__.py"
+        if meta.exists():
+            return f"markdown {file_hash(meta, 16)}"
+        import markdown
+        return f"markdown {markdown.__version__}"
     
     def parse_file(self, filepath):
         """ファイルを解析してフロントマターとHTMLを返す"""
@@ -40,16 +57,7 @@ class MarkdownParser:
     
     def parse_content(self, content):
         """コンテンツを解析してフロントマターとHTMLを返す"""
-        frontmatter = {}
-        body = content
-        
-        # フロントマター（YAML）の抽出
-        fm_match = re.match(r'^---\s*\n(.*?)\n---\s*\n', content, re.DOTALL)
-        
-        if fm_match:
-            fm_text = fm_match.group(1)
-            frontmatter = self._parse_yaml_simple(fm_text)
-            body = content[fm_match.end():]
+        frontmatter, body = self.split_frontmatter(content)
         
         # カスタム記法の処理（:::info, :::warning等）
         body = self._process_custom_blocks(body)
@@ -64,6 +72,22 @@ class MarkdownParser:
         
         return frontmatter, html
     
+    def read_frontmatter(self, filepath):
+        """ファイルのフロントマターのみを返す（本文は変換しない）"""
+        with open(filepath, "r", encoding="utf-8") as f:
+            content = f.read()
+        
+        return self.split_frontmatter(content)[0]
+    
+    def split_frontmatter(self, content):
+        """フロントマター（YAML）と本文に分ける"""
+        fm_match = re.match(r'^---\s*\n(.*?)\n---\s*\n', content, re.DOTALL)
+        
+        if not fm_match:
+            return {}, content
+        
+        return self._parse_yaml_simple(fm_match.group(1)), content[fm_match.end():]
+    
     def _parse_yaml_simple(self, yaml_text):
         """シンプルなYAML解析（ネストなし）"""
         result = {}
@@ -106,122 +130,236 @@ class MarkdownParser:
         return text
     
     def _simple_markdown(self, text):
-        """シンプルなMarkdown変換（フォールバック用）"""
-        lines = text.split("\n")
-        html_lines = []
-        in_list = False
-        in_code_block = False
-        in_table = False
-        code_lines = []
+        """
+        シンプルなMarkdown変換（フォールバック用）
+        
+        行を1回だけ走査してブロック（見出し・段落・リスト・表・コード・HTML）に分け、
+        そのままHTMLを組み立てる。正規表現はすべてモジュール読み込み時にコンパイル済み
+        """
+        html_parts = []
+        paragraph = []
         table_rows = []
+        list_stack = []   # [(インデント幅, "ul" / "ol")]
+        code_lines = None
+        code_lang = ""
+        item_break = False   # 直前のリスト項目の行が改行（行末の空白2つ）で終わっているか
+        
+        def flush_paragraph():
+            if paragraph:
+                html_parts.append(f"<p>{self._inline_format(_join_lines(paragraph))}</p>")
+                paragraph.clear()
+        
+        def flush_table():
+            if table_rows:
+                html_parts.append(self._render_table(table_rows))
+                table_rows.clear()
+        
+        def close_lists(indent=-1):
+            # indent より深いリストを閉じる
+            while list_stack and list_stack[-1][0] > indent:
+                html_parts[-1] += "</li>"
+                html_parts.append(f"</{list_stack.pop()[1]}>")
         
-        for line in lines:
-            # コードブロックの処理
-            if line.strip().startswith("```"):
-                if in_code_block:
-                    # コードブロック終了
-                    code_content = "\n".join(code_lines)
-                    html_lines.append(f'<pre><code>{code_content}</code></pre>')
-                    code_lines = []
-                    in_code_block = False
+        def flush_all():
+            flush_paragraph()
+            flush_table()
+            close_lists()
+        
+        for line in text.split("\n"):
+            # コードブロック内
+            if code_lines is not None:
+                if _FENCE_PATTERN.match(line):
+                    lang_attr = f' class="language-{code_lang}"' if code_lang else ""
+                    code = _escape("\n".join(code_lines))
+                    html_parts.append(f"<pre><code{lang_attr}>{code}</code></pre>")
+                    code_lines = None
                 else:
-                    # コードブロック開始
-                    in_code_block = True
+                    code_lines.append(line)
+                continue
+            
+            fence = _FENCE_PATTERN.match(line)
+            if fence:
+                flush_all()
+                code_lines = []
+                code_lang = fence.group(1)
                 continue
             
-            if in_code_block:
-                code_lines.append(line)
+            # 空行：段落・表を閉じる（リストは次の行を見て判断）
+            if not line.strip():
+                flush_paragraph()
+                flush_table()
                 continue
             
-            # 水平線の処理
-            if line.strip() == "---" or line.strip() == "***" or line.strip() == "___":
-                if in_list:
-                    html_lines.append("</ul>")
-                    in_list = False
-                if in_table:
-                    html_lines.append("</tbody></table>")
-                    table_rows = []
-                    in_table = False
-                html_lines.append("<hr>")
+            # 表
+            if _TABLE_ROW_PATTERN.match(line):
+                flush_paragraph()
+                close_lists()
+                table_rows.append(line)
                 continue
+            flush_table()
             
-            # テーブルの処理
-            if line.strip().startswith("|") and line.strip().endswith("|"):
-                # テーブル区切り行（|---|---|）はスキップ
-                # 内容が - : スペースのみで構成されているかチェック
-                inner_content = line.strip()[1:-1]  # 両端の|を除去
-                if all(c in '-: |' for c in inner_content) and '-' in inner_content:
-                    continue
+            # 水平線（リスト記号「- 」より先に判定）
+            if _HR_PATTERN.match(line):
+                flush_all()
+                html_parts.append("<hr>")
+                continue
+            
+            heading = _HEADING_PATTERN.match(line)
+            if heading:
+                flush_all()
+                level = len(heading.group(1))
+                html_parts.append(f"<h{level}>{self._inline_format(heading.group(2))}</h{level}>")
+                continue
+            
+            item = _LIST_ITEM_PATTERN.match(line)
+            if item:
+                flush_paragraph()
+                indent = len(item.group(1).expandtabs(4))
+                list_type = "ul" if item.group(2) in "-*+" else "ol"
                 
-                # テーブル行を解析
-                cells = [cell.strip() for cell in line.strip().split("|")[1:-1]]
+                close_lists(indent)
+                if list_stack and list_stack[-1][0] == indent:
+                    html_parts[-1] += "</li>"
+                    if list_stack[-1][1] != list_type:
+                        # 同じ深さで種類が変わったら別のリスト
+                        html_parts.append(f"</{list_stack.pop()[1]}>")
+                if not list_stack or list_stack[-1][0] < indent:
+                    # 番号付きリストは markdown パッケージと同じく常に1から（先頭の番号は使わない）
+                    html_parts.append(f"<{list_type}>")
+                    list_stack.append((indent, list_type))
                 
-                if not in_table:
-                    # テーブルヘッダー開始
-                    html_lines.append('<table class="md-table"><thead><tr>')
-                    for cell in cells:
-                        cell = self._inline_format(cell)
-                        html_lines.append(f"<th>{cell}</th>")
-                    html_lines.append("</tr></thead><tbody>")
-                    in_table = True
-                else:
-                    # テーブル本体
-                    html_lines.append("<tr>")
-                    for cell in cells:
-                        cell = self._inline_format(cell)
-                        html_lines.append(f"<td>{cell}</td>")
-                    html_lines.append("</tr>")
+                html_parts.append(f"<li>{self._inline_format(item.group(3).rstrip())}")
+                item_break = _HARD_BREAK_PATTERN.search(line) is not None
                 continue
-            else:
-                # テーブル終了
-                if in_table:
-                    html_lines.append("</tbody></table>")
-                    table_rows = []
-                    in_table = False
             
-            # 見出し
-            if line.startswith("### "):
-                html_lines.append(f"<h3>{line[4:]}</h3>")
-            elif line.startswith("## "):
-                html_lines.append(f"<h2>{line[3:]}</h2>")
-            elif line.startswith("# "):
-                html_lines.append(f"<h1>{line[2:]}</h1>")
-            # リスト
-            elif line.startswith("- "):
-                if not in_list:
-                    html_lines.append("<ul>")
-                    in_list = True
-                # リスト内のリンク処理
-                list_content = line[2:]
-                list_content = self._inline_format(list_content)
-                html_lines.append(f"<li>{list_content}</li>")
-            # 番号付きリスト
-            elif re.match(r'^\d+\. ', line):
-                content = re.sub(r'^\d+\. ', '', line)
-                content = self._inline_format(content)
-                html_lines.append(f"<p>{content}</p>")
-            else:
-                if in_list:
-                    html_lines.append("</ul>")
-                    in_list = False
-                
-                if line.strip():
-                    line = self._inline_format(line)
-                    html_lines.append(f"<p>{line}</p>")
+            if _HTML_BLOCK_PATTERN.match(line):
+                flush_all()
+                html_parts.append(line)
+                continue
+            
+            # リスト項目の継続行（インデントされた行）
+            if list_stack and line[:1] in (" ", "\t"):
+                if item_break:
+                    html_parts[-1] += "<br>"
+                html_parts.append(self._inline_format(line.strip()))
+                item_break = _HARD_BREAK_PATTERN.search(line) is not None
+                continue
+            
+            close_lists()
+            paragraph.append(line.lstrip())
+        
+        if code_lines is not None:
+            # 閉じられていないコードブロック
+            html_parts.append(f"<pre><code>{_escape(chr(10).join(code_lines))}</code></pre>")
+        flush_all()
+        
+        return "\n".join(html_parts)
+    
+    def _render_table(self, rows):
+        """表の行リストをHTMLに変換（2行目が区切り行なら1行目を見出しとする）"""
+        cells = [_split_table_row(row) for row in rows]
+        
+        header = None
+        aligns = []
+        if len(rows) > 1 and _TABLE_SEPARATOR_PATTERN.match(rows[1]):
+            header = cells[0]
+            aligns = [_cell_align(cell) for cell in cells[1]]
+            cells = cells[2:]
         
-        if in_list:
-            html_lines.append("</ul>")
-        if in_table:
-            html_lines.append("</tbody></table>")
+        def cell_html(tag, index, cell):
+            align = aligns[index] if index < len(aligns) else None
+            style = f' style="text-align: {align};"' if align else ""
+            return f"<{tag}{style}>{self._inline_format(cell)}</{tag}>"
         
-        return "\n".join(html_lines)
+        html = ['<table class="md-table">']
+        if header is not None:
+            html.append("<thead>\n<tr>")
+            html.extend(cell_html("th", i, cell) for i, cell in enumerate(header))
+            html.append("</tr>\n</thead>")
+        html.append("<tbody>")
+        for row in cells:
+            html.append("<tr>")
+            html.extend(cell_html("td", i, cell) for i, cell in enumerate(row))
+            html.append("</tr>")
+        html.append("</tbody>\n</table>")
+        return "\n".join(html)
     
     def _inline_format(self, text):
-        """インライン要素を変換"""
-        # 太字
-        text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
-        # 斜体
-        text = re.sub(r'\*(.+?)\*', r'<em>\1</em>', text)
-        # リンク
-        text = re.sub(r'\[(.+?)\]\((.+?)\)', r'<a href="\2">\1</a>', text)
-        return text
+        """インライン要素を変換（コード・画像・リンク・太字・斜体を1回の走査で処理）"""
+        return _INLINE_PATTERN.sub(self._replace_inline, text)
+    
+    def _replace_inline(self, match):
+        """インライン要素1件をHTMLに変換"""
+        kind = match.lastgroup
+        if kind == "code":
+            return f"<code>{_escape(match.group('code_text'))}</code>"
+        if kind == "image":
+            return f'<img src="{match.group("image_src")}" alt="{match.group("image_alt")}">'
+        if kind == "link":
+            text = self._inline_format(match.group("link_text"))
+            return f'<a href="{match.group("link_href")}">{text}</a>'
+        if kind == "strong":
+            return f"<strong>{self._inline_format(match.group('strong_text'))}</strong>"
+        if kind == "em":
+            return f"<em>{self._inline_format(match.group('em_text'))}</em>"
+        return match.group(0)
+
+
+# フォールバック変換用の正規表現（読み込み時に1回だけコンパイル）
+_FENCE_PATTERN = re.compile(r'^\s*```\s*([\w+-]*)\s*$')
+_HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+_HR_PATTERN = re.compile(r'^ {0,3}([-*_])(?:\s*\1){2,}\s*$')
+_LIST_ITEM_PATTERN = re.compile(r'^(\s*)([-*+]|\d+[.)])\s+(.*)$')
+_HARD_BREAK_PATTERN = re.compile(r' {2,}$')
+_TABLE_ROW_PATTERN = re.compile(r'^\s*\|.*\|\s*$')
+_TABLE_SEPARATOR_PATTERN = re.compile(r'^\s*\|?\s*:?-+:?\s*(?:\|\s*:?-+:?\s*)*\|?\s*$')
+_HTML_BLOCK_PATTERN = re.compile(
+    r'^\s*(?:<!--|</?(?:div|p|table|thead|tbody|tr|td|th|section|details|summary|figure|pre|ul|ol|li|h[1-6]|hr|br)\b)',
+    re.IGNORECASE
+)
+_INLINE_PATTERN = re.compile(
+    r'(?P<code>`(?P<code_text>[^`]+)`)'
+    r'|(?P<image>!\[(?P<image_alt>[^\]]*)\]\((?P<image_src>[^)\s]+)\))'
+    r'|(?P<link>\[(?P<link_text>[^\]]+)\]\((?P<link_href>[^)\s]+)\))'
+    r'|(?P<strong>\*\*(?P<strong_text>.+?)\*\*)'
+    r'|(?P<em>\*(?P<em_text>[^*\s](?:[^*]*?[^*\s])?)\*)'
+)
+
+
+def _escape(text):
+    """コード内のHTML特殊文字をエスケープ"""
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _join_lines(lines):
+    """段落の行を改行でつなぐ（行末に空白が2つ以上ある行の後は <br>。段落の最後の行は除く）"""
+    text = []
+    for i, line in enumerate(lines):
+        if i < len(lines) - 1 and _HARD_BREAK_PATTERN.search(line):
+            text.append(line.rstrip() + "<br>")
+        else:
+            text.append(line.rstrip())
+    return "\n".join(text)
+
+
+def _split_table_row(row):
+    """「| a | b |」をセルのリストに分解"""
+    row = row.strip()
+    if row.startswith("|"):
+        row = row[1:]
+    if row.endswith("|"):
+        row = row[:-1]
+    return [cell.strip() for cell in row.split("|")]
+
+
+def _cell_align(separator_cell):
+    """区切り行のセル（:---: 等）から配置を取得"""
+    left = separator_cell.startswith(":")
+    right = separator_cell.endswith(":")
+    if left and right:
+        return "center"
+    if right:
+        return "right"
+    if left:
+        return "left"
+    return None
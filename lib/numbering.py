@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+法令テキストの正規化と条番号
+テキストの文字コード判定・表記の正規化（全角英数字・半角カナ）と、
+「第十五条の二」「第37条の2」のような番号をアンカーIDに変換する共通の規則
+
+条番号 → ID の変換結果はプロセス内で共有し、同じ番号は1回だけ解析する
+"""
+import re
+import unicodedata
+from functools import lru_cache
+
+# 判定する文字コード（BOM のないファイルは先頭から順に試す）
+_BOMS = (
+    (b'\xef\xbb\xbf', 'utf-8-sig'),
+    (b'\xff\xfe', 'utf-16'),
+    (b'\xfe\xff', 'utf-16'),
+)
+_FALLBACK_ENCODINGS = ('utf-8', 'cp932', 'euc_jp')
+
+# NFKC で置き換える文字（全角英数字・半角カナ）。全角の括弧・句読点・空白は条文の区切りに使うため残す
+_NORMALIZE_PATTERN = re.compile('[０-９Ａ-Ｚａ-ｚ｡-ﾟ]+')
+
+# 番号（算用数字・漢数字）
+NUMBER = r'[0-9]+|[〇一二三四五六七八九十百千]+'
+
+# 見出しの番号（第X条、第X章、第X条の二の三 …）
+_HEADING_PATTERN = re.compile(rf'^第({NUMBER})(?:編|章|節|款|目|条)((?:の(?:{NUMBER}))*)$')
+_BRANCH_PATTERN = re.compile(rf'の({NUMBER})')
+
+_KANJI_DIGITS = {
+    '〇': 0, '一': 1, '二': 2, '三': 3, '四': 4,
+    '五': 5, '六': 6, '七': 7, '八': 8, '九': 9,
+}
+_KANJI_UNITS = {'十': 10, '百': 100, '千': 1000}
+
+
+def read_text(path):
+    """テキストファイルを文字コードを判定して読み込み、正規化して返す"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return normalize_text(decode(data))
+
+
+def decode(data):
+    """バイト列を文字列に変換（BOM、UTF-8、Shift_JIS、EUC-JP の順に判定）"""
+    for bom, encoding in _BOMS:
+        if data.startswith(bom):
+            return data.decode(encoding)
+    for encoding in _FALLBACK_ENCODINGS:
+        try:
+            return data.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return data.decode('utf-8', errors='replace')
+
+
+def normalize_text(text):
+    """改行をLFに揃え、全角英数字・半角カナを NFKC で正規化（第１章 → 第1章）"""
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return _NORMALIZE_PATTERN.sub(lambda m: unicodedata.normalize('NFKC', m.group(0)), text)
+
+
+def parse_number(text):
+    """
+    番号を整数に変換
+
+    算用数字（"120"）、位取りの漢数字（"百二十"、"千五"）、
+    並べ書きの漢数字（"一二〇"）に対応
+
+    Raises:
+        ValueError: 番号として解釈できない場合
+    """
+    text = normalize_text(text)
+    if text.isdigit():
+        return int(text)
+
+    total = 0
+    current = None
+    for char in text:
+        if char in _KANJI_DIGITS:
+            current = (current or 0) * 10 + _KANJI_DIGITS[char]
+        elif char in _KANJI_UNITS:
+            total += (1 if current is None else current) * _KANJI_UNITS[char]
+            current = None
+        else:
+            raise ValueError(f'番号として解釈できません: {text}')
+    if not text:
+        raise ValueError('番号が空です')
+    return total + (current or 0)
+
+
+@lru_cache(maxsize=None)
+def article_id(number):
+    """
+    見出しの番号をアンカーID用の文字列に変換（結果はメモ化して共有）
+
+    第十五条の二 → "15_2"、第37条の2 → "37_2"、第十五条の二の三 → "15_2_3"、第3章 → "3"
+
+    Raises:
+        ValueError: 番号として解釈できない場合
+    """
+    match = _HEADING_PATTERN.match(normalize_text(number.strip()))
+    if not match:
+        raise ValueError(f'番号として解釈できません: {number}')
+    parts = [parse_number(match.group(1))]
+    parts.extend(parse_number(branch) for branch in _BRANCH_PATTERN.findall(match.group(2)))
+    return '_'.join(str(part) for part in parts)
+
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+ページ重量の計測と予算チェック
+出力HTMLごとのサイズ（raw / gzip / brotli）・DOM要素数・自動リンク数を計測し、
+site.json の予算や前回ビルドとの比較で警告する
+"""
+import zlib
+import gzip
+from html.parser import HTMLParser
+from pathlib import PurePosixPath
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# 予算を設定できる指標（site.json の "budgets" のキー）
+METRICS = ("raw", "gzip", "brotli", "dom_nodes", "auto_links")
+
+# 前回ビルドからの増加率の既定上限（gzip サイズ）
+DEFAULT_MAX_GROWTH = 0.2
+
+# 計測方法を変更した場合は番号を上げる（計測結果のキャッシュを無効化）
+MEASURE_VERSION = "1"
+
+
+class _ElementCounter(HTMLParser):
+    """HTML要素数を数えるパーサー"""
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def handle_starttag(self, tag, attrs):
+        self.count += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self.count += 1
+
+
+def measure_page(path):
+    """
+    ページ重量を計測
+
+    Returns:
+        {"raw", "gzip", "brotli", "dom_nodes", "auto_links"}（brotli は未導入なら None）
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    text = data.decode("utf-8", errors="replace")
+
+    counter = _ElementCounter()
+    counter.feed(text)
+    counter.close()
+
+    return {
+        "raw": len(data),
+        "gzip": len(gzip.compress(data, compresslevel=9, mtime=0)),
+        "brotli": len(brotli.compress(data)) if BROTLI_AVAILABLE else None,
+        "dom_nodes": counter.count,
+        "auto_links": text.count('class="auto-link"'),
+    }
+
+
+def measure_version():
+    """計測方法と圧縮ライブラリのバージョン（計測結果のキャッシュキーに使用）"""
+    brotli_version = getattr(brotli, "__version__", "unknown") if BROTLI_AVAILABLE else None
+    return f"{MEASURE_VERSION}:zlib {zlib.ZLIB_RUNTIME_VERSION}:brotli {brotli_version}"
+
+
+def needs_measure(weight):
+    """前回の計測値が使えない場合 True（未計測、または brotli を後から導入した）"""
+    return not weight or (BROTLI_AVAILABLE and weight.get("brotli") is None)
+
+
+def check_budgets(pages, previous, budgets=None):
+    """
+    予算超過と前回ビルドからの増加を確認
+
+    Args:
+        pages: 今回のマニフェスト（{ページ: {"weight": {...}, ...}}）
+        previous: 前回のマニフェスト
+        budgets: site.json の "budgets" 設定
+                 {"default": {"gzip": 120000, "dom_nodes": 8000},
+                  "pages": {"standards/kaishaku/index.html": {"gzip": 400000}},
+                  "max_growth": 0.2, "fail": false}
+
+    Returns:
+        (予算超過メッセージのリスト, 増加メッセージのリスト)
+    """
+    budgets = budgets or {}
+    default = budgets.get("default", {})
+    page_budgets = budgets.get("pages", {})
+    max_growth = budgets.get("max_growth", DEFAULT_MAX_GROWTH)
+
+    over = []
+    grown = []
+    for relative, page in sorted(pages.items()):
+        weight = page.get("weight")
+        if not weight:
+            continue
+
+        # ページ個別の予算（glob パターン可）を既定値に重ねる
+        limits = dict(default)
+        for pattern, values in page_budgets.items():
+            if relative == pattern or PurePosixPath(relative).match(pattern):
+                limits.update(values)
+
+        for metric in METRICS:
+            limit = limits.get(metric)
+            value = weight.get(metric)
+            if limit is not None and value is not None and value > limit:
+                over.append(f"{relative}: {metric} {_format(metric, value)} が予算 {_format(metric, limit)} を超えています")
+
+        old = (previous.get(relative) or {}).get("weight")
+        if old and old.get("gzip") and max_growth is not None:
+            growth = (weight["gzip"] - old["gzip"]) / old["gzip"]
+            if growth > max_growth:
+                grown.append(
+                    f"{relative}: gzip {_format('gzip', old['gzip'])} → {_format('gzip', weight['gzip'])}"
+                    f"（+{growth:.0%}）"
+                )
+
+    return over, grown
+
+
+def summarize(pages, top=3):
+    """合計サイズと重いページ上位の説明文"""
+    weights = [(relative, page["weight"]) for relative, page in pages.items() if page.get("weight")]
+    total_raw = sum(w["raw"] for _, w in weights)
+    total_gzip = sum(w["gzip"] for _, w in weights)
+    lines = [f"合計 {_format('raw', total_raw)}（gzip {_format('gzip', total_gzip)}）"]
+
+    for relative, weight in sorted(weights, key=lambda item: item[1]["gzip"], reverse=True)[:top]:
+        brotli_text = f" / br {_format('brotli', weight['brotli'])}" if weight.get("brotli") else ""
+        lines.append(
+            f"{relative}: {_format('raw', weight['raw'])}"
+            f"（gzip {_format('gzip', weight['gzip'])}{brotli_text}）"
+            f" 要素 {weight['dom_nodes']} / 自動リンク {weight['auto_links']}"
+        )
+    return lines
+
+
+def _format(metric, value):
+    """サイズはKB表示、件数はそのまま"""
+    if metric in ("raw", "gzip", "brotli"):
+        return f"{value / 1024:.1f}KB"
+    return str(value)
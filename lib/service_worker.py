@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+サービスワーカー生成
+オフライン閲覧用のプリキャッシュマニフェストとサービスワーカーを出力
+"""
+import json
+from pathlib import Path
+
+from lib.file_utils import write_if_changed, file_hash
+
+# プリキャッシュ対象（docs/ からの相対パターン）
+DEFAULT_PRECACHE_PATTERNS = [
+    "index.html",
+    "coming-soon.html",
+    "css/*.css",
+    "js/*.js",
+    "js/*.json",
+    "standards/**/*.html",
+    "equipment/*.html",
+    "relay/*.html",
+    "guide/*.html",
+    "sld/*.html",
+]
+
+CACHE_NAME = "hoanpedia-precache"
+
+SERVICE_WORKER_TEMPLATE = """// ほあんペディア サービスワーカー（ビルド時に自動生成・編集しないこと）
+const CACHE_NAME = '__CACHE_NAME__';
+const PRECACHE = __MANIFEST__;
+
+// キャッシュキー（内容ハッシュ付きURL）
+function cacheKey(path) {
+    return new URL(path + '?__v=' + PRECACHE[path], self.registration.scope).href;
+}
+
+// スコープからの相対パス（ディレクトリは index.html を補う）
+function precachePath(url) {
+    const scope = new URL(self.registration.scope);
+    if (url.origin !== scope.origin || !url.pathname.startsWith(scope.pathname)) {
+        return null;
+    }
+    let path = decodeURIComponent(url.pathname.substring(scope.pathname.length));
+    if (path === '' || path.endsWith('/')) {
+        path += 'index.html';
+    }
+    return path in PRECACHE ? path : null;
+}
+
+// 変更のあったファイルのみ取得（ハッシュが同じものはキャッシュ済み）
+self.addEventListener('install', function (event) {
+    event.waitUntil(caches.open(CACHE_NAME).then(function (cache) {
+        return Promise.all(Object.keys(PRECACHE).map(function (path) {
+            const key = cacheKey(path);
+            return cache.match(key).then(function (hit) {
+                if (hit) {
+                    return null;
+                }
+                return fetch(new URL(path, self.registration.scope).href, { cache: 'no-cache' })
+                    .then(function (res) {
+                        if (res.ok) {
+                            return cache.put(key, res);
+                        }
+                    });
+            });
+        }));
+    }).then(function () {
+        return self.skipWaiting();
+    }));
+});
+
+// マニフェストにない古いキャッシュを削除
+self.addEventListener('activate', function (event) {
+    event.waitUntil(caches.open(CACHE_NAME).then(function (cache) {
+        const valid = new Set(Object.keys(PRECACHE).map(cacheKey));
+        return cache.keys().then(function (requests) {
+            return Promise.all(requests
+                .filter(function (req) { return !valid.has(req.url); })
+                .map(function (req) { return cache.delete(req); }));
+        });
+    }).then(function () {
+        return self.clients.claim();
+    }));
+});
+
+// プリキャッシュ対象はキャッシュ優先、それ以外はネットワーク
+self.addEventListener('fetch', function (event) {
+    if (event.request.method !== 'GET') {
+        return;
+    }
+    const path = precachePath(new URL(event.request.url));
+    if (!path) {
+        return;
+    }
+    event.respondWith(caches.open(CACHE_NAME).then(function (cache) {
+        return cache.match(cacheKey(path)).then(function (hit) {
+            return hit || fetch(event.request);
+        });
+    }));
+});
+"""
+
+
+def generate_service_worker(docs_dir, patterns=None):
+    """
+    プリキャッシュマニフェストとサービスワーカーを生成
+
+    Args:
+        docs_dir: 出力先（docs/）フォルダ
+        patterns: プリキャッシュ対象のglobパターン（省略時は既定値）
+
+    Returns:
+        プリキャッシュ対象のファイル数
+    """
+    docs_dir = Path(docs_dir)
+    manifest = build_precache_manifest(docs_dir, patterns or DEFAULT_PRECACHE_PATTERNS)
+
+    manifest_json = json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True)
+    write_if_changed(docs_dir / "precache-manifest.json", manifest_json)
+
+    # マニフェストを埋め込むので、内容が変わればサービスワーカー自体も変わり
+    # ブラウザが更新を検知する
+    script = (
+        SERVICE_WORKER_TEMPLATE
+        .replace("__CACHE_NAME__", CACHE_NAME)
+        .replace("__MANIFEST__", json.dumps(manifest, ensure_ascii=False, sort_keys=True))
+    )
+    write_if_changed(docs_dir / "sw.js", script)
+
+    return len(manifest)
+
+
+def build_precache_manifest(docs_dir, patterns):
+    """対象ファイルの {相対パス: 内容ハッシュ} を作成"""
+    manifest = {}
+    for pattern in patterns:
+        for path in docs_dir.glob(pattern):
+            if not path.is_file():
+                continue
+            relative = path.relative_to(docs_dir).as_posix()
+            manifest[relative] = file_hash(path)
+    return manifest
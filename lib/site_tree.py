@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+サイトツリー
+全Markdownのフロントマターを事前に読み込み、
+パンくず・子ページ一覧・前後ページのリンクを作成する
+
+フロントマターと各ページの描画キーはキャッシュに保存し、
+変更のないファイルは読み込みと再描画を省略する
+"""
+import json
+import hashlib
+import posixpath
+from pathlib import Path
+
+from lib.file_utils import write_if_changed
+
+# キャッシュ形式を変更した場合は番号を上げる
+CACHE_VERSION = 1
+
+# トップページ（content/ 外の既存ファイル）
+HOME = {"title": "ホーム", "url": "index.html", "description": ""}
+
+
+class SiteTree:
+    """content/ 全体のページ構成"""
+
+    def __init__(self, content_dir, cache_path=None):
+        """
+        Args:
+            content_dir: Markdownのフォルダ（content/）
+            cache_path: キャッシュファイルのパス（省略時はキャッシュしない）
+        """
+        self.content_dir = Path(content_dir)
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.pages = {}       # content/ からの相対パス → ページ情報
+        self.reused = 0       # キャッシュから読んだフロントマター数
+        self.removed = []     # 前回のビルド以降に削除されたページの出力パス
+        self._cached = {}
+        self._children = {}
+
+    def build(self, read_frontmatter):
+        """
+        全ページのフロントマターを読み込み、ツリーを作成
+
+        Args:
+            read_frontmatter: Markdownファイルのパスを受け取りフロントマターを返す関数
+        """
+        self._cached = self._load_cache()
+        self.pages = {}
+        self.reused = 0
+
+        for md_file in sorted(self.content_dir.rglob("*.md")):
+            relative = md_file.relative_to(self.content_dir).as_posix()
+            stat = md_file.stat()
+            cached = self._cached.get(relative)
+
+            if cached and cached["mtime"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+                frontmatter = cached["frontmatter"]
+                self.reused += 1
+            else:
+                frontmatter = read_frontmatter(md_file)
+
+            is_index = md_file.stem == "_index"
+            self.pages[relative] = {
+                "path": relative,
+                "url": _output_url(relative),
+                "section": posixpath.dirname(relative),
+                "is_index": is_index,
+                "title": str(frontmatter.get("title", md_file.stem)),
+                "description": str(frontmatter.get("description", "")),
+                "order": frontmatter.get("order"),
+                "mtime": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "frontmatter": frontmatter,
+                "render_key": cached.get("render_key") if cached else None,
+                "output": cached.get("output") if cached else None,
+                "variants": cached.get("variants", []) if cached else [],
+            }
+
+        # 削除されたページの出力のうち、現在のページが同じURLに出力するもの
+        # （guide/index.md を削除して guide/_index.md を使う場合等）は除く
+        current_urls = {page["url"] for page in self.pages.values()}
+        self.removed = sorted({
+            _output_url(relative) for relative in self._cached if relative not in self.pages
+        } - current_urls)
+
+        # 親ページごとの子ページ一覧
+        self._children = {}
+        for page in self.pages.values():
+            parent = self.parent(page)
+            if parent is not None:
+                self._children.setdefault(parent["path"], []).append(page)
+        for children in self._children.values():
+            children.sort(key=_sort_key)
+
+        return len(self.pages)
+
+    def parent(self, page):
+        """親ページ（セクションの _index.md。なければ上位セクション、最上位は None）"""
+        section = page["section"]
+        if page["is_index"]:
+            section = posixpath.dirname(section) if section else None
+        while section is not None:
+            index = self.pages.get(posixpath.join(section, "_index.md") if section else "_index.md")
+            if index is not None and index is not page:
+                return index
+            section = posixpath.dirname(section) if section else None
+        return None
+
+    def children(self, page):
+        """子ページ一覧（表示順）"""
+        return self._children.get(page["path"], [])
+
+    def neighbours(self, page):
+        """同じ親を持つページ内の前後ページ（索引ページは対象外）"""
+        parent = self.parent(page)
+        if page["is_index"] or parent is None:
+            return None, None
+        siblings = [p for p in self.children(parent) if not p["is_index"]]
+        position = siblings.index(page)
+        previous = siblings[position - 1] if position > 0 else None
+        following = siblings[position + 1] if position + 1 < len(siblings) else None
+        return previous, following
+
+    def navigation(self, relative):
+        """
+        ページのナビゲーション情報（リンクはページからの相対パス）
+
+        Returns:
+            {"breadcrumb": [...], "children": [...], "prev": ..., "next": ...}
+        """
+        page = self.pages[relative]
+        base = posixpath.dirname(page["url"]) or "."
+
+        def link(target):
+            if target is None:
+                return None
+            return {
+                "title": target["title"],
+                "description": target["description"],
+                "href": posixpath.relpath(target["url"], base),
+            }
+
+        ancestors = []
+        parent = self.parent(page)
+        while parent is not None:
+            ancestors.insert(0, parent)
+            parent = self.parent(parent)
+
+        previous, following = self.neighbours(page)
+        return {
+            "breadcrumb": [link(HOME)] + [link(p) for p in ancestors] + [{"title": page["title"]}],
+            "children": [link(p) for p in self.children(page)],
+            "prev": link(previous),
+            "next": link(following),
+        }
+
+    def is_fresh(self, relative, render_key, output_path):
+        """前回と同じ描画キーで出力済みか（出力ファイルが書き換えられていれば False）"""
+        page = self.pages[relative]
+        return (page["render_key"] == render_key
+                and page["output"] == _file_signature(output_path))
+
+    def mark_rendered(self, relative, render_key, output_path, variants=()):
+        """描画キー・出力ファイルの状態・使用した縮小版画像を記録"""
+        page = self.pages[relative]
+        page["render_key"] = render_key
+        page["output"] = _file_signature(output_path)
+        page["variants"] = sorted(variants)
+
+    def save(self):
+        """フロントマターと描画キーをキャッシュに保存"""
+        if not self.cache_path:
+            return
+        data = {
+            "version": CACHE_VERSION,
+            "pages": {
+                relative: {
+                    "mtime": page["mtime"],
+                    "size": page["size"],
+                    "frontmatter": page["frontmatter"],
+                    "render_key": page["render_key"],
+                    "output": page["output"],
+                    "variants": page["variants"],
+                }
+                for relative, page in self.pages.items()
+            },
+        }
+        write_if_changed(self.cache_path, json.dumps(data, ensure_ascii=False, indent=1, sort_keys=True))
+
+    def _load_cache(self):
+        if not self.cache_path or not self.cache_path.exists():
+            return {}
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if data.get("version") != CACHE_VERSION:
+            return {}
+        return data.get("pages", {})
+
+
+def render_key(*parts):
+    """ページの描画キー（入力のいずれかが変われば変わる）"""
+    data = json.dumps(parts, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def _output_url(relative):
+    """content/ からの相対パスを docs/ からの出力パスに変換"""
+    directory, filename = posixpath.split(relative)
+    if filename == "_index.md":
+        return posixpath.join(directory, "index.html")
+    return posixpath.join(directory, filename[:-len(".md")] + ".html")
+
+
+def _file_signature(path):
+    """ファイルの [更新日時, サイズ]（存在しなければ None）"""
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _sort_key(page):
+    """表示順（order → タイトル）"""
+    order = page["order"]
+    if not isinstance(order, int):
+        order = float("inf")
+    return (order, page["title"])
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+サイトマップ・robots.txt 生成
+出力HTMLの内容ハッシュをビルドマニフェストに記録し、
+内容が変わったページだけ lastmod を更新する
+"""
+import json
+from datetime import date
+from pathlib import Path, PurePosixPath
+from html import escape
+
+from lib.file_utils import write_if_changed, file_hash
+
+MANIFEST_NAME = "build-manifest.json"
+
+# サイトマップに含めないページ（遅延読み込み用の本文断片等）
+EXCLUDE_PATTERNS = ["**/fragments/*.html", "fragments/*.html"]
+
+# robots.txt の既定ルール（社内向けサイトのため一般のクローラーは拒否）
+DEFAULT_ROBOTS_RULES = "User-agent: *\nDisallow: /\n"
+
+
+def load_build_manifest(docs_dir):
+    """前回のビルドマニフェストを読み込む（{ページパス: {...}}）"""
+    manifest_path = Path(docs_dir) / MANIFEST_NAME
+    if not manifest_path.exists():
+        return {}
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f).get("pages", {})
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def update_build_manifest(docs_dir, previous=None, today=None, measure=None, needs_measure=None):
+    """
+    出力HTMLの内容ハッシュと最終更新日をビルドマニフェストに記録
+
+    前回のマニフェストとハッシュが同じページは前回の日付を引き継ぐ
+
+    Args:
+        previous: 前回のマニフェスト（省略時は docs/ から読み込む）
+        measure: ページの重量を計測する関数（結果は "weight" に記録）
+        needs_measure: 前回の "weight" を再計測すべきか判定する関数
+
+    Returns:
+        ({ページパス: {"hash": ..., "lastmod": ..., "weight": ...}}, 更新されたページ数)
+    """
+    docs_dir = Path(docs_dir)
+    manifest_path = docs_dir / MANIFEST_NAME
+    today = (today or date.today()).isoformat()
+
+    if previous is None:
+        previous = load_build_manifest(docs_dir)
+
+    pages = {}
+    changed = 0
+    for path in sorted(docs_dir.rglob("*.html")):
+        relative = path.relative_to(docs_dir).as_posix()
+        if any(PurePosixPath(relative).match(pattern) for pattern in EXCLUDE_PATTERNS):
+            continue
+
+        digest = file_hash(path, 16)
+        old = previous.get(relative)
+        if old and old.get("hash") == digest:
+            page = dict(old)
+        else:
+            page = {"hash": digest, "lastmod": today}
+            changed += 1
+
+        # 重量は内容が変わったページのみ計測（変わっていなければ前回の値を引き継ぐ）
+        if measure and ("weight" not in page or (needs_measure and needs_measure(page["weight"]))):
+            page["weight"] = measure(path)
+        pages[relative] = page
+
+    manifest = {"version": 1, "pages": pages}
+    write_if_changed(manifest_path, json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True))
+    return pages, changed
+
+
+def generate_sitemap(docs_dir, pages, base_url):
+    """sitemap.xml を出力（base_url はサイトの公開URL）"""
+    base_url = base_url.rstrip("/")
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
+    ]
+    for relative, page in sorted(pages.items()):
+        lines.append("  <url>")
+        lines.append(f"    <loc>{escape(f'{base_url}/{relative}', quote=False)}</loc>")
+        lines.append(f"    <lastmod>{page['lastmod']}</lastmod>")
+        lines.append("  </url>")
+    lines.append("</urlset>")
+
+    write_if_changed(Path(docs_dir) / "sitemap.xml", "\n".join(lines) + "\n")
+    return len(pages)
+
+
+def generate_robots(docs_dir, config=None, sitemap_url=None):
+    """
+    robots.txt を出力
+
+    Args:
+        config: site.json の "robots" 設定
+                {"allow": ["社内検索クローラーのUser-agent", ...]}
+        sitemap_url: サイトマップの公開URL（なければ Sitemap 行を出力しない）
+    """
+    config = config or {}
+    sections = [
+        f"User-agent: {agent}\nAllow: /\n"
+        for agent in config.get("allow", [])
+    ]
+    sections.append(DEFAULT_ROBOTS_RULES)
+    if sitemap_url:
+        sections.append(f"Sitemap: {sitemap_url}\n")
+
+    write_if_changed(Path(docs_dir) / "robots.txt", "\n".join(sections))
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+法令テキスト差分
+新旧2つの版の条文を条番号で突き合わせ、条・段落単位の差分を作成する
+"""
+import difflib
+from html import escape
+
+
+class StandardsDiff:
+    """条文リストの構造的な差分"""
+
+    def __init__(self, old_articles, new_articles, to_id):
+        """
+        Args:
+            old_articles: 旧版のパース結果（chapter / section / article のリスト）
+            new_articles: 新版のパース結果
+            to_id: 条番号をIDに変換する関数（例: 第37条の2 → "37_2"）
+        """
+        self.to_id = to_id
+        self.old = self._index(old_articles)
+        self.new = self._index(new_articles)
+        self.added = []
+        self.removed = []
+        self.changed = []
+        self.unchanged = 0
+
+    def compute(self):
+        """差分を計算する"""
+        for key, article in self.new.items():
+            old_article = self.old.get(key)
+            if old_article is None:
+                self.added.append(article)
+            elif self._same(old_article, article):
+                self.unchanged += 1
+            else:
+                self.changed.append((old_article, article))
+
+        for key, article in self.old.items():
+            if key not in self.new:
+                self.removed.append(article)
+
+        return self
+
+    def _index(self, articles):
+        """条文をIDで引ける辞書にする（同じ条番号が続く場合は連番を付ける）"""
+        index = {}
+        for item in articles:
+            if item['type'] != 'article':
+                continue
+            key = self.to_id(item['number'])
+            if key in index:
+                n = 2
+                while f"{key}#{n}" in index:
+                    n += 1
+                key = f"{key}#{n}"
+            index[key] = item
+        return index
+
+    def _same(self, old_article, new_article):
+        """条文が同一か判定（本文・見出し・所属章）"""
+        return (
+            old_article['content'] == new_article['content']
+            and old_article.get('title') == new_article.get('title')
+            and old_article.get('chapter') == new_article.get('chapter')
+        )
+
+    def paragraph_opcodes(self, old_article, new_article):
+        """段落単位の差分（difflib の opcodes）"""
+        old_lines = [line for line in old_article['content'] if line]
+        new_lines = [line for line in new_article['content'] if line]
+        matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            yield tag, old_lines[i1:i2], new_lines[j1:j2]
+
+    def render_html(self, title, old_label, new_label):
+        """差分をHTMLページとして出力"""
+        sections = []
+
+        summary = (
+            f'<p class="diff-summary">変更 {len(self.changed)} 条 ／ '
+            f'追加 {len(self.added)} 条 ／ 削除 {len(self.removed)} 条 ／ '
+            f'変更なし {self.unchanged} 条</p>'
+        )
+
+        if self.changed:
+            sections.append('<h2>変更された条文</h2>')
+            for old_article, new_article in self.changed:
+                sections.append(self._render_changed(old_article, new_article))
+
+        if self.added:
+            sections.append('<h2>追加された条文</h2>')
+            for article in self.added:
+                sections.append(self._render_whole(article, 'diff-added'))
+
+        if self.removed:
+            sections.append('<h2>削除された条文</h2>')
+            for article in self.removed:
+                sections.append(self._render_whole(article, 'diff-removed'))
+
+        body = '\n'.join(sections)
+
+        return f'''<!DOCTYPE html>
+<html lang="ja">
+
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <meta name="robots" content="noindex, nofollow">
+    <title>{escape(title)}</title>
+    <style>
+        body {{ font-family: sans-serif; line-height: 1.7; max-width: 960px; margin: 0 auto; padding: 16px; }}
+        .diff-article {{ border: 1px solid #ddd; border-radius: 6px; margin: 16px 0; padding: 8px 16px; }}
+        .diff-article h3 {{ margin: 8px 0; font-size: 1.05em; }}
+        .diff-meta {{ color: #666; font-size: 0.9em; }}
+        .diff-added {{ background: #e6ffec; }}
+        .diff-removed {{ background: #ffebe9; }}
+        p.diff-added::before {{ content: "+ "; color: #1a7f37; }}
+        p.diff-removed::before {{ content: "- "; color: #cf222e; }}
+        ins {{ background: #abf2bc; text-decoration: none; }}
+        del {{ background: #ffc1c0; }}
+    </style>
+</head>
+
+<body>
+    <h1>{escape(title)}</h1>
+    <p class="diff-meta">旧: {escape(old_label)}<br>新: {escape(new_label)}</p>
+    {summary}
+{body}
+</body>
+
+</html>
+'''
+
+    def _heading(self, article):
+        """条文見出し"""
+        title = f'（{article["title"]}）' if article.get('title') else ''
+        return f'{escape(article["number"])}{escape(title)}'
+
+    def _render_whole(self, article, css_class):
+        """追加・削除された条文全体"""
+        lines = '\n'.join(
+            f'<p class="{css_class}">{escape(line)}</p>'
+            for line in article['content'] if line
+        )
+        return f'''<div class="diff-article" id="article{self.to_id(article["number"])}">
+<h3>{self._heading(article)}</h3>
+{lines}
+</div>'''
+
+    def _render_changed(self, old_article, new_article):
+        """変更された条文（段落単位の差分、置換は文字単位で強調）"""
+        parts = []
+
+        if old_article.get('title') != new_article.get('title'):
+            parts.append(
+                f'<p class="diff-meta">見出し: {escape(old_article.get("title") or "")}'
+                f' → {escape(new_article.get("title") or "")}</p>'
+            )
+        if old_article.get('chapter') != new_article.get('chapter'):
+            parts.append(
+                f'<p class="diff-meta">所属: {escape(old_article.get("chapter") or "")}'
+                f' → {escape(new_article.get("chapter") or "")}</p>'
+            )
+
+        for tag, old_lines, new_lines in self.paragraph_opcodes(old_article, new_article):
+            if tag == 'equal':
+                continue
+            if tag == 'replace' and len(old_lines) == len(new_lines):
+                for old_line, new_line in zip(old_lines, new_lines):
+                    parts.append(f'<p>{_inline_diff(old_line, new_line)}</p>')
+                continue
+            for line in old_lines:
+                parts.append(f'<p class="diff-removed">{escape(line)}</p>')
+            for line in new_lines:
+                parts.append(f'<p class="diff-added">{escape(line)}</p>')
+
+        return f'''<div class="diff-article" id="article{self.to_id(new_article["number"])}">
+<h3>{self._heading(new_article)}</h3>
+{chr(10).join(parts)}
+</div>'''
+
+
+def _inline_diff(old_line, new_line):
+    """1段落内の文字単位の差分を <del>/<ins> で表現"""
+    matcher = difflib.SequenceMatcher(None, old_line, new_line, autojunk=False)
+    html = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            html.append(escape(old_line[i1:i2]))
+            continue
+        if i2 > i1:
+            html.append(f'<del>{escape(old_line[i1:i2])}</del>')
+        if j2 > j1:
+            html.append(f'<ins>{escape(new_line[j1:j2])}</ins>')
+    return ''.join(html)
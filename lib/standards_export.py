@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+法令データ JSONエクスポート
+解析済みの条文を章ごとのJSONファイルとマニフェストに書き出す
+"""
+import re
+import json
+import hashlib
+from pathlib import Path
+
+from lib.file_utils import write_if_changed
+
+# JSONの構造を変更した場合は番号を上げる
+EXPORT_VERSION = 2
+
+# 章ごとのJSONのファイル名
+_SHARD_PATTERN = re.compile(r"^chapter[0-9_]+\.json$")
+
+
+def export_articles(articles, output_dir, law_name, to_id, to_blocks=None):
+    """
+    条文リストを章ごとのJSONに分割して書き出す
+
+    Args:
+        articles: パーサーが返す要素リスト（chapter / section / article）
+        output_dir: 出力先フォルダ
+        law_name: 法令名（マニフェストに記録）
+        to_id: 章番号・条番号を数値IDに変換する関数（例: 第37条の2 → "37_2"）
+        to_blocks: 条文内容を (段落リスト, 表リスト) に分ける関数
+                   省略時は全行を段落として扱う
+
+    Returns:
+        書き出した条文数
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    shards = split_by_chapter(articles, to_id, to_blocks)
+
+    manifest_chapters = []
+    article_count = 0
+
+    for shard in shards:
+        filename = f"chapter{shard['chapter']['id']}.json"
+        data = json.dumps(shard, ensure_ascii=False, separators=(",", ":"))
+        write_if_changed(output_dir / filename, data)
+
+        article_ids = [a["id"] for a in shard["articles"]]
+        article_count += len(article_ids)
+        manifest_chapters.append({
+            **shard["chapter"],
+            "file": filename,
+            "article_count": len(article_ids),
+            "articles": article_ids,
+            "sha256": hashlib.sha256(data.encode("utf-8")).hexdigest(),
+        })
+
+    # 以前のビルドで書き出した章（削除・番号変更された章）のJSONを削除
+    written = {chapter["file"] for chapter in manifest_chapters}
+    for old in output_dir.iterdir():
+        if old.name not in written and _SHARD_PATTERN.match(old.name):
+            old.unlink()
+
+    manifest = {
+        "version": EXPORT_VERSION,
+        "law": law_name,
+        "article_count": article_count,
+        "chapters": manifest_chapters,
+    }
+    write_if_changed(
+        output_dir / "manifest.json",
+        json.dumps(manifest, ensure_ascii=False, indent=2)
+    )
+
+    return article_count
+
+
+def split_by_chapter(articles, to_id, to_blocks):
+    """
+    要素リストを章単位のシャードに分ける（同じ章は1つにまとめる）
+
+    条の "id" は法令内で一意にする。附則の「第一条」のように同じ条番号が再び現れた場合は
+    2件目以降を "1#2", "1#3" …とする（lib.standards_diff と同じ形式）。
+    HTMLのアンカーは条番号だけで決まるため、リンク先は "anchor" を使う
+    """
+    shards = {}
+    current = None
+    occurrences = {}   # 条ID → 出現回数
+
+    for item in articles:
+        if item['type'] == 'chapter':
+            chapter_id = to_id(item['number'])
+            if chapter_id not in shards:
+                shards[chapter_id] = {
+                    "chapter": {
+                        "id": chapter_id,
+                        "number": item['number'],
+                        "title": item['title'],
+                    },
+                    "sections": [],
+                    "articles": [],
+                }
+            current = shards[chapter_id]
+            continue
+
+        if current is None:
+            # 章より前の要素は "0" 章として扱う
+            current = shards.setdefault("0", {
+                "chapter": {"id": "0", "number": None, "title": None},
+                "sections": [],
+                "articles": [],
+            })
+
+        if item['type'] == 'section':
+            current["sections"].append({
+                "id": f"{current['chapter']['id']}_{to_id(item['number'])}",
+                "number": item['number'],
+                "title": item['title'],
+            })
+
+        elif item['type'] == 'article':
+            if to_blocks:
+                paragraphs, tables = to_blocks(item['content'])
+            else:
+                paragraphs, tables = list(item['content']), []
+
+            anchor = to_id(item['number'])
+            occurrences[anchor] = occurrences.get(anchor, 0) + 1
+            count = occurrences[anchor]
+
+            current["articles"].append({
+                "number": item['number'],
+                "id": anchor if count == 1 else f"{anchor}#{count}",
+                "anchor": anchor,
+                "title": item.get('title'),
+                "chapter": item.get('chapter'),
+                "section": item.get('section'),
+                "paragraphs": paragraphs,
+                "tables": tables,
+            })
+
+    ordered = sorted(shards.values(), key=lambda s: _id_sort_key(s["chapter"]["id"]))
+    return [shard for shard in ordered if shard["articles"]]
+
+
+def _id_sort_key(item_id):
+    """"37_2" 形式のIDを数値順に並べるためのキー"""
+    return [int(part) if part.isdigit() else 0 for part in item_id.split("_")]
@@ -6,18 +6,16 @@
 import re
 from pathlib import Path
 
+from lib.numbering import NUMBER, article_id, read_text
+from lib.standards_export import export_articles
+from lib.standards_toc import build_toc
+
 
 class StandardsParser:
     """法令テキストパーサー"""
     
-    def __init__(self):
-        self.kanji_nums = {
-            '一': 1, '二': 2, '三': 3, '四': 4, '五': 5,
-            '六': 6, '七': 7, '八': 8, '九': 9, '十': 10,
-            '百': 100
-        }
-    
-    def generate(self, txt_files, output_path, template_engine, auto_linker, site_config):
+    def generate(self, txt_files, output_path, template_engine, auto_linker, site_config,
+                 articles=None, cross_ref=None):
         """
         テキストファイルからHTMLを生成
         
@@ -27,24 +25,34 @@ class StandardsParser:
             template_engine: テンプレートエンジン
             auto_linker: 自動リンカー
             site_config: サイト設定
+            articles: 解析済みの条文リスト（省略時はテキストを読み込んで解析）
+            cross_ref: 条文引用をリンクに変換する CrossReferenceResolver
         
         Returns:
             生成した条文数
         """
-        # 全テキストを読み込み
-        full_text = self._read_all_files(txt_files)
-        
-        # 条文を解析
-        articles = self._parse_articles(full_text)
+        # 全テキストを読み込んで条文を解析
+        if articles is None:
+            articles = self.parse(txt_files)
         
         # 条文数をカウント
         article_count = len([a for a in articles if a['type'] == 'article'])
         
         # HTMLを生成
-        html_content = self._generate_html(articles, auto_linker, str(output_path))
+        html_content = self._generate_html(
+            articles, template_engine, auto_linker, str(output_path), cross_ref
+        )
+        
+        toc, toc_data = build_toc(self._generate_toc(articles))
         
-        # テンプレートなしで直接出力（既存形式を維持）
-        final_html = self._wrap_in_template(html_content, articles, site_config)
+        final_html = template_engine.render("standards", {
+            "page_title": "電気設備技術基準",
+            "page_description": "電気設備の技術的要件を定めた経済産業省令（平成九年通商産業省令第五十二号）",
+            "toc": toc,
+            "toc_data": toc_data,
+            "articles_html": html_content,
+            "depth": 1,
+        })
         
         # ファイル出力
         output_path = Path(output_path)
@@ -53,53 +61,41 @@ class StandardsParser:
         with open(output_path, "w", encoding="utf-8") as f:
             f.write(final_html)
         
+        # 外部ツール向けJSONを出力
+        self.export_json(articles, output_path.parent / "json")
+        
         return article_count
     
+    def export_json(self, articles, output_dir):
+        """条文を章ごとのJSONとマニフェストに書き出す"""
+        return export_articles(
+            articles,
+            output_dir,
+            "電気設備技術基準",
+            article_id
+        )
+    
+    @staticmethod
+    def article_id(number):
+        """条番号をアンカーID用の数値に変換（第十五条の二 → "15_2"、lib.numbering と共通）"""
+        return article_id(number)
+    
+    def parse(self, txt_files):
+        """テキストファイルを読み込んで条文リストを返す"""
+        return self._parse_articles(self._read_all_files(txt_files))
+    
     def _read_all_files(self, txt_files):
-        """複数のテキストファイルを結合して読み込む"""
+        """複数のテキストファイルを結合して読み込む（文字コード判定・全角数字の正規化を含む）"""
         contents = []
         
         for txt_file in sorted(txt_files):
             try:
-                with open(txt_file, "r", encoding="utf-8-sig") as f:
-                    contents.append(f.read())
+                contents.append(read_text(txt_file))
             except Exception as e:
                 print(f"[警告] {txt_file}: 読み込みエラー（{e}）")
         
         return "\n".join(contents)
     
-    def _kanji_to_number(self, kanji):
-        """漢数字を数字に変換"""
-        # 第X条の二のパターン
-        if 'の二' in kanji:
-            base = kanji.replace('第', '').replace('条の二', '')
-            return str(self._kanji_to_number('第' + base + '条')) + '_2'
-        
-        # 第X条のパターン
-        num_part = kanji.replace('第', '').replace('条', '').replace('章', '')
-        
-        result = 0
-        current = 0
-        
-        for char in num_part:
-            if char == '十':
-                if current == 0:
-                    current = 1
-                result += current * 10
-                current = 0
-            elif char == '百':
-                if current == 0:
-                    current = 1
-                result += current * 100
-                current = 0
-            elif char in self.kanji_nums:
-                current = self.kanji_nums[char]
-            else:
-                current = 0
-        
-        result += current
-        return str(result)
-    
     def _parse_articles(self, text):
         """条文を解析してリストを返す"""
         articles = []
@@ -135,9 +131,7 @@ class StandardsParser:
                 continue
             
             # 節・款をスキップ
-            if re.match(r'^第[一二三四五六七八九十]+節', line):
-                continue
-            if re.match(r'^第[一二三四五六七八九十]+款', line):
+            if re.match(rf'^第(?:{NUMBER})[節款]', line):
                 continue
             
             # 法令名や制定文をスキップ
@@ -147,7 +141,7 @@ class StandardsParser:
                 continue
             
             # 章の検出
-            chapter_match = re.match(r'^(第[一二三]章)\s+(.+)$', line)
+            chapter_match = re.match(rf'^(第(?:{NUMBER})章)\s+(.+)$', line)
             if chapter_match:
                 # 前の条文を保存
                 if current_article and current_content:
@@ -188,7 +182,7 @@ class StandardsParser:
                 continue
             
             # 条文番号の検出
-            article_match = re.match(r'^(第[一二三四五六七八九十百]+条(?:の二)?)\s+(.+)$', line)
+            article_match = re.match(rf'^(第(?:{NUMBER})条(?:の(?:{NUMBER}))*)\s+(.+)$', line)
             if article_match:
                 # 前の条文を保存
                 if current_article and current_content:
@@ -219,42 +213,38 @@ class StandardsParser:
         
         return articles
     
-    def _generate_html(self, articles, auto_linker, current_page):
+    def _generate_html(self, articles, template_engine, auto_linker, current_page, cross_ref=None):
         """条文HTMLを生成"""
-        content_html = []
+        items = []
         
         for item in articles:
+            num = article_id(item['number'])
+            
             if item['type'] == 'chapter':
-                num = self._kanji_to_number(item['number'])
-                content_html.append(f'''
-                <!-- {item["number"]} -->
-                <article class="article" id="chapter{num}">
-                    <h2 class="chapter-title">{item["number"]} {item["title"]}</h2>
-                </article>''')
+                items.append({
+                    'type': 'chapter',
+                    'id': f'chapter{num}',
+                    'number': item['number'],
+                    'title': item['title'],
+                })
             
             elif item['type'] == 'article':
-                num = self._kanji_to_number(item['number'])
-                article_id = f'article{num}'
-                
                 # 内容をパラグラフに変換
                 paragraphs = []
                 for line in item['content']:
                     escaped = line.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+                    if cross_ref:
+                        escaped = cross_ref.apply(escaped, 'shorei')
                     paragraphs.append(f'                        <p>{escaped}</p>')
                 
-                content_str = '\n'.join(paragraphs)
-                
-                content_html.append(f'''
-                <article class="article" id="{article_id}">
-                    <h3 class="article-title">
-                        <a href="../coming-soon.html">{item["number"]}（{item["title"]}）</a>
-                    </h3>
-                    <div class="article-content">
-{content_str}
-                    </div>
-                </article>''')
+                items.append({
+                    'type': 'article',
+                    'id': f'article{num}',
+                    'heading': f'{item["number"]}（{item["title"]}）',
+                    'body': '\n'.join(paragraphs),
+                })
         
-        html = ''.join(content_html)
+        html = template_engine.render('partials/standards_articles', {'articles': items, 'depth': 1})
         
         # 自動リンク適用
         if auto_linker:
@@ -263,82 +253,17 @@ class StandardsParser:
         return html
     
     def _generate_toc(self, articles):
-        """目次HTMLを生成"""
-        sidebar_html = []
+        """目次の項目リストを生成（章見出しと条へのリンク。章単位へのまとめは build_toc で行う）"""
+        toc = []
         
         for item in articles:
             if item['type'] == 'chapter':
-                sidebar_html.append(
-                    f'                    <li class="sidebar-chapter">{item["number"]} {item["title"]}</li>'
-                )
+                toc.append({'label': f'{item["number"]} {item["title"]}'})
             elif item['type'] == 'article':
-                num = self._kanji_to_number(item['number'])
-                article_id = f'article{num}'
-                sidebar_html.append(
-                    f'                    <li><a href="#{article_id}">{item["number"]} {item["title"]}</a></li>'
-                )
-        
-        return '\n'.join(sidebar_html)
-    
-    def _wrap_in_template(self, content, articles, site_config):
-        """完全なHTMLを生成"""
-        toc = self._generate_toc(articles)
-        site_name = site_config.get("site_name", "ほあんペディア")
+                num = article_id(item['number'])
+                toc.append({
+                    'href': f'#article{num}',
+                    'label': f'{item["number"]} {item["title"]}',
+                })
         
-        return f'''<!DOCTYPE html>
-<html lang="ja">
-
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <meta name="robots" content="noindex, nofollow">
-    <title>電気設備技術基準 - {site_name}</title>
-    <meta name="description" content="電気設備の技術的要件を定めた経済産業省令（平成九年通商産業省令第五十二号）">
-    <link rel="stylesheet" href="../css/style.css">
-</head>
-
-<body>
-    <!-- 共通ヘッダー -->
-    <header class="site-header">
-        <a href="../index.html">
-            <span class="home-icon">🏠</span>
-            <span>{site_name}</span>
-        </a>
-    </header>
-
-    <!-- メインコンテンツ -->
-    <main class="main-content">
-        <h1 class="page-title">電気設備技術基準</h1>
-
-        <div class="two-column-layout">
-            <!-- 左カラム：目次 -->
-            <aside class="sidebar">
-                <h2 class="sidebar-title">目次</h2>
-                <ul class="sidebar-list">
-{toc}
-                </ul>
-            </aside>
-
-            <!-- 右カラム：条文本文 -->
-            <div class="content-area">
-{content}
-            </div>
-        </div>
-    </main>
-
-    <!-- スクロール機能 -->
-    <script>
-        document.querySelectorAll('.sidebar-list a').forEach(link => {{
-            link.addEventListener('click', function (e) {{
-                e.preventDefault();
-                const targetId = this.getAttribute('href').substring(1);
-                const targetElement = document.getElementById(targetId);
-                if (targetElement) {{
-                    targetElement.scrollIntoView({{ behavior: 'smooth', block: 'start' }});
-                }}
-            }});
-        }});
-    </script>
-</body>
-
-</html>'''
+        return toc
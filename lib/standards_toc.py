@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+法令ページの目次
+サイドバーには章の見出しだけを出力し、章ごとの条・節の一覧は
+ページに埋め込んだJSONからクリック時に展開する
+"""
+import json
+
+
+def build_toc(entries):
+    """
+    目次の項目リストを章単位にまとめる
+
+    Args:
+        entries: [{"label": 章見出し} または {"href": "#article1", "label": 条見出し}, ...]
+                 （章見出しの後に続くリンクがその章の項目）
+
+    Returns:
+        (サイドバーの項目リスト, 章ごとの項目JSON)
+        サイドバーの項目は {"label", "key"}（展開できる章）・{"label"}（項目のない章）・
+        {"label", "href"}（最初の章より前のリンク）のいずれか
+    """
+    toc = []
+    groups = {}
+    chapter = None
+    chapters = 0
+
+    for entry in entries:
+        if entry.get("href"):
+            if chapter is None:
+                toc.append(entry)
+            else:
+                groups.setdefault(chapter["key"], []).append([entry["href"], entry["label"]])
+        else:
+            chapter = {"label": entry["label"], "key": str(chapters)}
+            toc.append(chapter)
+            chapters += 1
+
+    # 項目のない章は展開ボタンを出さない
+    for item in toc:
+        if "key" in item and item["key"] not in groups:
+            del item["key"]
+
+    return toc, toc_json(groups)
+
+
+def toc_json(groups):
+    """<script type="application/json"> に埋め込むJSON（"</script>" で終わらないよう "<" をエスケープ）"""
+    data = json.dumps(groups, ensure_ascii=False, separators=(",", ":"))
+    return data.replace("<", "\\u003c")
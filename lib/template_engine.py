@@ -2,12 +2,50 @@
 """
 テンプレートエンジン
 HTMLテンプレートの変数置換とレンダリングを担当
+
+記法:
+    {{変数名}} / {{item.title}}        変数（辞書のキー・属性をたどる）
+    {{for item in items}}...{{endfor}}  繰り返し
+    {{if 条件}}...{{elif 条件}}...{{else}}...{{endif}}
+                                        条件分岐（条件: x / not x / x == "値" / x != "値"）
+    {{include partials/toc}}            部分テンプレートの埋め込み
+    {{extends base.html}}               継承（子の {{block 名前}}...{{endblock}} で親の同名ブロックを置換）
+
+テンプレートは初回のレンダリング時にPython関数へ変換し、以降は変換済みの関数を再利用する
 """
 import os
 import re
+import ast
+import json
+import hashlib
 from pathlib import Path
 from datetime import datetime
 
+# クリティカルCSSの差し込み位置（描画後にページで使われるルールで置換）
+_CRITICAL_CSS_MARKER = "\x00critical-css\x00"
+
+# {{...}} タグ
+_TAG_PATTERN = re.compile(r'\{\{\s*(.*?)\s*\}\}')
+
+# 1行に制御タグだけがある場合は、その行のインデントと改行を出力しない
+_STANDALONE_PATTERN = re.compile(
+    r'^[ \t]*(\{\{\s*(?:for|endfor|if|elif|else|endif|include)\b[^}]*\}\})[ \t]*\r?\n',
+    re.MULTILINE
+)
+
+# 継承の親側ブロック（{{block 名前}}既定値{{endblock}}）
+_PARENT_BLOCK_PATTERN = re.compile(
+    r'^([ \t]*)\{\{block\s+(\w+)\}\}(.*?)\{\{endblock\}\}[ \t]*\n?',
+    re.MULTILINE | re.DOTALL
+)
+
+_PATH_PATTERN = re.compile(r'^[A-Za-z_]\w*(?:\.\w+)*$')
+_FOR_PATTERN = re.compile(r'^for\s+([A-Za-z_]\w*)\s+in\s+(\S+)$')
+_CONDITION_PATTERN = re.compile(
+    r'''^(not\s+)?(\S+?)(?:\s*(==|!=)\s*("[^"]*"|'[^']*'|-?\d+))?$'''
+)
+_INCLUDE_PATTERN = re.compile(r'^include\s+([\w/-]+)(?:\.html)?$')
+
 
 class TemplateEngine:
     """シンプルなテンプレートエンジン"""
@@ -16,19 +54,64 @@ class TemplateEngine:
         self.templates_dir = Path(templates_dir)
         self.site_config = site_config or {}
         self.templates = {}
+        self.asset_map = {}
+        self.stylesheet = ""
+        self._critical_css = None
+        self._compiled = {}
     
     def load_all(self):
-        """全テンプレートを読み込む"""
+        """全テンプレートを読み込む（サブフォルダは "partials/toc" のような名前で登録）"""
+        self._compiled = {}
+        
         if not self.templates_dir.exists():
             return 0
         
-        for html_file in self.templates_dir.glob("*.html"):
-            template_name = html_file.stem
+        for html_file in self.templates_dir.rglob("*.html"):
+            template_name = html_file.relative_to(self.templates_dir).with_suffix("").as_posix()
             with open(html_file, "r", encoding="utf-8") as f:
                 self.templates[template_name] = f.read()
         
         return len(self.templates)
     
+    def set_assets(self, asset_map):
+        """フィンガープリント付きアセットの対応表を設定（{元のパス: ハッシュ付きパス}）"""
+        self.asset_map = dict(asset_map or {})
+    
+    def set_stylesheet(self, css_text):
+        """
+        クリティカルCSSの抽出元を設定
+        
+        設定するとテンプレートの {{critical_css}} に、描画したページで使われるルールだけが入る
+        （スタイルシートの解析は最初にページを描画するときに行う）
+        """
+        if (css_text or "") == self.stylesheet:
+            # 同じスタイルシートなら抽出結果のキャッシュを保持（常駐ビルドで再利用）
+            return
+        self.stylesheet = css_text or ""
+        self._critical_css = None
+    
+    @property
+    def critical_css(self):
+        """クリティカルCSSの抽出器（スタイルシート未設定なら None）"""
+        if self._critical_css is None and self.stylesheet:
+            from lib.critical_css import CriticalCSS
+            self._critical_css = CriticalCSS(self.stylesheet)
+        return self._critical_css
+    
+    def asset_path(self, path, depth=0):
+        """アセットの相対パスを取得（ハッシュ付きがあればそちらを使用）"""
+        prefix = "../" * depth if depth > 0 else ""
+        return prefix + self.asset_map.get(path, path)
+    
+    def version(self):
+        """テンプレート・アセット・サイト設定のハッシュ（描画結果のキャッシュキーに使用）"""
+        data = json.dumps(
+            [self.templates, self.asset_map, self.site_config, self.stylesheet, datetime.now().year],
+            ensure_ascii=False,
+            sort_keys=True
+        )
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+    
     def render(self, template_name, context=None):
         """テンプレートをレンダリング"""
         context = context or {}
@@ -41,15 +124,53 @@ class TemplateEngine:
                 # テンプレートがない場合はコンテンツをそのまま返す
                 return context.get("content", "")
         
-        template = self.templates[template_name]
+        html = self._get_compiled(template_name)(self._build_context(context), self._include)
         
-        # テンプレート継承の処理
-        template = self._process_extends(template)
+        if self.stylesheet and _CRITICAL_CSS_MARKER in html:
+            html = html.replace(_CRITICAL_CSS_MARKER, self.critical_css.extract(html))
+        return html
+    
+    def _build_context(self, context):
+        """サイト設定・コンテキスト・パス変数をまとめる"""
+        # サイト設定の変数
+        site_vars = {
+            "site_name": self.site_config.get("site_name", "ほあんペディア"),
+            "site_description": self.site_config.get("description", ""),
+            "current_year": str(datetime.now().year),
+        }
         
-        # 変数を展開
-        html = self._replace_variables(template, context)
+        # 特殊パス変数（出力ページの深さから決まるため、コンテキストより優先）
+        depth = context.get("depth", 0)
+        prefix = "../" * depth if depth > 0 else ""
+        path_vars = {
+            "css_path": self.asset_path("css/style.css", depth),
+            "home_path": f"{prefix}index.html",
+            "root_path": prefix,
+            # ページで使われるCSSルール（set_stylesheet() で有効化）
+            "critical_css": _CRITICAL_CSS_MARKER if self.stylesheet else "",
+            # フィンガープリント付きアセット（{{assets.js_glossary_js}} のように参照）
+            "assets": {
+                re.sub(r"\W", "_", path): self.asset_path(path, depth)
+                for path in self.asset_map
+            },
+        }
         
-        return html
+        return {**site_vars, **context, **path_vars}
+    
+    def _include(self, template_name, context):
+        """部分テンプレートをレンダリング（{{include}} から呼ばれる）"""
+        if template_name not in self.templates:
+            raise ValueError(f"部分テンプレート {template_name}.html が見つかりません")
+        return self._get_compiled(template_name)(context, self._include)
+    
+    def _get_compiled(self, template_name):
+        """変換済みのテンプレート関数を取得（未変換なら変換してキャッシュ）"""
+        func = self._compiled.get(template_name)
+        if func is None:
+            template = self._process_extends(self.templates[template_name])
+            func = _compile_template(template, template_name)
+            self._compiled[template_name] = func
+        return func
     
     def _process_extends(self, template):
         """テンプレート継承を処理"""
@@ -57,7 +178,7 @@ class TemplateEngine:
         extends_match = re.search(r'\{\{extends\s+(\w+)\.html\}\}', template)
         
         if not extends_match:
-            return template
+            return self._fill_blocks(template, {})
         
         parent_name = extends_match.group(1)
         
@@ -67,56 +188,148 @@ class TemplateEngine:
         
         parent_template = self.templates[parent_name]
         
-        # {{block content}}...{{endblock}} を抽出
-        block_match = re.search(
-            r'\{\{block\s+content\}\}(.*?)\{\{endblock\}\}',
-            template,
-            re.DOTALL
-        )
-        
-        if block_match:
-            block_content = block_match.group(1).strip()
-            # 親テンプレートの {{content}} を置換
-            return parent_template.replace("{{content}}", block_content)
-        
-        return parent_template
-    
-    def _replace_variables(self, template, context):
-        """テンプレート変数を置換"""
-        # サイト設定の変数
-        site_vars = {
-            "site_name": self.site_config.get("site_name", "ほあんペディア"),
-            "site_description": self.site_config.get("description", ""),
-            "current_year": str(datetime.now().year),
+        # {{block 名前}}...{{endblock}} を抽出
+        blocks = {
+            match.group(1): match.group(2).strip()
+            for match in re.finditer(
+                r'\{\{block\s+(\w+)\}\}(.*?)\{\{endblock\}\}',
+                template,
+                re.DOTALL
+            )
         }
         
-        # コンテキスト変数とマージ
-        all_vars = {**site_vars, **context}
-        
-        # 特殊パス変数は後で処理するのでスキップ
-        special_vars = {"css_path", "home_path"}
-        
-        # {{変数名}} パターンを置換
-        def replace_var(match):
-            var_name = match.group(1).strip()
-            if var_name in special_vars:
-                return match.group(0)  # そのまま残す
-            return str(all_vars.get(var_name, ""))
-        
-        result = re.sub(r'\{\{(\w+)\}\}', replace_var, template)
+        # 親テンプレートの {{content}} を置換
+        if "content" in blocks:
+            parent_template = parent_template.replace("{{content}}", blocks["content"])
         
-        # CSSパスの自動調整（特殊変数を処理）
-        result = self._adjust_paths(result, context)
-        
-        return result
+        return self._fill_blocks(parent_template, blocks)
     
-    def _adjust_paths(self, html, context):
-        """相対パスを調整"""
-        # {{css_path}} を適切な相対パスに置換
-        depth = context.get("depth", 0)
-        prefix = "../" * depth if depth > 0 else ""
+    def _fill_blocks(self, template, blocks):
+        """親テンプレートのブロックを子の内容（なければ既定値）で置換"""
+        def replace_block(match):
+            name = match.group(2)
+            value = blocks.get(name, match.group(3)).strip()
+            return f"{value}\n" if value else ""
         
-        html = html.replace("{{css_path}}", f"{prefix}css/style.css")
-        html = html.replace("{{home_path}}", f"{prefix}index.html")
+        return _PARENT_BLOCK_PATTERN.sub(replace_block, template)
+
+
+def _compile_template(template, template_name):
+    """テンプレートをPython関数に変換"""
+    source = _STANDALONE_PATTERN.sub(r'\1', template)
+    
+    lines = [
+        "def _render(ctx, _include):",
+        "    _out = []",
+        "    _w = _out.append",
+    ]
+    indent = 1
+    loop_vars = []    # [(テンプレート上の変数名, Python変数名)]
+    blocks = []       # 開いている制御ブロック（"for" / "if"）
+    
+    def emit(code):
+        lines.append("    " * indent + code)
+    
+    def error(message):
+        return ValueError(f"テンプレート {template_name}.html: {message}")
+    
+    def expression(path):
+        """変数パスをPython式に変換"""
+        if not _PATH_PATTERN.match(path):
+            raise error(f"変数名が不正です（{path}）")
+        head, *attrs = path.split(".")
+        expr = dict(loop_vars).get(head) or f"ctx.get({head!r})"
+        for attr in attrs:
+            expr = f"_attr({expr}, {attr!r})"
+        return expr
+    
+    def condition(text):
+        match = _CONDITION_PATTERN.match(text)
+        if not match:
+            raise error(f"条件式が不正です（{text}）")
+        negate, path, operator, literal = match.groups()
+        expr = expression(path)
+        if operator:
+            expr = f"{expr} {operator} {ast.literal_eval(literal)!r}"
+        return f"not ({expr})" if negate else expr
+    
+    def local_context():
+        """部分テンプレートに渡すコンテキスト（ループ変数を含める）"""
+        if not loop_vars:
+            return "ctx"
+        items = ", ".join(f"{name!r}: {var}" for name, var in loop_vars)
+        return f"{{**ctx, {items}}}"
+    
+    position = 0
+    for match in _TAG_PATTERN.finditer(source):
+        if match.start() > position:
+            emit(f"_w({source[position:match.start()]!r})")
+        position = match.end()
+        tag = match.group(1)
+        keyword = tag.split(None, 1)[0] if tag else ""
         
-        return html
+        if keyword == "for":
+            for_match = _FOR_PATTERN.match(tag)
+            if not for_match:
+                raise error(f"for 文が不正です（{tag}）")
+            var = f"_v{len(lines)}"
+            emit(f"for {var} in {expression(for_match.group(2))} or ():")
+            loop_vars.append((for_match.group(1), var))
+            blocks.append("for")
+            indent += 1
+            emit("pass")
+        elif keyword == "endfor":
+            if not blocks or blocks.pop() != "for":
+                raise error("対応する for がない endfor があります")
+            loop_vars.pop()
+            indent -= 1
+        elif keyword == "if":
+            emit(f"if {condition(tag[2:].strip())}:")
+            blocks.append("if")
+            indent += 1
+            emit("pass")
+        elif keyword in ("elif", "else"):
+            if not blocks or blocks[-1] != "if":
+                raise error(f"対応する if がない {keyword} があります")
+            indent -= 1
+            if keyword == "elif":
+                emit(f"elif {condition(tag[4:].strip())}:")
+            else:
+                emit("else:")
+            indent += 1
+            emit("pass")
+        elif keyword == "endif":
+            if not blocks or blocks.pop() != "if":
+                raise error("対応する if がない endif があります")
+            indent -= 1
+        elif keyword == "include":
+            include_match = _INCLUDE_PATTERN.match(tag)
+            if not include_match:
+                raise error(f"include が不正です（{tag}）")
+            emit(f"_w(_include({include_match.group(1)!r}, {local_context()}))")
+        elif _PATH_PATTERN.match(tag):
+            emit(f"_w(_str({expression(tag)}))")
+        else:
+            # 未知のタグはそのまま出力
+            emit(f"_w({match.group(0)!r})")
+    
+    if position < len(source):
+        emit(f"_w({source[position:]!r})")
+    if blocks:
+        raise error(f"{blocks[-1]} が閉じられていません")
+    lines.append("    return ''.join(_out)")
+    
+    namespace = {"_attr": _attr, "_str": _str}
+    exec(compile("\n".join(lines), f"<template {template_name}>", "exec"), namespace)
+    return namespace["_render"]
+
+
+def _attr(value, name):
+    """辞書のキーまたは属性を取得"""
+    if isinstance(value, dict):
+        return value.get(name)
+    return getattr(value, name, None)
+
+
+def _str(value):
+    return "" if value is None else str(value)
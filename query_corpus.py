@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+条文・ページ検索ツール
+build.py が出力した corpus.sqlite を全文検索する（オフラインで使用可能）
+
+使い方:
+    python query_corpus.py 接地抵抗
+    python query_corpus.py 接地 --kind article -n 50
+    python query_corpus.py --sql "SELECT number, title FROM articles WHERE law = 'kaishaku' AND chapter_id = '2'"
+"""
+import sys
+import time
+import sqlite3
+import argparse
+from pathlib import Path
+
+from lib.corpus_db import search
+
+DEFAULT_DB = Path(__file__).parent / 'corpus.sqlite'
+
+KIND_LABELS = {
+    'article': '条文',
+    'table': '表',
+    'page': 'ページ',
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='条文・表・ページの全文検索')
+    parser.add_argument('text', nargs='?', help='検索語（3文字未満は部分一致で検索）')
+    parser.add_argument('--db', default=str(DEFAULT_DB), help='データベースのパス')
+    parser.add_argument('--kind', choices=sorted(KIND_LABELS), help='検索対象を絞り込む')
+    parser.add_argument('-n', '--limit', type=int, default=20, help='表示件数（既定: 20）')
+    parser.add_argument('--sql', help='任意のSQLを実行して結果をタブ区切りで表示')
+    args = parser.parse_args()
+
+    if not Path(args.db).exists():
+        print(f'エラー: {args.db} が見つかりません（先に build.py を実行してください）')
+        sys.exit(1)
+    if not args.text and not args.sql:
+        parser.error('検索語または --sql を指定してください')
+
+    start = time.perf_counter()
+
+    if args.sql:
+        conn = sqlite3.connect(f'file:{Path(args.db).as_posix()}?mode=ro', uri=True)
+        try:
+            rows = conn.execute(args.sql).fetchall()
+        except sqlite3.Error as e:
+            print(f'エラー: {e}')
+            sys.exit(1)
+        finally:
+            conn.close()
+        for row in rows:
+            print('\t'.join('' if value is None else str(value) for value in row))
+        count = len(rows)
+    else:
+        results = search(args.db, args.text, args.limit, [args.kind] if args.kind else None)
+        for result in results:
+            snippet = ' '.join(result['snippet'].split())
+            print(f"[{KIND_LABELS[result['kind']]}] {result['title']}  {result['url']}")
+            print(f'    {snippet}')
+        count = len(results)
+
+    elapsed = time.perf_counter() - start
+    print(f'{count} 件 ({elapsed * 1000:.1f} ms)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+オフライン用バンドル同期ツール
+build.py --bundle が出力した bundle.json を読み、前回の同期から
+内容が変わったファイルだけをアーカイブから取り出して同期先を更新する
+
+使い方:
+    python sync_bundle.py https://example.local/bundle/bundle.json 同期先フォルダ
+    python sync_bundle.py bundle/bundle.json 同期先フォルダ --full
+"""
+import sys
+import time
+import argparse
+from urllib.error import URLError
+
+from lib.bundle import sync_bundle
+
+
+def main():
+    parser = argparse.ArgumentParser(description='オフライン用バンドルの差分同期')
+    parser.add_argument('source', help='bundle.json のURLまたはパス')
+    parser.add_argument('target', help='同期先フォルダ')
+    parser.add_argument('--full', action='store_true', help='前回の同期状態を無視して全ファイルを取得')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        result = sync_bundle(args.source, args.target, full=args.full)
+    except (OSError, URLError, ValueError) as e:
+        print(f'エラー: {e}')
+        sys.exit(1)
+
+    elapsed = time.perf_counter() - start
+    print(f"取得 {result['fetched']} / 削除 {result['removed']} / 変更なし {result['unchanged']} ファイル")
+    print(f"転送量: {result['transferred'] / 1024:.1f}KB ({elapsed:.2f} 秒)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+読み取り専用JSON API のテスト
+"""
+import json
+import unittest
+from urllib.parse import quote
+
+from lib.api_server import CorpusIndex, CorpusAPI
+from lib.numbering import article_id
+
+ARTICLES = [
+    {"type": "chapter", "number": "第1章", "title": "総則"},
+    {"type": "article", "number": "第1条", "title": "（用語の定義）", "content": ["定義"]},
+    {"type": "article", "number": "第2条", "title": "（適用範囲）", "content": ["範囲"]},
+    {"type": "article", "number": "第1条", "title": "（施行期日）", "content": ["附則"]},
+]
+
+
+def create_api():
+    laws = [{"law": "kaishaku", "url": "kaishaku/index.html", "articles": ARTICLES, "to_id": article_id}]
+    return CorpusAPI(CorpusIndex(laws, [], []))
+
+
+class ArticleRouteTest(unittest.TestCase):
+    """GET /api/{law}/articles/{id}"""
+
+    def setUp(self):
+        self.api = create_api()
+
+    def get(self, path):
+        status, body, etag = self.api.respond(path)
+        return status, json.loads(body)
+
+    def test_article_by_id_and_number(self):
+        for article in ("2", quote("第2条")):
+            with self.subTest(article=article):
+                status, data = self.get(f"/api/kaishaku/articles/{article}")
+                self.assertEqual(status, 200)
+                self.assertEqual(data["title"], "（適用範囲）")
+
+    def test_repeated_number(self):
+        status, data = self.get("/api/kaishaku/articles/1%232")
+        self.assertEqual(status, 200)
+        self.assertEqual(data["title"], "（施行期日）")
+
+    def test_unparseable_number_is_not_found(self):
+        status, data = self.get("/api/kaishaku/articles/" + quote("第x条"))
+        self.assertEqual(status, 404)
+
+    def test_unknown_law_is_not_found(self):
+        status, data = self.get("/api/dengi/articles/1")
+        self.assertEqual(status, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+コーパスデータベースのテスト
+"""
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from lib.corpus_db import CorpusDatabase
+from lib.numbering import article_id
+
+
+def chapter(number, title):
+    return {"type": "chapter", "number": number, "title": title}
+
+
+def article(number, title):
+    return {"type": "article", "number": number, "title": title, "content": [f"{title}の本文"]}
+
+
+def law(articles):
+    return {"law": "kaishaku", "url": "standards/kaishaku/index.html",
+            "articles": articles, "to_id": article_id}
+
+
+class UpdateTest(unittest.TestCase):
+    """CorpusDatabase.update"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmp.name) / "corpus.sqlite"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def rows(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute(
+                "SELECT article_id, chapter_id, title, doc FROM articles ORDER BY article_id"
+            ).fetchall()
+        finally:
+            conn.close()
+
+    def test_unchanged_units_are_kept(self):
+        articles = [chapter("第1章", "総則"), article("第1条", "定義")]
+        CorpusDatabase(self.db_path).update([law(articles)], [])
+        db = CorpusDatabase(self.db_path)
+        db.update([law(articles)], [])
+        self.assertEqual((db.updated, db.removed), (0, 0))
+
+    def test_article_moves_to_earlier_chapter(self):
+        CorpusDatabase(self.db_path).update([law([
+            chapter("第1章", "総則"), article("第1条", "定義"),
+            chapter("第2章", "電路"), article("第2条", "適用範囲"), article("第3条", "絶縁"),
+        ])], [])
+
+        db = CorpusDatabase(self.db_path)
+        db.update([law([
+            chapter("第1章", "総則"), article("第1条", "定義"), article("第2条", "適用範囲"),
+            chapter("第2章", "電路"), article("第3条", "絶縁"),
+        ])], [])
+
+        self.assertEqual(db.updated, 2)
+        self.assertEqual(self.rows(), [
+            ("1", "1", "定義", "kaishaku/1"),
+            ("2", "1", "適用範囲", "kaishaku/1"),
+            ("3", "2", "絶縁", "kaishaku/2"),
+        ])
+
+    def test_chapter_removed_while_article_moves(self):
+        CorpusDatabase(self.db_path).update([law([
+            chapter("第1章", "総則"), article("第1条", "定義"),
+            chapter("第2章", "電路"), article("第2条", "適用範囲"),
+        ])], [])
+
+        db = CorpusDatabase(self.db_path)
+        db.update([law([
+            chapter("第1章", "総則"), article("第1条", "定義"), article("第2条", "適用範囲"),
+        ])], [])
+
+        self.assertEqual((db.updated, db.removed), (1, 1))
+        self.assertEqual(self.rows(), [
+            ("1", "1", "定義", "kaishaku/1"),
+            ("2", "1", "適用範囲", "kaishaku/1"),
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+解釈の大きな表の専用ページのテスト
+"""
+import re
+import tempfile
+import unittest
+from pathlib import Path
+
+from generate_kaishaku_html import (
+    TEMPLATES_DIR, SPLIT_TABLE_MIN_ROWS, generate_fragments, write_table_pages,
+)
+from lib.template_engine import TemplateEngine
+
+
+def large_table(label):
+    return ["区分\t値"] + [f"{label}{i}\t{i}" for i in range(SPLIT_TABLE_MIN_ROWS)]
+
+
+# 本則と附則に同じ条番号（第63条）があり、どちらにも大きな表がある
+ARTICLES = [
+    {"type": "chapter", "number": "第1章", "title": "総則"},
+    {"type": "article", "number": "第63条", "title": "本則", "chapter": "第1章",
+     "content": ["本則の表", *large_table("本則")]},
+    {"type": "chapter", "number": "第2章", "title": "附則"},
+    {"type": "article", "number": "第63条", "title": "附則", "chapter": "第2章",
+     "content": ["附則の表", *large_table("附則")]},
+]
+
+
+class RepeatedArticleTablesTest(unittest.TestCase):
+    """同じ条番号の条の表が別々の専用ページになること"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.tables_dir = Path(self.tmp.name) / "tables"
+        self.engine = TemplateEngine(TEMPLATES_DIR)
+        self.engine.load_all()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_pages_and_links_are_distinct(self):
+        count = write_table_pages(ARTICLES, self.tables_dir, self.engine)
+        self.assertEqual(count, 2)
+        self.assertEqual(sorted(p.name for p in self.tables_dir.iterdir()), ["63-1.html", "63.2-1.html"])
+        self.assertIn("本則0", (self.tables_dir / "63-1.html").read_text(encoding="utf-8"))
+        self.assertIn("附則0", (self.tables_dir / "63.2-1.html").read_text(encoding="utf-8"))
+
+        fragments = generate_fragments(ARTICLES, split_tables=True)
+        links = [re.findall(r'href="tables/([^"]+)"', fragments[chapter]) for chapter in ("1", "2")]
+        self.assertEqual(links, [["63-1.html"], ["63.2-1.html"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+Markdown パーサーのテスト
+markdown パッケージがない環境で使う簡易変換（_simple_markdown）が、
+content/ で使っている記法を markdown パッケージと同じ構造のHTMLに変換することを確認する
+
+比較はタグ・本文・主要な属性（style, start, href, src, alt）の並びで行い、
+class・id、空白の違い、codehilite の装飾（div.codehilite・span）は無視する
+
+markdown パッケージとの比較テストは、パッケージがないとスキップされる。
+実行するときは先に `pip install markdown` で入れておく（リポジトリには同梱しない）
+"""
+import unittest
+from html.parser import HTMLParser
+from pathlib import Path
+
+from lib.markdown_parser import MarkdownParser, MARKDOWN_AVAILABLE
+
+CONTENT_DIR = Path(__file__).resolve().parent.parent / "content"
+
+# 比較する属性
+_COMPARED_ATTRS = {"style", "start", "href", "src", "alt"}
+
+
+class _StructureParser(HTMLParser):
+    """HTMLを (種類, タグ/本文, 属性) の並びに変換"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tokens = []
+        self._ignored_divs = []   # div ごとに codehilite の装飾かどうか
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "span":
+            return
+        if tag == "div":
+            ignored = dict(attrs).get("class") == "codehilite"
+            self._ignored_divs.append(ignored)
+            if ignored:
+                return
+        compared = tuple(sorted((k, v) for k, v in attrs if k in _COMPARED_ATTRS))
+        self.tokens.append(("start", tag, compared))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag == "span":
+            return
+        if tag == "div" and self._ignored_divs and self._ignored_divs.pop():
+            return
+        self.tokens.append(("end", tag))
+
+    def handle_data(self, data):
+        if self.tokens and self.tokens[-1][0] == "text":
+            self.tokens[-1] = ("text", self.tokens[-1][1] + data)
+        else:
+            self.tokens.append(("text", data))
+
+
+def structure(html):
+    """HTMLの構造（空白を詰めた本文を含む）"""
+    parser = _StructureParser()
+    parser.feed(html)
+    parser.close()
+    tokens = []
+    for token in parser.tokens:
+        if token[0] == "text":
+            text = " ".join(token[1].split())
+            if text:
+                tokens.append(("text", text))
+        else:
+            tokens.append(token)
+    return tokens
+
+
+class SimpleMarkdownTest(unittest.TestCase):
+    """簡易変換の出力"""
+
+    def setUp(self):
+        self.parser = MarkdownParser()
+
+    def test_hard_break_in_paragraph(self):
+        html = self.parser._simple_markdown("作成日：2026年1月15日  \n対象：開発者  \n")
+        self.assertEqual(html, "<p>作成日：2026年1月15日<br>\n対象：開発者</p>")
+
+    def test_hard_break_in_list_item(self):
+        html = self.parser._simple_markdown("- 正常時：V₀ ≒ 0  \n  地絡時：V₀ が発生\n- 次の項目  ")
+        self.assertEqual(
+            html,
+            "<ul>\n<li>正常時：V₀ ≒ 0<br>\n地絡時：V₀ が発生</li>\n<li>次の項目</li>\n</ul>"
+        )
+
+    def test_single_space_is_not_break(self):
+        html = self.parser._simple_markdown("一行目 \n二行目")
+        self.assertEqual(html, "<p>一行目\n二行目</p>")
+
+
+@unittest.skipUnless(MARKDOWN_AVAILABLE, "markdown パッケージが未インストール")
+class MarkdownParityTest(unittest.TestCase):
+    """簡易変換と markdown パッケージの出力の比較"""
+
+    def setUp(self):
+        self.parser = MarkdownParser()
+
+    def assertParity(self, text):
+        body = self.parser._process_custom_blocks(text)
+        self.parser.md.reset()
+        expected = structure(self.parser.md.convert(body))
+        actual = structure(self.parser._simple_markdown(body))
+        self.assertEqual(actual, expected)
+
+    def test_table_alignment(self):
+        self.assertParity(
+            "| 項目 | 値 | 備考 |\n"
+            "|:-----|:--:|-----:|\n"
+            "| 定格電流 | **5A** | `CT二次` |\n"
+            "| 過電流定数 | n>10 | [参照](../relay/ocr.html) |\n"
+        )
+
+    def test_nested_and_ordered_lists(self):
+        self.assertParity(
+            "1. 受電\n"
+            "2. 変圧\n"
+            "    - 高圧側\n"
+            "    - 低圧側\n"
+            "        1. 動力\n"
+            "        2. 電灯\n"
+            "3. 配電\n"
+            "\n"
+            "段落で区切った別のリスト：\n"
+            "\n"
+            "3. 三番から始まるリスト\n"
+            "4. 次の項目\n"
+        )
+
+    def test_fenced_code(self):
+        self.assertParity(
+            "手順：\n"
+            "\n"
+            "```\n"
+            "電源側 ──[VCB]──┬── 負荷\n"
+            "              └── <ZCT> & \"試験\"\n"
+            "```\n"
+            "\n"
+            "```python\n"
+            "print('ok')\n"
+            "```\n"
+        )
+
+    def test_notice_blocks(self):
+        self.assertParity(
+            ":::info\n試験前に停電範囲を確認する。\n:::\n"
+            "\n"
+            ":::warning\n**感電注意**：残留電荷を放電すること。\n:::\n"
+        )
+
+    def test_hard_breaks(self):
+        self.assertParity(
+            "正常時：三相平衡のため V₀ ≒ 0  \n"
+            "地絡時：不平衡により V₀ が発生\n"
+            "\n"
+            "- 一行目  \n"
+            "  二行目\n"
+        )
+
+    def test_content_pages(self):
+        for path in sorted(CONTENT_DIR.rglob("*.md")):
+            with self.subTest(page=path.relative_to(CONTENT_DIR).as_posix()):
+                frontmatter, body = self.parser.split_frontmatter(path.read_text(encoding="utf-8"))
+                self.assertParity(body)
+
+
+if __name__ == "__main__":
+    unittest.main()